@@ -0,0 +1,191 @@
+from typing import Tuple
+from huffman_code import BitWriter
+
+
+class AdaptiveNode:
+    def __init__(self, number, char=None, parent=None):
+        """
+        Initializes a node in the adaptive Huffman tree.
+
+        Parameters:
+        - number: The order number of the node (the root has the highest number).
+        - char: The byte value stored in the node, None for internal nodes and for the NYT node.
+        - parent: The parent node. Defaults to None.
+        """
+        self.number = number
+        self.char = char
+        self.weight = 0
+        self.parent = parent
+        self.left_node = None
+        self.right_node = None
+
+
+class AdaptiveHuffman:
+    def __init__(self):
+        """
+        Initializes an adaptive Huffman (FGK algorithm) coder.
+        The tree starts with the NYT (not yet transmitted) node only and is updated after every byte
+        the same way by the encoder and the decoder, so the tree is never stored and a single pass is enough.
+        A byte that wasn't seen yet is sent as the code of the NYT node followed by its 8 bits.
+        """
+        MAX_NUM_OF_NODES = 2 * 256 + 1
+        self.nyt = AdaptiveNode(MAX_NUM_OF_NODES)
+        self.root = self.nyt
+        self.nodes = {self.nyt.number: self.nyt}  # the nodes by their order number
+        self.leaves = {}  # the leaf of every byte value that was seen
+        self.bit_writer = BitWriter()
+
+    def is_leaf(self, node):
+        """
+        Checks if a given node is a leaf node (i.e., has no children).
+
+        Parameters:
+        - node: The node to be checked.
+
+        Returns:
+        - True if the node is a leaf node, False otherwise.
+        """
+        return node.right_node == node.left_node == None
+
+    def get_code(self, node) -> Tuple[int, int]:
+        """
+        Finds the current code of a node by walking from it up to the root.
+
+        Parameters:
+        - node: The node to get the code of.
+
+        Returns:
+        - A tuple of the code as an integer and its length in bits.
+        """
+        code = 0
+        code_length = 0
+        while node.parent is not None:
+            if node.parent.right_node is node:  # 1 stands for right
+                code |= 1 << code_length
+            code_length += 1
+            node = node.parent
+        return code, code_length
+
+    def swap_nodes(self, first, second):
+        """
+        Swaps two nodes (with their subtrees) in the tree and swaps their order numbers.
+
+        Parameters:
+        - first: A node that isn't an ancestor of second.
+        - second: A node that isn't an ancestor of first.
+        """
+        first_parent, second_parent = first.parent, second.parent
+        first_is_left = first_parent.left_node is first
+        second_is_left = second_parent.left_node is second
+        if first_is_left:
+            first_parent.left_node = second
+        else:
+            first_parent.right_node = second
+        if second_is_left:
+            second_parent.left_node = first
+        else:
+            second_parent.right_node = first
+        first.parent, second.parent = second_parent, first_parent
+        first.number, second.number = second.number, first.number
+        self.nodes[first.number] = first
+        self.nodes[second.number] = second
+
+    def update(self, char):
+        """
+        Updates the tree after a byte was coded (FGK): every node on the way to the root is first swapped
+        with the highest numbered node of its weight and then its weight is incremented.
+
+        Parameters:
+        - char: The byte value that was coded.
+        """
+        node = self.leaves.get(char)
+        if node is None:
+            # split the NYT node into a new NYT node (left) and the leaf of the new byte (right):
+            old_nyt = self.nyt
+            self.nyt = AdaptiveNode(old_nyt.number - 2, parent=old_nyt)
+            node = AdaptiveNode(old_nyt.number - 1, char, old_nyt)
+            old_nyt.left_node, old_nyt.right_node = self.nyt, node
+            self.nodes[self.nyt.number] = self.nyt
+            self.nodes[node.number] = node
+            self.leaves[char] = node
+        while node is not None:
+            # the nodes of the same weight have consecutive numbers, find the highest one:
+            leader_number = node.number
+            while leader_number + 1 in self.nodes and self.nodes[leader_number + 1].weight == node.weight:
+                leader_number += 1
+            leader = self.nodes[leader_number]
+            if leader is not node and leader is not node.parent:
+                self.swap_nodes(node, leader)
+            node.weight += 1
+            node = node.parent
+
+    def encode_chunk(self, chunk):
+        """
+        Encodes the next chunk of the data, the chunks can come from a stream of unknown size.
+
+        Parameters:
+        - chunk: The bytes to encode.
+        """
+        NUM_OF_BITS = 8
+        for char in chunk:
+            leaf = self.leaves.get(char)
+            if leaf is None:
+                # a new byte, send the NYT code and the byte itself:
+                self.bit_writer.write_bits(*self.get_code(self.nyt))
+                self.bit_writer.write_bits(char, NUM_OF_BITS)
+            else:
+                self.bit_writer.write_bits(*self.get_code(leaf))
+            self.update(char)
+
+    def get_packed_data(self) -> Tuple[bytes, int]:
+        """
+        Returns:
+        - A tuple of the packed encoded data and its length in bits (without the artificial zeros).
+        """
+        return self.bit_writer.get_packed_data()
+
+    def decode_bytes(self, encoded_data, bits_length) -> bytes:
+        """
+        Decodes data encoded by encode_chunk, rebuilding the same tree while decoding.
+
+        Parameters:
+        - encoded_data: The packed bytes of the encoded data (the most significant bit first).
+        - bits_length: The number of valid bits in encoded_data (without the artificial zeros).
+
+        Returns:
+        - The decoded data.
+
+        Raises:
+        - IOError: If the encoded data ends in the middle of a code.
+        """
+        NUM_OF_BITS = 8
+        decoded = bytearray()
+        bit_index = 0
+        while bit_index < bits_length:
+            node = self.root
+            # walk down the tree until a leaf (or the NYT node):
+            while not self.is_leaf(node):
+                if bit_index >= bits_length:
+                    raise IOError("Potential file corruption detected.\n"
+                                  "The compressed data ends in the middle of a code")
+                byte = encoded_data[bit_index // NUM_OF_BITS]
+                if (byte >> (NUM_OF_BITS - 1 - bit_index % NUM_OF_BITS)) & 1:
+                    node = node.right_node
+                else:
+                    node = node.left_node
+                bit_index += 1
+            if node is self.nyt:
+                # a new byte, read its 8 bits:
+                if bit_index + NUM_OF_BITS > bits_length:
+                    raise IOError("Potential file corruption detected.\n"
+                                  "The compressed data ends in the middle of a code")
+                char = 0
+                for _ in range(NUM_OF_BITS):
+                    byte = encoded_data[bit_index // NUM_OF_BITS]
+                    char = (char << 1) | ((byte >> (NUM_OF_BITS - 1 - bit_index % NUM_OF_BITS)) & 1)
+                    bit_index += 1
+            else:
+                char = node.char
+            decoded.append(char)
+            self.update(char)
+        return bytes(decoded)
@@ -0,0 +1,150 @@
+import base64
+import os
+from typing import BinaryIO
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+
+class ChunkedWriter:
+    CHUNK_SIZE = 1 << 16  # bytes of plain data in every chunk
+    LENGTH_BYTES = 4
+    NONCE_BYTES = 12
+    TAG_BYTES = 16
+    CHUNK_INDEX_BYTES = 8
+
+    def __init__(self, output_file: BinaryIO, key: bytes):
+        """
+        Initializes a writer that encrypts the data written to it in chunks with AES-GCM.
+        Every chunk looks like the following:
+        +--------------------+--------------+-------------------------------------+
+        | Chunk length (4B)  | Nonce (12B)  | Encrypted chunk and tag (X bytes)   |
+        +--------------------+--------------+-------------------------------------+
+        the authenticated data of a chunk is its index and whether it is the last one,
+        so chunks can't be reordered, and a cut entry is detected.
+
+        Parameters:
+        - output_file: The file object the chunks are written to.
+        - key: The Fernet key of the archive (its 32 bytes are the AES-256 key).
+        """
+        self.output_file = output_file
+        self.aes_gcm = AESGCM(base64.urlsafe_b64decode(key))
+        self.buffer = bytearray()
+        self.chunk_index = 0
+        self.bytes_written = 0  # the size of the encrypted data
+
+    def write(self, data: bytes) -> None:
+        """
+        Encrypts and writes every full chunk, the rest of the data waits in the buffer.
+
+        Parameters:
+        - data: The data to write.
+        """
+        self.buffer += data
+        while len(self.buffer) > self.CHUNK_SIZE:
+            # a full buffer is kept until more data comes, because the last chunk is marked as the last one:
+            self.write_chunk(bytes(self.buffer[:self.CHUNK_SIZE]), False)
+            del self.buffer[:self.CHUNK_SIZE]
+
+    def close(self) -> None:
+        """writes the buffered data as the last chunk (an empty data still gets a last chunk)"""
+        self.write_chunk(bytes(self.buffer), True)
+        self.buffer.clear()
+
+    def write_chunk(self, chunk: bytes, is_last: bool) -> None:
+        """
+        Encrypts a single chunk and writes it.
+
+        Parameters:
+        - chunk: The plain data of the chunk.
+        - is_last: Whether it is the last chunk of the data.
+        """
+        nonce = os.urandom(self.NONCE_BYTES)
+        encrypted_chunk = self.aes_gcm.encrypt(nonce, chunk, get_chunk_aad(self.chunk_index, is_last))
+        self.output_file.write(len(encrypted_chunk).to_bytes(length=self.LENGTH_BYTES, byteorder="little"))
+        self.output_file.write(nonce)
+        self.output_file.write(encrypted_chunk)
+        self.chunk_index += 1
+        self.bytes_written += self.LENGTH_BYTES + self.NONCE_BYTES + len(encrypted_chunk)
+
+
+class ChunkedReader:
+    def __init__(self, input_file: BinaryIO, key: bytes, stored_size: int):
+        """
+        Initializes a reader that decrypts the chunks of a ChunkedWriter one by one while they are read.
+
+        Parameters:
+        - input_file: The file object, positioned at the first chunk.
+        - key: The Fernet key of the archive.
+        - stored_size: The size of all the chunks in bytes.
+        """
+        self.input_file = input_file
+        self.aes_gcm = AESGCM(base64.urlsafe_b64decode(key))
+        self.bytes_left = stored_size
+        self.buffer = bytearray()
+        self.chunk_index = 0
+        self.is_last_read = False
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads decrypted data.
+
+        Parameters:
+        - size: The number of bytes to read, -1 to read all the rest.
+
+        Returns:
+        - The decrypted data (shorter than size only at the end).
+
+        Raises:
+        - IOError: If a chunk was changed or cut.
+        """
+        while (size < 0 or len(self.buffer) < size) and not self.is_last_read:
+            self.buffer += self.read_chunk()
+        if size < 0:
+            size = len(self.buffer)
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def read_chunk(self) -> bytes:
+        """
+        Reads and decrypts the next chunk.
+
+        Returns:
+        - The plain data of the chunk.
+
+        Raises:
+        - IOError: If the chunk was changed or cut.
+        """
+        HEADER_BYTES = ChunkedWriter.LENGTH_BYTES + ChunkedWriter.NONCE_BYTES
+        chunk_header = self.input_file.read(HEADER_BYTES) if self.bytes_left >= HEADER_BYTES else b""
+        if len(chunk_header) != HEADER_BYTES:
+            raise IOError("Potential file corruption detected.\n"
+                          "Cant decrypt the file")
+        encrypted_length = int.from_bytes(chunk_header[:ChunkedWriter.LENGTH_BYTES], byteorder="little")
+        nonce = chunk_header[ChunkedWriter.LENGTH_BYTES:]
+        self.bytes_left -= HEADER_BYTES + encrypted_length
+        # the last chunk is the one that ends the stored data:
+        is_last = self.bytes_left == 0
+        encrypted_chunk = self.input_file.read(encrypted_length) if self.bytes_left >= 0 else b""
+        try:
+            chunk = self.aes_gcm.decrypt(nonce, encrypted_chunk, get_chunk_aad(self.chunk_index, is_last))
+        except InvalidTag:
+            raise IOError("Potential file corruption detected.\n"
+                          "Cant decrypt the file")
+        self.chunk_index += 1
+        self.is_last_read = is_last
+        return chunk
+
+
+def get_chunk_aad(chunk_index: int, is_last: bool) -> bytes:
+    """
+    Returns the authenticated data of a chunk.
+
+    Parameters:
+    - chunk_index: The index of the chunk in its entry.
+    - is_last: Whether it is the last chunk of the entry.
+
+    Returns:
+    - The chunk index followed by a byte of 1 for the last chunk (0 otherwise).
+    """
+    return chunk_index.to_bytes(length=ChunkedWriter.CHUNK_INDEX_BYTES, byteorder="little") + bytes([is_last])
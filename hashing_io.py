@@ -0,0 +1,94 @@
+import hashlib
+import zlib
+from typing import BinaryIO
+
+
+class HashingReader:
+    def __init__(self, input_file: BinaryIO):
+        """
+        Initializes a reader that updates an MD5 checksum with every byte read through it,
+        so the checksum of a file is ready when it was read, without reading it again.
+
+        Parameters:
+        - input_file: The file object to read from.
+        """
+        self.input_file = input_file
+        self.md5 = hashlib.md5()
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads from the file and updates the checksum.
+
+        Parameters:
+        - size: The number of bytes to read, -1 to read all the rest.
+
+        Returns:
+        - The data that was read.
+        """
+        data = self.input_file.read(size)
+        self.md5.update(data)
+        return data
+
+    def digest(self) -> bytes:
+        """return the checksum of the data read so far"""
+        return self.md5.digest()
+
+
+class HashingWriter:
+    def __init__(self, output_file: BinaryIO):
+        """
+        Initializes a writer that updates an MD5 checksum with every byte written through it,
+        so the checksum of the data is ready when it was written, without another pass over it.
+
+        Parameters:
+        - output_file: The file object the data is passed on to.
+        """
+        self.output_file = output_file
+        self.md5 = hashlib.md5()
+
+    def write(self, data: bytes) -> int:
+        """
+        Updates the checksum and writes the data to the output file.
+
+        Parameters:
+        - data: The data to write.
+
+        Returns:
+        - The number of bytes written.
+        """
+        self.md5.update(data)
+        self.output_file.write(data)
+        return len(data)
+
+    def digest(self) -> bytes:
+        """return the checksum of the data written so far"""
+        return self.md5.digest()
+
+
+class Crc32Writer:
+    def __init__(self, output_file: BinaryIO = None):
+        """
+        Initializes a writer that updates a CRC32 and a size with every byte written through it.
+
+        Parameters:
+        - output_file: The file object the data is passed on to, None to only compute the CRC32.
+        """
+        self.output_file = output_file
+        self.crc32 = 0
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        """
+        Updates the CRC32 and writes the data to the output file.
+
+        Parameters:
+        - data: The data to write.
+
+        Returns:
+        - The number of bytes written.
+        """
+        self.crc32 = zlib.crc32(data, self.crc32)
+        self.size += len(data)
+        if self.output_file is not None:
+            self.output_file.write(data)
+        return len(data)
@@ -3,8 +3,23 @@ import base64
 
 
 class ArchiveHeader:
+    # the code of every compression algorithm (a class attribute, the central directory entries use it too):
+    # (STORED is only the codec of an entry, AUTO is an archive whose codec is chosen for every file):
+    ALGO_CODES = {"RLE": 1, "HUF": 2, "CHUF": 3, "AHUF": 4, "RLE2": 5, "RHUF": 6, "STORED": 7, "AUTO": 8}
+    # the format versions of an archive with a central directory (class attributes, the Zip class uses them too):
+    FERNET_ENTRIES_VERSION = 1  # every entry and the central directory are Fernet tokens
+    AEAD_CHUNKS_VERSION = 2  # every entry and the central directory are AES-GCM chunks
+
     def __init__(self, *args, **kwargs):
-        """Initializes an instance of ArchiveHeader."""
+        """
+        Initializes an instance of ArchiveHeader.
+
+        Keyword Args:
+            directory_offset (int): The offset of the central directory from the end of the header,
+                                    None for an old archive without a central directory.
+            directory_size (int): The size of the encrypted central directory in bytes.
+            format_version (int): The format of the entries of an archive with a central directory.
+        """
         # Number of bytes for various header fields
         self.NUM_OF_CHECKSUM_BYTES = 16
         self.NUM_OF_PASSWORD_BYTES = 16
@@ -17,8 +32,15 @@ class ArchiveHeader:
         self.NUM_OF_FILENAME_LENGTH_BYTES = 4
         self.NUM_OF_FILE_SIZE_BYTES = 8
         self.NUM_OF_BYTES_RLE_COUNTER = 2
-        self.HUFFMAN_ALGO_CODE = 2
-        self.RLE_ALGO_CODE = 1
+        # the high bit of the compression algorithm byte marks an archive with a central directory:
+        self.INDEXED_FLAG = 0x80
+        self.FORMAT_VERSION_BYTES = 1
+        self.DIRECTORY_OFFSET_BYTES = 8
+        self.DIRECTORY_SIZE_BYTES = 8
+
+        self.directory_offset = kwargs.get("directory_offset")
+        self.directory_size = kwargs.get("directory_size", 0)
+        self.format_version = kwargs.get("format_version", self.AEAD_CHUNKS_VERSION)
 
         # Initialize attributes based on arguments or binary data
         if "to_bytes" in kwargs:
@@ -28,8 +50,10 @@ class ArchiveHeader:
             # Initialize from binary data
             try:
                 archive_file = args[0]
+                header_start = archive_file.tell()
                 self.md5_password, self.key, self.checksum, self.comp_algo, self.byte_seq_len, self.total_files_size, self.number_of_files = self.__from_bytes(
                     archive_file)
+                self.header_size = archive_file.tell() - header_start  # the entries offsets are from here
             except:
                 raise IOError("Potential file corruption detected. The header of the archive was destroyed")
 
@@ -48,25 +72,42 @@ class ArchiveHeader:
             we need to allocate 16 bytes in the header to store the complete checksum/password.
             the key for the encryption is a 32 bits key.
 
+            an archive with a central directory (the indexed flag in the compression algorithm byte) continues with:
+         +--------------------+-------------------------+-----------------------+
+         | Format version (1B) | Directory offset (8B)  | Directory size (8B)   |
+         +--------------------+-------------------------+-----------------------+
+            the offsets are from the end of the header, and its checksum is the checksum of the central directory.
+            the entries are encrypted one by one, so a single entry can be read without decrypting the others.
+            in format version 1 every entry is a Fernet token, in format version 2 every entry is a sequence of
+            AES-GCM chunks (see chunked_crypto.ChunkedWriter).
+
              """
         archive_file_header = b""
         archive_file_header += self.md5_password
         key_decoded = base64.urlsafe_b64decode(self.key)  # for the key to be 32 bytes
         archive_file_header += key_decoded
         archive_file_header += self.checksum
-        if self.comp_algo == "RLE":
-            archive_file_header += self.RLE_ALGO_CODE.to_bytes(length=1, byteorder="little")
-        elif self.comp_algo == "HUF":
-            archive_file_header += self.HUFFMAN_ALGO_CODE.to_bytes(length=1, byteorder="little")
+        comp_algo = self.ALGO_CODES[self.comp_algo]
+        if self.is_indexed():
+            comp_algo |= self.INDEXED_FLAG
+        archive_file_header += comp_algo.to_bytes(length=1, byteorder="little")
         # Byte sequence length (2 bytes)
         archive_file_header += self.byte_seq_len.to_bytes(length=2, byteorder="little")
         # File Size
         archive_file_header += self.total_files_size.to_bytes(length=10, byteorder="little")
         # num of files in the archives:
         archive_file_header += self.number_of_files.to_bytes(length=4, byteorder="little")
+        if self.is_indexed():
+            archive_file_header += self.format_version.to_bytes(length=self.FORMAT_VERSION_BYTES, byteorder="little")
+            archive_file_header += self.directory_offset.to_bytes(length=self.DIRECTORY_OFFSET_BYTES, byteorder="little")
+            archive_file_header += self.directory_size.to_bytes(length=self.DIRECTORY_SIZE_BYTES, byteorder="little")
 
         return archive_file_header
 
+    def is_indexed(self) -> bool:
+        """return whether the archive has a central directory"""
+        return self.directory_offset is not None
+
     def __from_bytes(self, archive_file):
         """
         Parses the binary data from the archive file to retrieve header information.
@@ -99,20 +140,38 @@ class ArchiveHeader:
         number_of_files = archive_file.read(self.NUM_OF_FILES_IN_ARCHIVE_BYTES)
         number_of_files = int.from_bytes(number_of_files, byteorder="little")
 
+        if comp_algo & self.INDEXED_FLAG:
+            comp_algo &= ~self.INDEXED_FLAG
+            self.format_version = int.from_bytes(archive_file.read(self.FORMAT_VERSION_BYTES), byteorder="little")
+            self.directory_offset = int.from_bytes(archive_file.read(self.DIRECTORY_OFFSET_BYTES), byteorder="little")
+            self.directory_size = int.from_bytes(archive_file.read(self.DIRECTORY_SIZE_BYTES), byteorder="little")
+
         return password, key, checksum, comp_algo, byte_seq_len, total_file_size, number_of_files
 
 
 class HuffFileHeader:
     def __init__(self, *args, **kwargs):
         """
-        Initializes a RleFileHeader object.
+        Initializes a HuffFileHeader object.
 
         Attributes:
             FILE_SIZE_BYTES (int): Number of bytes for file size.
             TREE_SIZE_BYTES (int): Number of bytes for tree size.
             THE_CORRECT_SIZE_BYTES (int): Number of bytes for correct size.
             FILE_NAME_BYTES (int): Number of bytes for file name.
-            IS_DIR_BYTES (int): Number of bytes for directory indicator.
+            IS_DIR_BYTES (int): Number of bytes for directory indicator (and the format flags).
+            BLOCK_SIZE_BYTES (int): Number of bytes for the block size (block mode only).
+            NUM_OF_BLOCKS_BYTES (int): Number of bytes for the number of blocks (block mode only).
+            NUM_OF_STREAMS_BYTES (int): Number of bytes for the number of streams (multi stream mode only).
+            STREAM_OFFSET_BYTES (int): Number of bytes for the offset of a stream (multi stream mode only).
+
+        Keyword Args:
+            block_size (int): The size of the blocks the file was split into, 0 if it wasn't.
+            num_of_blocks (int): The number of blocks the file was split into.
+            stream_offsets (list): The offset of every sub stream inside the data, empty for a single stream.
+            stream_bits_lengths (list): The length in bits of every sub stream.
+            binary_tree (bool): Whether the trees are in the binary format (Huffman.serialize_binary)
+                                instead of the old text format.
 
         Raises:
             IOError: If parsing from bytes encounters issues.
@@ -122,7 +181,21 @@ class HuffFileHeader:
         self.THE_CORRECT_SIZE_BYTES = 7
         self.FILE_NAME_BYTES = 4
         self.IS_DIR_BYTES = 1
-
+        self.BLOCK_SIZE_BYTES = 4
+        self.NUM_OF_BLOCKS_BYTES = 4
+        self.NUM_OF_STREAMS_BYTES = 1
+        self.STREAM_OFFSET_BYTES = 8
+        # the is directory byte holds flags, so old archives (where it is 0 or 1) are still valid:
+        self.IS_DIR_FLAG = 1
+        self.BLOCKS_FLAG = 2
+        self.STREAMS_FLAG = 4
+        self.BINARY_TREE_FLAG = 8
+
+        self.block_size = kwargs.get("block_size", 0)
+        self.num_of_blocks = kwargs.get("num_of_blocks", 0)
+        self.stream_offsets = kwargs.get("stream_offsets", [])
+        self.stream_bits_lengths = kwargs.get("stream_bits_lengths", [])
+        self.binary_tree = kwargs.get("binary_tree", False)
         if "to_bytes" in kwargs:
             self.file_path, self.actual_file_size, self.correct_file_size, self.tree_size, self.is_dir = args
         elif "from_bytes" in kwargs:
@@ -147,17 +220,38 @@ class HuffFileHeader:
         +-------------------+------------------+--------------------------+-----------------------+--------------------+
          correct_size is without the artificial zeros i add in order to overcome the obstacle of the 8 bits when writing to a file
 
+         in block mode (the blocks flag in the is directory byte) the header continues with:
+        +------------------+----------------------+
+        | Block size (4B)  | Number of blocks (4B) |
+        +------------------+----------------------+
+         and the file size is 0, the tree size is 0 and the correct size is the original file size.
+         every block has its own HuffBlockHeader and tree, so the blocks are written one by one
+         without the size of all of them.
+
+         in multi stream mode (the streams flag) the data is split into sub streams that are decoded separately
+         and the header continues with:
+        +-------------------------+-------------------------------+------------------------------------+
+        | Number of streams (1B)  |  Stream offset (8B) (N times) |  Stream correct size (7B) (N times) |
+        +-------------------------+-------------------------------+------------------------------------+
+         the offsets are from the start of the data (after the tree).
+
+         the binary tree flag marks that the trees are in the binary format, old archives have text trees.
+
          """
 
         header = b""
+        flags = self.BLOCKS_FLAG if self.block_size else 0
+        if self.stream_offsets:
+            flags |= self.STREAMS_FLAG
+        if self.binary_tree:
+            flags |= self.BINARY_TREE_FLAG
         if self.is_dir:
-            is_dir = 1
-            header += is_dir.to_bytes(length=self.IS_DIR_BYTES, byteorder="little")
+            flags |= self.IS_DIR_FLAG
+            header += flags.to_bytes(length=self.IS_DIR_BYTES, byteorder="little")
             filename = self.get_dir_name(self.file_path)  # return only the relative path of the file
             # its directory/ file
         else:
-            is_dir = 0
-            header += is_dir.to_bytes(length=self.IS_DIR_BYTES, byteorder="little")
+            header += flags.to_bytes(length=self.IS_DIR_BYTES, byteorder="little")
             filename = self.get_filename(self.file_path)  # return only the file name
         # File Size (8 bytes)
         header += self.actual_file_size.to_bytes(length=self.FILE_SIZE_BYTES, byteorder="little")
@@ -171,6 +265,15 @@ class HuffFileHeader:
 
         # Add filename (ASCII encoding)
         header += filename.encode("ascii")
+        if self.block_size:
+            header += self.block_size.to_bytes(length=self.BLOCK_SIZE_BYTES, byteorder="little")
+            header += self.num_of_blocks.to_bytes(length=self.NUM_OF_BLOCKS_BYTES, byteorder="little")
+        if self.stream_offsets:
+            header += len(self.stream_offsets).to_bytes(length=self.NUM_OF_STREAMS_BYTES, byteorder="little")
+            for offset in self.stream_offsets:
+                header += offset.to_bytes(length=self.STREAM_OFFSET_BYTES, byteorder="little")
+            for bits_length in self.stream_bits_lengths:
+                header += bits_length.to_bytes(length=self.THE_CORRECT_SIZE_BYTES, byteorder="little")
         return header
 
     def __from_bytes(self, archive_file) -> Tuple[str, int, int, int, bool]:
@@ -195,7 +298,58 @@ class HuffFileHeader:
         filename = archive_file.read(filename_length)
         filename = filename.decode("ascii")
 
-        return filename, file_size, correct_size, tree_size, is_dir == 1
+        self.binary_tree = is_dir & self.BINARY_TREE_FLAG != 0
+        if is_dir & self.BLOCKS_FLAG:
+            self.block_size = int.from_bytes(archive_file.read(self.BLOCK_SIZE_BYTES), byteorder="little")
+            self.num_of_blocks = int.from_bytes(archive_file.read(self.NUM_OF_BLOCKS_BYTES), byteorder="little")
+        if is_dir & self.STREAMS_FLAG:
+            num_of_streams = int.from_bytes(archive_file.read(self.NUM_OF_STREAMS_BYTES), byteorder="little")
+            self.stream_offsets = [int.from_bytes(archive_file.read(self.STREAM_OFFSET_BYTES), byteorder="little")
+                                   for _ in range(num_of_streams)]
+            self.stream_bits_lengths = [int.from_bytes(archive_file.read(self.THE_CORRECT_SIZE_BYTES), byteorder="little")
+                                        for _ in range(num_of_streams)]
+
+        return filename, file_size, correct_size, tree_size, is_dir & self.IS_DIR_FLAG == 1
+
+
+class HuffBlockHeader:
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes a HuffBlockHeader object, the header of one block of a file compressed in block mode.
+
+        Raises:
+            IOError: If parsing from bytes encounters issues.
+        """
+        self.DATA_SIZE_BYTES = 8
+        self.TREE_SIZE_BYTES = 5
+        self.THE_CORRECT_SIZE_BYTES = 7
+
+        if "to_bytes" in kwargs:
+            self.data_size, self.correct_size, self.tree_size = args
+        elif "from_bytes" in kwargs:
+            archive_file = args[0]
+            self.data_size, self.correct_size, self.tree_size = self.__from_bytes(archive_file)
+
+    def to_bytes(self) -> bytes:
+        """return the header of the block with look like the following:
+        +-----------------+------------------+--------------------+
+        | Data size (8B)  |  Tree size (5B)  |  Correct size (7B)  |
+        +-----------------+------------------+--------------------+
+         the header is followed by the tree of the block and its data.
+         correct_size is the length of the data in bits (without the artificial zeros)
+        """
+        header = b""
+        header += self.data_size.to_bytes(length=self.DATA_SIZE_BYTES, byteorder="little")
+        header += self.tree_size.to_bytes(length=self.TREE_SIZE_BYTES, byteorder="little")
+        header += self.correct_size.to_bytes(length=self.THE_CORRECT_SIZE_BYTES, byteorder="little")
+        return header
+
+    def __from_bytes(self, archive_file) -> Tuple[int, int, int]:
+        """given the archive file, return the data size, the correct size and the tree size of the block"""
+        data_size = int.from_bytes(archive_file.read(self.DATA_SIZE_BYTES), byteorder="little")
+        tree_size = int.from_bytes(archive_file.read(self.TREE_SIZE_BYTES), byteorder="little")
+        correct_size = int.from_bytes(archive_file.read(self.THE_CORRECT_SIZE_BYTES), byteorder="little")
+        return data_size, correct_size, tree_size
 
 
 class RleFileHeader:
@@ -203,6 +357,10 @@ class RleFileHeader:
         """
         Initializes an ArchiveHeader object.
 
+        Keyword Args:
+            byte_seq_len (int): The byte sequence length of this file when it was chosen per file,
+                                None when the byte sequence length of the archive is used.
+
         Raises:
             IOError: If parsing from bytes encounters issues.
         """
@@ -217,7 +375,11 @@ class RleFileHeader:
         self.NUM_OF_BYTES_RLE_COUNTER = 2
         self.HUFFMAN_ALGO_CODE = 2
         self.RLE_ALGO_CODE = 1
+        # the is directory byte holds flags, so old archives (where it is 0 or 1) are still valid:
+        self.IS_DIR_FLAG = 1
+        self.BYTE_SEQ_LEN_FLAG = 2
 
+        self.byte_seq_len = kwargs.get("byte_seq_len")
         if "to_bytes" in kwargs:
             self.file_path, self.compress_file_size, self.is_dir = args
         elif "from_bytes" in kwargs:
@@ -241,19 +403,24 @@ class RleFileHeader:
         +-------------------+------------------+--------------------------+-----------------------+--------------------+
          correct_size is without the artificial zeros i add in order to overcome the obstacle of the 8 bits when writing to a file
 
+         when the byte sequence length was chosen per file (the byte sequence length flag in the is directory byte)
+         the header continues with:
+        +----------------------------+
+        | Byte sequence length (2B)  |
+        +----------------------------+
          """
         NUM_BYTES_FILE_SIZE = 8
         NUM_OF_BYES_FILENAME = 4
         IS_DIR_BYTES = 1
         header = b""
+        flags = self.BYTE_SEQ_LEN_FLAG if self.byte_seq_len else 0
         if self.is_dir:
-            is_dir = 1
-            header += is_dir.to_bytes(length=IS_DIR_BYTES, byteorder="little")
+            flags |= self.IS_DIR_FLAG
+            header += flags.to_bytes(length=IS_DIR_BYTES, byteorder="little")
             filename = self.get_dir_name(self.file_path)  # return only the relative path of the file
             # its directory/ file
         else:
-            is_dir = 0
-            header += is_dir.to_bytes(length=IS_DIR_BYTES, byteorder="little")
+            header += flags.to_bytes(length=IS_DIR_BYTES, byteorder="little")
             filename = self.get_filename(self.file_path)  # return only the file name
 
         # File Size (4 bytes)
@@ -264,6 +431,8 @@ class RleFileHeader:
 
         # Add filename (ASCII encoding)
         header += filename.encode("ascii")
+        if self.byte_seq_len:
+            header += self.byte_seq_len.to_bytes(length=self.NUM_OF_SEQ_LEN_BYTE, byteorder="little")
         return header
 
     def __from_bytes(self, archive_file) -> Tuple[str, int, bool]:
@@ -280,4 +449,204 @@ class RleFileHeader:
         file_size = int.from_bytes(archive_file.read(self.NUM_OF_FILE_SIZE_BYTES), byteorder="little")
         filename_length = int.from_bytes(archive_file.read(self.NUM_OF_FILENAME_LENGTH_BYTES), byteorder="little")
         filename = archive_file.read(filename_length).decode("ascii")
-        return filename, file_size, is_dir == 1
+        if is_dir & self.BYTE_SEQ_LEN_FLAG:
+            self.byte_seq_len = int.from_bytes(archive_file.read(self.NUM_OF_SEQ_LEN_BYTE), byteorder="little")
+        return filename, file_size, is_dir & self.IS_DIR_FLAG == 1
+
+
+class DirectoryEntry:
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes an entry of the central directory, it describes one file of the archive.
+
+        Attributes:
+            file_path (str): The path of the file inside the archive (directory/name or name).
+            is_dir (bool): Whether the file is under a directory.
+            offset (int): The offset of the encrypted entry from the end of the archive header.
+            stored_size (int): The size of the encrypted entry in bytes.
+            original_size (int): The size of the file before the compression.
+            codec (str): The compression algorithm of the entry ("HUF", "RLE" ...).
+            checksum (bytes): The MD5 of the entry before the encryption.
+
+        Keyword Args:
+            is_deleted (bool): Whether the file was deleted (its entry stays in the archive until it is compacted).
+            crc32 (int): The CRC32 of the original file, None for an entry written without it.
+
+        Raises:
+            IOError: If parsing from bytes encounters issues.
+        """
+        self.FLAGS_BYTES = 1
+        self.CODEC_BYTES = 1
+        self.OFFSET_BYTES = 8
+        self.STORED_SIZE_BYTES = 8
+        self.ORIGINAL_SIZE_BYTES = 8
+        self.CHECKSUM_BYTES = 16
+        self.FILENAME_LENGTH_BYTES = 4
+        self.IS_DIR_FLAG = 1
+        self.DELETED_FLAG = 2
+        self.CRC32_FLAG = 4  # the entry has the CRC32 of the original file
+        self.CRC32_BYTES = 4
+
+        if "to_bytes" in kwargs:
+            (self.file_path, self.is_dir, self.offset, self.stored_size, self.original_size, self.codec,
+             self.checksum) = args
+            self.is_deleted = kwargs.get("is_deleted", False)
+            self.crc32 = kwargs.get("crc32")
+        elif "from_bytes" in kwargs:
+            directory_file = args[0]
+            (self.file_path, self.is_dir, self.offset, self.stored_size, self.original_size, self.codec,
+             self.checksum, self.is_deleted, self.crc32) = self.__from_bytes(directory_file)
+
+    def to_bytes(self) -> bytes:
+        """
+        return the entry, it looks like the following:
+        +------------+------------+-------------+------------------+--------------------+---------------+
+        | Flags (1B) | Codec (1B) | Offset (8B) | Stored size (8B) | Original size (8B) | Checksum (16B) |
+        +------------+------------+-------------+------------------+--------------------+---------------+
+        +-------------------------+-----------------------+--------------------+
+        | CRC32 (4B) (with flag)  | Filename Length (4B)  | Filename (X bytes) |
+        +-------------------------+-----------------------+--------------------+
+        the CRC32 of the original file is written only when the CRC32 flag is set.
+        """
+        flags = self.IS_DIR_FLAG if self.is_dir else 0
+        if self.is_deleted:
+            flags |= self.DELETED_FLAG
+        if self.crc32 is not None:
+            flags |= self.CRC32_FLAG
+        entry = flags.to_bytes(length=self.FLAGS_BYTES, byteorder="little")
+        entry += ArchiveHeader.ALGO_CODES[self.codec].to_bytes(length=self.CODEC_BYTES, byteorder="little")
+        entry += self.offset.to_bytes(length=self.OFFSET_BYTES, byteorder="little")
+        entry += self.stored_size.to_bytes(length=self.STORED_SIZE_BYTES, byteorder="little")
+        entry += self.original_size.to_bytes(length=self.ORIGINAL_SIZE_BYTES, byteorder="little")
+        entry += self.checksum
+        if self.crc32 is not None:
+            entry += self.crc32.to_bytes(length=self.CRC32_BYTES, byteorder="little")
+        filename = self.file_path.encode("ascii")
+        entry += len(filename).to_bytes(length=self.FILENAME_LENGTH_BYTES, byteorder="little")
+        entry += filename
+        return entry
+
+    def __from_bytes(self, directory_file) -> Tuple[str, bool, int, int, int, str, bytes, bool, int]:
+        """given the central directory file object, read one entry and return its fields"""
+        flags = int.from_bytes(directory_file.read(self.FLAGS_BYTES), byteorder="little")
+        codec_code = int.from_bytes(directory_file.read(self.CODEC_BYTES), byteorder="little")
+        codecs = [codec for codec, code in ArchiveHeader.ALGO_CODES.items() if code == codec_code]
+        if not codecs:
+            raise IOError("Potential file corruption detected.\n"
+                          "The central directory of the archive was destroyed")
+        offset = int.from_bytes(directory_file.read(self.OFFSET_BYTES), byteorder="little")
+        stored_size = int.from_bytes(directory_file.read(self.STORED_SIZE_BYTES), byteorder="little")
+        original_size = int.from_bytes(directory_file.read(self.ORIGINAL_SIZE_BYTES), byteorder="little")
+        checksum = directory_file.read(self.CHECKSUM_BYTES)
+        crc32 = None
+        if flags & self.CRC32_FLAG:
+            crc32 = int.from_bytes(directory_file.read(self.CRC32_BYTES), byteorder="little")
+        filename_length = int.from_bytes(directory_file.read(self.FILENAME_LENGTH_BYTES), byteorder="little")
+        filename = directory_file.read(filename_length).decode("ascii")
+        return (filename, flags & self.IS_DIR_FLAG != 0, offset, stored_size, original_size, codecs[0], checksum,
+                flags & self.DELETED_FLAG != 0, crc32)
+
+
+class CentralDirectory:
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the central directory of an archive, the entries are kept in a dictionary by their path
+        so a file is found without going over the archive.
+
+        Raises:
+            IOError: If parsing from bytes encounters issues.
+        """
+        self.NUM_OF_ENTRIES_BYTES = 4
+        self.entries = {}
+        if "from_bytes" in kwargs:
+            directory_file = args[0]
+            try:
+                num_of_entries = int.from_bytes(directory_file.read(self.NUM_OF_ENTRIES_BYTES), byteorder="little")
+                for _ in range(num_of_entries):
+                    self.add_entry(DirectoryEntry(directory_file, from_bytes=True))
+            except (ValueError, UnicodeDecodeError):
+                raise IOError("Potential file corruption detected.\n"
+                              "The central directory of the archive was destroyed")
+
+    def add_entry(self, entry: DirectoryEntry) -> None:
+        """
+        Adds an entry. An entry of a deleted file with the same path is replaced
+        (its space was reclaimable anyway, compact only copies the entries in the directory).
+
+        Args:
+            entry (DirectoryEntry): The entry to add.
+
+        Raises:
+            FileExistsError: If a file with the same path is already in the archive.
+        """
+        self.check_new_path(entry.file_path)
+        self.entries[entry.file_path] = entry
+
+    def check_new_path(self, path: str) -> None:
+        """
+        Checks that a path can be added to the archive, so no entry is replaced and its bytes left behind.
+
+        Args:
+            path (str): The path of the file inside the archive.
+
+        Raises:
+            FileExistsError: If a file with the same path is already in the archive (update replaces it).
+        """
+        if path in self.entries and not self.entries[path].is_deleted:
+            raise FileExistsError(f"'{path}' already appears in the archive files")
+
+    def get_live_entries(self) -> List[DirectoryEntry]:
+        """return the entries of the files that weren't deleted"""
+        return [entry for entry in self.entries.values() if not entry.is_deleted]
+
+    def delete_entries(self, path: str) -> List[DirectoryEntry]:
+        """
+        Marks the entries of a path inside the archive as deleted.
+
+        Args:
+            path (str): The path of a file (directory/name or name) or the name of a directory.
+
+        Returns:
+            list: The deleted entries.
+
+        Raises:
+            FileNotFoundError: If no file of the archive matches the path.
+        """
+        entries = self.get_entries(path)
+        for entry in entries:
+            entry.is_deleted = True
+        return entries
+
+    def get_entries(self, path: str) -> List[DirectoryEntry]:
+        """
+        Returns the entries of a path inside the archive.
+
+        Args:
+            path (str): The path of a file (directory/name or name) or the name of a directory.
+
+        Returns:
+            list: The entry of the file, or the entries of all the files under the directory.
+
+        Raises:
+            FileNotFoundError: If no file of the archive matches the path.
+        """
+        path = path.strip("/")
+        if path in self.entries and not self.entries[path].is_deleted:
+            return [self.entries[path]]
+        entries = [entry for entry in self.get_live_entries()
+                   if entry.is_dir and entry.file_path.startswith(path + "/")]
+        if not entries:
+            raise FileNotFoundError(f"'{path}' doesn't appear in the archive files")
+        return entries
+
+    def to_bytes(self) -> bytes:
+        """
+        return the central directory, it looks like the following:
+        +--------------------------+-------------------------------------+
+        | Number of entries (4B)   | Directory entry (X bytes) (N times) |
+        +--------------------------+-------------------------------------+
+        """
+        directory = [len(self.entries).to_bytes(length=self.NUM_OF_ENTRIES_BYTES, byteorder="little")]
+        for entry in self.entries.values():
+            directory.append(entry.to_bytes())
+        return b"".join(directory)
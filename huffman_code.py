@@ -1,4 +1,10 @@
-from queue import PriorityQueue
+import heapq
+from collections import Counter
+from typing import Tuple, List
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the standard library is used without it
+    np = None
 
 
 class Node:
@@ -44,42 +50,271 @@ class Node:
         return self.frequency < other.frequency
 
 
+class ByteCounter:
+    def __init__(self):
+        """
+        Initializes the histogram of the 256 byte values.
+        The data can be given in chunks, so the counting can be done while a file is read.
+        """
+        self.counts = [0] * 256
+
+    def update(self, chunk):
+        """
+        Adds the byte values of a chunk to the histogram in bulk
+        (with NumPy bincount when NumPy is installed, otherwise with Counter).
+
+        Parameters:
+        - chunk: A bytes like object.
+        """
+        if np is not None:
+            chunk_counts = np.bincount(np.frombuffer(chunk, dtype=np.uint8), minlength=256).tolist()
+            self.counts = [count + chunk_count for count, chunk_count in zip(self.counts, chunk_counts)]
+        else:
+            for char, count in Counter(chunk).items():
+                self.counts[char] += count
+
+    def get_char_count_dict(self) -> dict:
+        """
+        Returns:
+        - A dictionary of the count of every byte value that appeared.
+        """
+        return {char: count for char, count in enumerate(self.counts) if count}
+
+
+class BitWriter:
+    def __init__(self):
+        """
+        Initializes an empty bit writer.
+        The bits are packed into bytes the most significant bit first, like the decoder reads them.
+        """
+        self.packed_data = bytearray()
+        self.bits_buffer = 0
+        self.num_of_buffered_bits = 0
+
+    def write_codes(self, data, code_table):
+        """
+        Packs the code of every byte in data straight into the output bytes.
+        Big inputs are packed with write_codes_numpy when NumPy is installed.
+
+        Parameters:
+        - data: The bytes to encode.
+        - code_table: A list of 256 (code, code length) tuples, the code is an integer.
+        """
+        FLUSH_BITS = 64
+        NUM_OF_BITS = 8
+        NUMPY_MIN_SIZE = 4096  # below it the NumPy setup costs more than it saves
+        MAX_NUMPY_CODE_LEN = 63  # the codes have to fit in 64 bits integers
+        if np is not None and len(data) >= NUMPY_MIN_SIZE and \
+                max(code[1] for code in code_table if code) <= MAX_NUMPY_CODE_LEN:
+            self.write_codes_numpy(data, code_table)
+            return
+        packed_data = self.packed_data
+        bits_buffer = self.bits_buffer
+        num_of_buffered_bits = self.num_of_buffered_bits
+        for char in data:
+            code, code_length = code_table[char]
+            bits_buffer = (bits_buffer << code_length) | code
+            num_of_buffered_bits += code_length
+            # move the full bytes out of the integer buffer so it stays small:
+            if num_of_buffered_bits >= FLUSH_BITS:
+                num_of_bytes = num_of_buffered_bits // NUM_OF_BITS
+                num_of_buffered_bits -= num_of_bytes * NUM_OF_BITS
+                packed_data += (bits_buffer >> num_of_buffered_bits).to_bytes(num_of_bytes, byteorder="big")
+                bits_buffer &= (1 << num_of_buffered_bits) - 1
+        self.bits_buffer = bits_buffer
+        self.num_of_buffered_bits = num_of_buffered_bits
+
+    def write_codes_numpy(self, data, code_table):
+        """
+        Packs the code of every byte in data with NumPy, the output is the same as the one of write_codes.
+        Every byte value gets a row of its code bits (padded to the longest code) and a mask of its valid bits,
+        the rows of all the bytes are gathered at once and the mask drops the padding,
+        which leaves the bits of the codes one after the other, ready to be packed into bytes.
+
+        Parameters:
+        - data: The bytes to encode.
+        - code_table: A list of 256 (code, code length) tuples, the code is an integer.
+        """
+        NUM_OF_BITS = 8
+        SLICE_SIZE = 1 << 18  # bytes encoded at once, a slice takes longest code length bytes per byte
+        max_code_len = max(code[1] for code in code_table if code)
+        # the bits of every code from the most significant, and which of them are valid:
+        bit_indexes = np.arange(max_code_len)
+        codes = np.array([code[0] if code else 0 for code in code_table], dtype=np.uint64)
+        code_lengths = np.array([code[1] if code else 0 for code in code_table], dtype=np.int64)
+        shifts = np.maximum(code_lengths[:, None] - 1 - bit_indexes, 0).astype(np.uint64)
+        code_bits = ((codes[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+        code_masks = bit_indexes < code_lengths[:, None]
+
+        all_chars = np.frombuffer(data, dtype=np.uint8)
+        for slice_start in range(0, len(all_chars), SLICE_SIZE):
+            chars = all_chars[slice_start:slice_start + SLICE_SIZE]
+            # the buffered bits of the previous call come first:
+            buffered_bits = [(self.bits_buffer >> shift) & 1 for shift in range(self.num_of_buffered_bits - 1, -1, -1)]
+            bits = np.concatenate((np.array(buffered_bits, dtype=np.uint8), code_bits[chars][code_masks[chars]]))
+            full_bits = len(bits) - len(bits) % NUM_OF_BITS
+            self.packed_data += np.packbits(bits[:full_bits]).tobytes()
+            # keep the bits of the last partial byte in the integer buffer:
+            self.num_of_buffered_bits = len(bits) - full_bits
+            self.bits_buffer = 0
+            for bit in bits[full_bits:].tolist():
+                self.bits_buffer = (self.bits_buffer << 1) | bit
+
+    def write_bits(self, code, code_length):
+        """
+        Packs a single code into the output bytes.
+
+        Parameters:
+        - code: The code as an integer.
+        - code_length: The length of the code in bits.
+        """
+        NUM_OF_BITS = 8
+        self.bits_buffer = (self.bits_buffer << code_length) | code
+        self.num_of_buffered_bits += code_length
+        if self.num_of_buffered_bits >= NUM_OF_BITS:
+            num_of_bytes = self.num_of_buffered_bits // NUM_OF_BITS
+            self.num_of_buffered_bits -= num_of_bytes * NUM_OF_BITS
+            self.packed_data += (self.bits_buffer >> self.num_of_buffered_bits).to_bytes(num_of_bytes, byteorder="big")
+            self.bits_buffer &= (1 << self.num_of_buffered_bits) - 1
+
+    def get_packed_data(self) -> Tuple[bytes, int]:
+        """
+        Flushes the buffered bits, completing the last byte with artificial zeros.
+
+        Returns:
+        - A tuple of the packed bytes and the exact number of bits written (without the artificial zeros).
+        """
+        NUM_OF_BITS = 8
+        bits_length = len(self.packed_data) * NUM_OF_BITS + self.num_of_buffered_bits
+        if self.num_of_buffered_bits:
+            num_of_bytes = (self.num_of_buffered_bits + NUM_OF_BITS - 1) // NUM_OF_BITS
+            padding = num_of_bytes * NUM_OF_BITS - self.num_of_buffered_bits
+            self.packed_data += (self.bits_buffer << padding).to_bytes(num_of_bytes, byteorder="big")
+            self.bits_buffer = 0
+            self.num_of_buffered_bits = 0
+        return bytes(self.packed_data), bits_length
+
+
 class Huffman:
-    def __init__(self, text):
+    def __init__(self, text, max_code_len=None):
         """
         Initializes the Huffman object with the given text.
 
         Parameters:
         - text: The input data to be encoded.
+        - max_code_len: The maximal length of a code in bits. Defaults to None (no limit).
         """
         self.text = text
+        self.max_code_len = max_code_len
+        self.code_len_cost_bits = 0  # the extra bits the code length limit cost
         self.root = None
         self.char_count_dict = {}
+        self.byte_counter = ByteCounter()
         self.count_chars()
         self.huffman_code_dict = {}
         self.tree_index = 0
+        self.decode_table = {}
+        self.nibble_table = {}
 
-    def count_chars(self):
+    def count_chars(self, chunk=None):
         """
-        Counts the occurrences of each character in the input text and stores them in char_count_dict.
+        Counts the occurrences of each character and stores them in char_count_dict.
+        Can be called again with the next chunk of the data, the counts are accumulated.
+
+        Parameters:
+        - chunk: A chunk of the data to count. Defaults to the input text.
         """
-        for char in self.text:
-            if char in self.char_count_dict:
-                self.char_count_dict[char] += 1
-            else:
-                self.char_count_dict[char] = 1
+        self.byte_counter.update(self.text if chunk is None else chunk)
+        self.char_count_dict = self.byte_counter.get_char_count_dict()
 
     def create_tree(self):
         """
         Constructs the Huffman tree based on the character frequencies.
+        If the tree is deeper than max_code_len, the code lengths are limited with package-merge
+        and the tree is rebuilt from the limited canonical codes.
+
+        Raises:
+        - ValueError: If no chars were counted (empty data has no tree).
         """
-        priority_queue = PriorityQueue()
-        for char in self.char_count_dict:
-            leaf = Node(char, self.char_count_dict[char])
-            priority_queue.put(leaf)
-        while priority_queue.qsize() > 1:
-            priority_queue.put(Node(None, 0, priority_queue.get(), priority_queue.get()))
-        self.root = priority_queue.get()
+        if not self.char_count_dict:
+            raise ValueError("Can't create a Huffman tree for empty data (no chars were counted)")
+        heap = [Node(char, count) for char, count in self.char_count_dict.items()]
+        heapq.heapify(heap)
+        while len(heap) > 1:
+            heapq.heappush(heap, Node(None, 0, heapq.heappop(heap), heapq.heappop(heap)))
+        self.root = heap[0]
+        code_lengths = self.get_tree_code_lengths(self.root)
+        if self.max_code_len and max(code_lengths) > self.max_code_len:
+            limited_code_lengths = self.get_limited_code_lengths(self.max_code_len)
+            self.code_len_cost_bits = self.get_bits_length(limited_code_lengths) - self.get_bits_length(code_lengths)
+            self.set_canonical_code(limited_code_lengths)
+
+    def get_tree_code_lengths(self, root) -> List[int]:
+        """
+        Finds the depth of every leaf in the tree (without recursion).
+
+        Parameters:
+        - root: The root node of the Huffman tree.
+
+        Returns:
+        - A list of the code length of every byte value (0 for bytes that don't appear).
+        """
+        code_lengths = [0] * 256
+        if self.is_leaf(root):  # in case of 1 char its code is "0"
+            code_lengths[int(root.char)] = 1
+            return code_lengths
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if node is None:
+                continue
+            if self.is_leaf(node):
+                code_lengths[int(node.char)] = depth
+            else:
+                stack.append((node.left_node, depth + 1))
+                stack.append((node.right_node, depth + 1))
+        return code_lengths
+
+    def get_limited_code_lengths(self, max_code_len) -> List[int]:
+        """
+        Finds the optimal code lengths that are not longer than max_code_len, using the package-merge algorithm:
+        every char is a coin of its frequency in each of the max_code_len levels, the cheapest 2n - 2 coins
+        (after pairing up the coins of the deeper levels into packages) give the code length of each char.
+
+        Parameters:
+        - max_code_len: The maximal length of a code in bits.
+
+        Returns:
+        - A list of the code length of every byte value (0 for bytes that don't appear).
+
+        Raises:
+        - ValueError: If the chars can't get codes of at most max_code_len bits.
+        """
+        if len(self.char_count_dict) > 2 ** max_code_len:
+            raise ValueError(f"{len(self.char_count_dict)} different bytes can't have codes of at most "
+                             f"{max_code_len} bits")
+        WEIGHT_INDEX = 0
+        leaves = sorted((count, [char]) for char, count in self.char_count_dict.items())
+        packages = leaves
+        for _ in range(max_code_len - 1):
+            paired = [(packages[i][WEIGHT_INDEX] + packages[i + 1][WEIGHT_INDEX], packages[i][1] + packages[i + 1][1])
+                      for i in range(0, len(packages) - 1, 2)]
+            packages = list(heapq.merge(leaves, paired, key=lambda package: package[WEIGHT_INDEX]))
+        code_lengths = [0] * 256
+        for _, chars in packages[:2 * len(leaves) - 2]:
+            for char in chars:
+                code_lengths[char] += 1
+        return code_lengths
+
+    def get_bits_length(self, code_lengths) -> int:
+        """
+        Parameters:
+        - code_lengths: A list of the code length of every byte value.
+
+        Returns:
+        - The length in bits of the text encoded with codes of those lengths.
+        """
+        return sum(count * code_lengths[int(char)] for char, count in self.char_count_dict.items())
 
     def is_leaf(self, node):
         """
@@ -112,6 +347,154 @@ class Huffman:
             self.create_huffman_code(self.root, "")
         return self.get_encode_text()
 
+    def encode_bytes(self, is_tree_exist=False, chunks=None) -> Tuple[bytes, int]:
+        """
+        Encodes the input text using Huffman coding, packing the codes straight into bytes
+        (without building the string of 0 and 1 that encode returns).
+
+        Parameters:
+        - is_tree_exist: Indicates whether the Huffman tree has already been created.
+                         Defaults to False.
+        - chunks: An iterable of the data chunks to encode. Defaults to the input text.
+
+        Returns:
+        - A tuple of the packed encoded data and its length in bits (without the artificial zeros).
+        """
+        self.create_codes(is_tree_exist)
+        return self.write_chunks(chunks)
+
+    def create_codes(self, is_tree_exist=False, canonical=False):
+        """
+        Creates the Huffman codes, after it the data can be packed with write_chunks.
+
+        Parameters:
+        - is_tree_exist: Indicates whether the Huffman tree has already been created.
+                         Defaults to False.
+        - canonical: Whether to use canonical codes (the tree is rebuilt from them). Defaults to False.
+        """
+        if not is_tree_exist:
+            self.create_tree()
+        if self.is_leaf(self.root):
+            self.huffman_code_dict[self.root.char] = "0"
+        else:
+            self.create_huffman_code(self.root, "")
+        if canonical:
+            self.set_canonical_code(self.get_code_lengths())
+
+    def write_chunks(self, chunks=None) -> Tuple[bytes, int]:
+        """
+        Packs the data with the current Huffman codes.
+
+        Parameters:
+        - chunks: An iterable of the data chunks to encode. Defaults to the input text.
+
+        Returns:
+        - A tuple of the packed encoded data and its length in bits (without the artificial zeros).
+        """
+        code_table = self.get_code_table()
+        bit_writer = BitWriter()
+        for chunk in ([self.text] if chunks is None else chunks):
+            bit_writer.write_codes(chunk, code_table)
+        return bit_writer.get_packed_data()
+
+    def get_code_table(self) -> List:
+        """
+        Converts the Huffman codes into a table indexed by the byte value.
+
+        Returns:
+        - A list of 256 (code, code length) tuples where the code is an integer, None for unused bytes.
+        """
+        BASE = 2
+        code_table = [None] * 256
+        for char, code in self.huffman_code_dict.items():
+            code_table[int(char)] = (int(code, BASE), len(code))
+        return code_table
+
+    def encode_canonical(self, chunks=None) -> Tuple[bytes, int]:
+        """
+        Encodes the input text using canonical Huffman codes.
+        The codes have the same lengths as the regular Huffman codes, but they can be rebuilt
+        from the lengths alone so only the lengths need to be stored.
+
+        Parameters:
+        - chunks: An iterable of the data chunks to encode. Defaults to the input text.
+
+        Returns:
+        - A tuple of the packed encoded data and its length in bits (without the artificial zeros).
+        """
+        self.create_codes(canonical=True)
+        return self.write_chunks(chunks)
+
+    def get_code_lengths(self) -> List[int]:
+        """
+        Returns:
+        - A list of the code length of every byte value (0 for bytes that don't appear).
+        """
+        code_lengths = [0] * 256
+        for char, code in self.huffman_code_dict.items():
+            code_lengths[int(char)] = len(code)
+        return code_lengths
+
+    def set_canonical_code(self, code_lengths):
+        """
+        Assigns the canonical Huffman codes for the given code lengths and rebuilds the tree from them.
+        The codes are given in order of (code length, byte value), each code is the previous one plus 1,
+        shifted left when the length grows.
+
+        Parameters:
+        - code_lengths: A list of the code length of every byte value (0 for bytes that don't appear).
+        """
+        self.huffman_code_dict = {}
+        code = 0
+        prev_length = 0
+        for length, char in sorted((length, char) for char, length in enumerate(code_lengths) if length):
+            code <<= length - prev_length
+            self.huffman_code_dict[char] = format(code, f"0{length}b")
+            code += 1
+            prev_length = length
+        self.create_tree_from_codes()
+
+    def create_tree_from_codes(self):
+        """
+        Builds the Huffman tree from the codes in huffman_code_dict (used when the frequencies aren't known).
+        """
+        self.root = Node()
+        self.decode_table = {}
+        self.nibble_table = {}
+        for char, code in self.huffman_code_dict.items():
+            current = self.root
+            for bit in code[:-1]:
+                if bit == "0":
+                    if current.left_node is None:
+                        current.left_node = Node()
+                    current = current.left_node
+                else:
+                    if current.right_node is None:
+                        current.right_node = Node()
+                    current = current.right_node
+            if code[-1] == "0":
+                current.left_node = Node(char, self.char_count_dict.get(char, 0))
+            else:
+                current.right_node = Node(char, self.char_count_dict.get(char, 0))
+
+    def serialize_code_lengths(self) -> bytes:
+        """
+        Packs the code lengths into a fixed block of 256 bytes, one byte per byte value.
+
+        Returns:
+        - bytes: The code lengths block.
+        """
+        return bytes(self.get_code_lengths())
+
+    def deserialize_code_lengths(self, data):
+        """
+        Rebuilds the canonical codes and the tree from a code lengths block.
+
+        Parameters:
+        - data: The code lengths block written by serialize_code_lengths.
+        """
+        self.set_canonical_code(list(data))
+
     def create_huffman_code(self, root, code):
         """
         Recursively generates Huffman codes for each character in the Huffman tree.
@@ -156,6 +539,139 @@ class Huffman:
                 current = self.root
         return decoded_string
 
+    def get_nibble_row(self, state):
+        """
+        Builds (or returns the cached) 4 bits lookup row of a decoding state, used to build the byte rows.
+
+        Parameters:
+        - state: The node of the Huffman tree the decoder is currently at.
+
+        Returns:
+        - A list of 16 (decoded bytes, next state) tuples, None for bit paths that leave the tree.
+        """
+        if state in self.nibble_table:
+            return self.nibble_table[state]
+        NUM_OF_BITS = 4
+        row = []
+        for nibble in range(16):
+            current = state
+            decoded = bytearray()
+            # walk the 4 bits of the nibble, the most significant bit first:
+            for shift in range(NUM_OF_BITS - 1, -1, -1):
+                if (nibble >> shift) & 1:
+                    current = current.right_node
+                else:
+                    current = current.left_node
+                if current is None:  # a path that doesn't exist in the tree
+                    break
+                if current.right_node == current.left_node == None:
+                    decoded.append(int(current.char))
+                    current = self.root
+            row.append(None if current is None else (bytes(decoded), current))
+        self.nibble_table[state] = row
+        return row
+
+    def get_decode_row(self, state):
+        """
+        Builds (or returns the cached) lookup row of a decoding state.
+        A state is the tree node the decoder stopped at after the previous byte,
+        the row holds for every possible next byte the decoded characters and the next state.
+        The row is put together from the 4 bits rows of the two halves of the byte.
+
+        Parameters:
+        - state: The node of the Huffman tree the decoder is currently at.
+
+        Returns:
+        - A list of 256 (decoded bytes, next state) tuples, None for bit paths that leave the tree.
+        """
+        if state in self.decode_table:
+            return self.decode_table[state]
+        row = []
+        for high_entry in self.get_nibble_row(state):
+            if high_entry is None:
+                row += [None] * 16
+                continue
+            high_decoded, middle_state = high_entry
+            for low_entry in self.get_nibble_row(middle_state):
+                row.append(None if low_entry is None else (high_decoded + low_entry[0], low_entry[1]))
+        self.decode_table[state] = row
+        return row
+
+    def decode_bytes(self, encoded_data, bits_length):
+        """
+        Decodes packed Huffman data a whole byte at a time using lookup tables built from the tree.
+        Produces the same output as decode, which is kept as the bit by bit reference implementation.
+
+        Parameters:
+        - encoded_data: The packed bytes of the encoded data (the most significant bit first).
+        - bits_length: The number of valid bits in encoded_data (without the artificial zeros).
+
+        Returns:
+        - The decoded data.
+
+        Raises:
+        - IOError: If the encoded data doesn't match the tree.
+        """
+        return b"".join(self.decode_chunks([encoded_data], bits_length))
+
+    def decode_chunks(self, encoded_chunks, bits_length):
+        """
+        Decodes packed Huffman data that comes in chunks, like decode_bytes.
+        The decoding state is kept between the chunks, so a code can go on in the next chunk.
+
+        Parameters:
+        - encoded_chunks: An iterable of the chunks of the packed bytes of the encoded data.
+        - bits_length: The number of valid bits in all the chunks (without the artificial zeros).
+
+        Yields:
+        - The decoded data of every chunk.
+
+        Raises:
+        - IOError: If the encoded data doesn't match the tree or is shorter than bits_length.
+        """
+        NUM_OF_BITS = 8
+        if self.is_leaf(self.root):  # in case of 1 char every bit stands for the char:
+            MAX_PIECE_SIZE = 1 << 20
+            for _ in encoded_chunks:  # the chunks are read anyway, the data goes on after them
+                pass
+            char = int(self.root.char).to_bytes(1, byteorder='little')
+            for piece_start in range(0, bits_length, MAX_PIECE_SIZE):
+                yield char * min(MAX_PIECE_SIZE, bits_length - piece_start)
+            return
+        state = self.root
+        full_bytes_left = bits_length // NUM_OF_BITS
+        reminder_bits = bits_length % NUM_OF_BITS
+        last_byte = None  # the byte that is only partly used
+        for encoded_chunk in encoded_chunks:
+            decoded = bytearray()
+            encoded_view = memoryview(encoded_chunk)
+            try:
+                for byte in encoded_view[:full_bytes_left]:
+                    row = self.decode_table.get(state) or self.get_decode_row(state)
+                    decoded_chars, state = row[byte]
+                    decoded += decoded_chars
+            except TypeError:  # the row entry was None
+                raise IOError("Potential file corruption detected.\n"
+                              "The compressed data doesn't match the Huffman tree")
+            if reminder_bits and last_byte is None and full_bytes_left < len(encoded_view):
+                last_byte = encoded_view[full_bytes_left]
+            full_bytes_left -= min(full_bytes_left, len(encoded_view))
+            yield bytes(decoded)
+        if full_bytes_left or (reminder_bits and last_byte is None):
+            raise IOError("Potential file corruption detected.\n"
+                          "The compressed data is shorter than its length")
+        # the last byte is only partly used, finish it bit by bit:
+        decoded = bytearray()
+        for shift in range(NUM_OF_BITS - 1, NUM_OF_BITS - 1 - reminder_bits, -1):
+            state = state.right_node if (last_byte >> shift) & 1 else state.left_node
+            if state is None:
+                raise IOError("Potential file corruption detected.\n"
+                              "The compressed data doesn't match the Huffman tree")
+            if self.is_leaf(state):
+                decoded.append(int(state.char))
+                state = self.root
+        yield bytes(decoded)
+
     def serialize(self, root):
         """
         Serialize a Huffman tree into a string representation.
@@ -204,6 +720,77 @@ class Huffman:
 
         # Decodes your encoded data to tree.
 
+    def serialize_binary(self, root) -> bytes:
+        """
+        Serialize a Huffman tree into a compact binary representation (without the frequencies).
+        +------------------------+----------------------------------+------------------------+
+        | Number of leaves (2B)  |  Tree shape (2 * leaves - 1 bits) |  Leaves chars (1B each) |
+        +------------------------+----------------------------------+------------------------+
+        the shape has a bit for every node in pre order, 1 for an internal node and 0 for a leaf,
+        packed the most significant bit first and completed to a whole byte with zeros.
+        the chars of the leaves are in the same pre order.
+
+        Args:
+        - root: The root node of the Huffman tree.
+
+        Returns:
+        - bytes: The binary representation of the tree.
+        """
+        NUM_OF_LEAVES_BYTES = 2
+        shape_writer = BitWriter()
+        leaves_chars = bytearray()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if self.is_leaf(node):
+                shape_writer.write_bits(0, 1)
+                leaves_chars.append(int(node.char))
+            else:
+                shape_writer.write_bits(1, 1)
+                stack.append(node.right_node)
+                stack.append(node.left_node)
+        shape, _ = shape_writer.get_packed_data()
+        return len(leaves_chars).to_bytes(NUM_OF_LEAVES_BYTES, byteorder="little") + shape + bytes(leaves_chars)
+
+    def deserialize_binary(self, data):
+        """
+        Deserialize the binary representation of a Huffman tree (without recursion).
+
+        Args:
+        - data (bytes): The binary representation written by serialize_binary.
+
+        Returns:
+        - Node: The root node of the reconstructed Huffman tree.
+        """
+        NUM_OF_LEAVES_BYTES = 2
+        NUM_OF_BITS = 8
+        num_of_leaves = int.from_bytes(data[:NUM_OF_LEAVES_BYTES], byteorder="little")
+        num_of_nodes = 2 * num_of_leaves - 1
+        shape = data[NUM_OF_LEAVES_BYTES:NUM_OF_LEAVES_BYTES + (num_of_nodes + NUM_OF_BITS - 1) // NUM_OF_BITS]
+        leaves_chars = data[NUM_OF_LEAVES_BYTES + len(shape):]
+        root = None
+        leaf_index = 0
+        waiting_nodes = []  # internal nodes that still miss a child
+        for node_index in range(num_of_nodes):
+            is_internal = (shape[node_index // NUM_OF_BITS] >> (NUM_OF_BITS - 1 - node_index % NUM_OF_BITS)) & 1
+            if is_internal:
+                node = Node()
+            else:
+                node = Node(leaves_chars[leaf_index])
+                leaf_index += 1
+            if waiting_nodes:
+                parent = waiting_nodes[-1]
+                if parent.left_node is None:
+                    parent.left_node = node
+                else:
+                    parent.right_node = node
+                    waiting_nodes.pop()
+            else:
+                root = node
+            if is_internal:
+                waiting_nodes.append(node)
+        return root
+
     def deserialize(self, data):
         """
             Deserialize a string representation of a Huffman tree into the tree structure.
@@ -104,13 +104,17 @@ class ZipController():
 
 def handle_compress(args):
     """compress files into a archive file given the following command line:
-    compress archive.zip file1.txt file2.txt --dirs_to_compress dir1 --encoding HUF/RLE --byte_seq_len 8 --password my_password
+    compress archive.zip file1.txt file2.txt --dirs_to_compress dir1 --encoding HUF/CHUF/AHUF/RHUF/RLE/RLE2/AUTO --byte_seq_len 8
+    --max_code_len 15 --block_size 4 --streams 4 --password my_password
 """
     archive_path = args.archive_path
     files_to_compress = args.files_to_compress
     dirs_to_compress = args.dirs_to_compress
     encoding = args.encoding
     byte_seq_len = args.byte_seq_len
+    max_code_len = args.max_code_len
+    block_size = args.block_size
+    num_of_streams = args.streams
     password = args.password
 
     # Perform compression logic here
@@ -120,12 +124,19 @@ def handle_compress(args):
     print(f"Directories to compress: {dirs_to_compress}")
     print(f"Encoding: {encoding}")
     print(f"Byte sequence length: {byte_seq_len}")
+    print(f"Max code length: {max_code_len}")
+    print(f"Block size: {block_size} MiB")
+    print(f"Streams: {num_of_streams}")
     print(f"Password: {password}")
     try:
         archive_file = Zip(archive_path)
         if byte_seq_len==None:
             byte_seq_len =1
-        archive_file.compress(*files_to_compress,dir=dirs_to_compress,encoding=encoding,byte_seq_len=byte_seq_len,password=password,compress = True)
+        if block_size != None:
+            block_size *= 1 << 20  # MiB to bytes
+        archive_file.compress(*files_to_compress,dir=dirs_to_compress,encoding=encoding,byte_seq_len=byte_seq_len,
+                              max_code_len=max_code_len,block_size=block_size,num_of_streams=num_of_streams,
+                              password=password,compress = True)
     except Exception as e:
         print(str(e))
 def handle_add(args):
@@ -166,29 +177,66 @@ def handle_delete(args):
         print(str(e))
 def handle_update(args):
     """update the archive file given the following command line:
-    update archive_path file_or_dir_to_update --password PASSWORD"""
+    update archive_path file_or_dir_to_update1 file_or_dir_to_update2... --password PASSWORD"""
     print("Update command arguments:")
     print("  Archive path:", args.archive_path)
-    print("  File or directory to update:", args.file_or_dir_to_update)
+    print("  Files or directories to update:", args.file_or_dir_to_update)
     print("  Password:", args.password)
 
     try:
         archive_path = args.archive_path.replace(".bin", "")
         archive_file = Zip(archive_path)
-        archive_file.update(args.file_or_dir_to_update, password=args.password,update = True)
+        archive_file.update(*args.file_or_dir_to_update, password=args.password,update = True)
     except Exception as e:
         print(str(e))
 def handle_extract(args):
     """extract the archive file given his input
-    extract /path/to/extract/dir --password my_password"""
+    extract /path/to/extract/dir --member dir/file.txt --password my_password"""
     print("Extract command arguments:")
     print("  Archive path:", args.archive_path)
     print("  Path to extract directory:", args.path_to_extract_dir)
+    print("  Member:", args.member)
     print("  Password:", args.password)
     try:
         archive_path = args.archive_path.replace(".bin", "")
         archive_file = Zip(archive_path)
-        archive_file.extract(args.path_to_extract_dir, password=args.password,extract = True)
+        archive_file.extract(args.path_to_extract_dir, member=args.member, password=args.password,extract = True)
+    except Exception as e:
+        print(str(e))
+def handle_list(args):
+    """list the files of the archive file given the following command line:
+    list archive.zip --password my_password"""
+    print("List command arguments:")
+    print("  Archive path:", args.archive_path)
+    print("  Password:", args.password)
+    try:
+        archive_path = args.archive_path.replace(".bin", "")
+        archive_file = Zip(archive_path)
+        archive_file.list_files(password=args.password, list=True)
+    except Exception as e:
+        print(str(e))
+def handle_compact(args):
+    """compact the archive file given the following command line:
+    compact archive.zip --password my_password"""
+    print("Compact command arguments:")
+    print("  Archive path:", args.archive_path)
+    print("  Password:", args.password)
+    try:
+        archive_path = args.archive_path.replace(".bin", "")
+        archive_file = Zip(archive_path)
+        archive_file.compact(password=args.password, compact=True)
+    except Exception as e:
+        print(str(e))
+def handle_verify(args):
+    """verify the archive file given the following command line:
+    verify archive.zip --password my_password"""
+    print("Verify command arguments:")
+    print("  Archive path:", args.archive_path)
+    print("  Password:", args.password)
+    try:
+        archive_path = args.archive_path.replace(".bin", "")
+        archive_file = Zip(archive_path)
+        archive_file.verify(password=args.password, verify=True)
     except Exception as e:
         print(str(e))
 def get_parser():
@@ -202,9 +250,21 @@ def get_parser():
     compress_parser.add_argument('archive_path', help='Path to the archive file.')
     compress_parser.add_argument('files_to_compress', nargs='+', help='Files to compress.')
     compress_parser.add_argument('--dirs_to_compress', nargs='+', default=[], help='Directories to compress.')
-    compress_parser.add_argument('--encoding', choices=['HUF', 'RLE'], required=True,
-                                 help='Compression encoding (HUF or RLE).')
-    compress_parser.add_argument('--byte_seq_len', type=int, help='Number of bytes in a single unit (for RLE).')
+    compress_parser.add_argument('--encoding', choices=['HUF', 'CHUF', 'AHUF', 'RHUF', 'RLE', 'RLE2', 'AUTO'],
+                                 required=True,
+                                 help='Compression encoding (HUF, CHUF - canonical Huffman, AHUF - adaptive Huffman, '
+                                      'RHUF - RLE2 followed by Huffman, RLE or RLE2 - RLE with literal runs, '
+                                      'AUTO - HUF, RHUF or storing is chosen for every file). '
+                                      'A file that the encoding doesn\'t make smaller is stored as it is.')
+    compress_parser.add_argument('--byte_seq_len', help='Number of bytes in a single unit (for RLE, RLE2 and RHUF), '
+                                                        'or auto to choose it for every file (RLE and RLE2).')
+    compress_parser.add_argument('--max_code_len', type=int,
+                                 help='Maximal Huffman code length in bits, e.g. 12 or 15 (for HUF, CHUF and RHUF).')
+    compress_parser.add_argument('--block_size', type=int,
+                                 help='Encode every file in blocks of this many MiB, e.g. 1 to 8 (for HUF and CHUF).')
+    compress_parser.add_argument('--streams', type=int,
+                                 help='Split every file of at least 1 MiB into this many streams that are decoded in parallel '
+                                      '(for HUF and CHUF).')
     compress_parser.add_argument('--password', required=True, help='Password for encryption.')
 
     # Add command
@@ -222,18 +282,34 @@ def get_parser():
     # Update command
     update_parser = subparsers.add_parser('update', help='Update file or directory in an existing archive file.')
     update_parser.add_argument('archive_path', help='Path to the archive file.')
-    update_parser.add_argument('file_or_dir_to_update', help='File or directory to update.')
+    update_parser.add_argument('file_or_dir_to_update', nargs='+', help='Files or directories to update.')
     update_parser.add_argument('--password', required=True, help='Password for encryption.')
 
     # Extract command
     extract_parser = subparsers.add_parser('extract', help='Extract files and directories from the archive file.')
     extract_parser.add_argument('archive_path', help='Path to the archive file.')
     extract_parser.add_argument('path_to_extract_dir', help='Path to the directory to extract to.')
+    extract_parser.add_argument('--member', help='A file (directory/name or name) or a directory to extract alone.')
     extract_parser.add_argument('--password', required=True, help='Password for encryption.')
 
+    # List command
+    list_parser = subparsers.add_parser('list', help='List the files of the archive file.')
+    list_parser.add_argument('archive_path', help='Path to the archive file.')
+    list_parser.add_argument('--password', required=True, help='Password for encryption.')
+
+    # Compact command
+    compact_parser = subparsers.add_parser('compact', help='Remove the deleted files from the archive file.')
+    compact_parser.add_argument('archive_path', help='Path to the archive file.')
+    compact_parser.add_argument('--password', required=True, help='Password for encryption.')
+
+    # Verify command
+    verify_parser = subparsers.add_parser('verify', help='Check the files of the archive file without extracting them.')
+    verify_parser.add_argument('archive_path', help='Path to the archive file.')
+    verify_parser.add_argument('--password', required=True, help='Password for encryption.')
+
     return parser
 def handle_terminal_commands():
-    """get user input and act according to his commands( update add compress extract quit delete)"""
+    """get user input and act according to his commands( update add compress extract list compact verify quit delete)"""
     parser = get_parser()
 
     while True:
@@ -262,6 +338,12 @@ def handle_terminal_commands():
                 handle_update(args)
             elif args.command == 'extract':
                 handle_extract(args)
+            elif args.command == 'list':
+                handle_list(args)
+            elif args.command == 'compact':
+                handle_compact(args)
+            elif args.command == 'verify':
+                handle_verify(args)
             else:
                 print("Invalid command:", args.command)
         except SystemExit:
@@ -285,7 +367,10 @@ def main():
 
     TO COMPRESS (and create the archive file) FILES AND DIRECTORYS (with only files underneath):
     compress archive_name_with_no_ending file_path_to_compress1 file2... --dirs_to_compress dir_path_to_compress1 dir2... 
-    --byte_seq_len number(in case of RLE)  --encoding HUF/RLE (must be specified)
+    --byte_seq_len number/auto(in case of RLE/RLE2/RHUF)  --encoding HUF/CHUF/AHUF/RHUF/RLE/RLE2/AUTO (must be specified)
+    --max_code_len number(in case of HUF/CHUF/RHUF, limits the length of the Huffman codes)
+    --block_size number_of_MiB(in case of HUF/CHUF, every block gets its own Huffman tree)
+    --streams number(in case of HUF/CHUF, the streams of every file are decoded in parallel)
     --password my_password ( must be specified)
 
 
@@ -295,14 +380,24 @@ def main():
     TO DELETE FILE OR DIRECTORY (only one at a time) from an existing archive file:
     delete archive_path  ( must be specified) file_or_dir_to_delete --password my_password ( must be specified)
 
+    TO COMPACT the archive file (remove the space of the deleted files):
+    compact archive_path --password my_pass( must be specified)
 
-    TO UPDATE FILE OR DIRECTORY (only one at a time) that an exist in the archive file:
-    update archive_path ( must be specified)  path_of_file_to_update/directory_path (only one is allowed at a time) 
+
+    TO UPDATE FILES OR DIRECTORIES that an exist in the archive file:
+    update archive_path ( must be specified)  path_of_file_to_update/directory_path path2... 
     --password PASSWORD ( must be specified)
 
 
     TO EXTRACT the files and directorys from the archive file:
-    extract archive_path path_to_extract_dir(needs to be empty) --password my_pass( must be specified)
+    extract archive_path path_to_extract_dir(needs to be empty) --member dir/file.txt(only this file or directory)
+    --password my_pass( must be specified)
+
+    TO LIST the files of the archive file:
+    list archive_path --password my_pass( must be specified)
+
+    TO VERIFY the files of the archive file (nothing is extracted, the damaged files are listed):
+    verify archive_path --password my_pass( must be specified)
 
     quit - to exit and stop the program'''
     )
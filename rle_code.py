@@ -0,0 +1,643 @@
+import re
+from typing import Tuple
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the standard library is used without it
+    np = None
+
+
+class RLE:
+    NUM_OF_BYTES_TO_COUNT = 2  # every run is stored as a 2 bytes counter followed by its unit
+    MAX_COUNT = (1 << (8 * NUM_OF_BYTES_TO_COUNT)) - 1  # longer runs are split
+    WRITE_BUFFER_SIZE = 1 << 20  # the decoder writes the decompressed data in pieces of about this size
+
+    def __init__(self, byte_seq_len: int):
+        """
+        Initializes a run length coder.
+
+        Parameters:
+        - byte_seq_len: The number of bytes in a single unit (the runs are runs of equal units).
+        """
+        self.byte_seq_len = byte_seq_len
+
+    def encode(self, data: bytes) -> bytes:
+        """
+        Compresses the data into (count, unit) pairs, the count takes 2 bytes (little endian).
+        The runs are found with bulk comparisons instead of comparing every unit in Python.
+        A reminder shorter than a unit is stored at the end with a count of 1.
+
+        Parameters:
+        - data: The data to compress.
+
+        Returns:
+        - The compressed data.
+        """
+        return b"".join(self.encode_chunks([data], len(data)))
+
+    def encode_chunks(self, chunks, data_size: int):
+        """
+        Compresses data that comes in chunks, the compressed data of every chunk is yielded as soon as it is ready.
+        A run that goes on in the next chunk is stored again there (the compressed data of a chunk starts on a unit,
+        a piece of a unit at the end of a chunk is moved to the next one).
+
+        Parameters:
+        - chunks: An iterable of the chunks of the data.
+        - data_size: The size of all the chunks together in bytes.
+
+        Yields:
+        - The compressed data of every chunk, after the original length if the format stores it
+          and before the reminder.
+
+        Raises:
+        - IOError: If the chunks don't add up to data_size.
+        """
+        yield self.encode_length(data_size)
+        chunks_size = 0
+        reminder = b""
+        for chunk in chunks:
+            chunks_size += len(chunk)
+            if reminder:
+                chunk = reminder + chunk
+            num_of_units = len(chunk) // self.byte_seq_len
+            reminder = chunk[num_of_units * self.byte_seq_len:]
+            yield self.encode_units(chunk, num_of_units)
+        if chunks_size != data_size:
+            raise IOError(f"The data is {chunks_size} bytes instead of {data_size}")
+        yield self.encode_reminder(reminder)
+
+    def encode_length(self, data_size: int) -> bytes:
+        """
+        Parameters:
+        - data_size: The original length of the data.
+
+        Returns:
+        - What is stored before the pairs (nothing, the pairs add up to the length).
+        """
+        return b""
+
+    def encode_units(self, data: bytes, num_of_units: int) -> bytes:
+        """
+        Compresses the whole units of the data into (count, unit) pairs.
+
+        Parameters:
+        - data: The data to compress.
+        - num_of_units: The number of whole units at the start of the data.
+
+        Returns:
+        - The pairs.
+        """
+        if np is not None:
+            return bytes(self.encode_units_numpy(data, num_of_units))
+        return bytes(self.encode_units_regex(data, num_of_units * self.byte_seq_len))
+
+    def encode_reminder(self, reminder: bytes) -> bytes:
+        """
+        Parameters:
+        - reminder: The end of the data that is shorter than a unit (may be empty).
+
+        Returns:
+        - The pair of the reminder with a single occurrence, nothing without a reminder.
+        """
+        if not reminder:
+            return b""
+        OCCURRENCE = 1
+        return self.count_to_bytes(OCCURRENCE) + reminder
+
+    def encode_units_numpy(self, data: bytes, num_of_units: int) -> bytearray:
+        """
+        Compresses the whole units of the data with NumPy.
+        The units are a (units, unit length) view of the data, a run ends where a row differs from the next one.
+
+        Parameters:
+        - data: The data to compress.
+        - num_of_units: The number of whole units in the data.
+
+        Returns:
+        - The compressed units as (count, unit) pairs.
+        """
+        if num_of_units == 0:
+            return bytearray()
+        units = np.frombuffer(data, dtype=np.uint8, count=num_of_units * self.byte_seq_len)
+        units = units.reshape(num_of_units, self.byte_seq_len)
+        # the index of the first unit of every run:
+        is_run_end = (units[1:] != units[:-1]).any(axis=1)
+        run_starts = np.concatenate(([0], np.flatnonzero(is_run_end) + 1))
+        counts = np.diff(np.append(run_starts, num_of_units))
+        run_starts, counts = self.split_long_runs(run_starts, counts)
+        # every row of the output is the counter bytes followed by the unit:
+        pairs = np.empty((len(counts), self.NUM_OF_BYTES_TO_COUNT + self.byte_seq_len), dtype=np.uint8)
+        pairs[:, :self.NUM_OF_BYTES_TO_COUNT] = counts.astype("<u2").view(np.uint8).reshape(-1, self.NUM_OF_BYTES_TO_COUNT)
+        pairs[:, self.NUM_OF_BYTES_TO_COUNT:] = units[run_starts]
+        return bytearray(pairs.tobytes())
+
+    def split_long_runs(self, run_starts, counts):
+        """
+        Splits the runs that do not fit in the counter into runs of MAX_COUNT units (and a shorter last one).
+
+        Parameters:
+        - run_starts: NumPy array of the index of the first unit of every run.
+        - counts: NumPy array of the length of every run.
+
+        Returns:
+        - The run starts and the counts after the split.
+        """
+        if len(counts) == 0 or counts.max() <= self.MAX_COUNT:
+            return run_starts, counts
+        num_of_parts = (counts + self.MAX_COUNT - 1) // self.MAX_COUNT
+        split_counts = np.full(int(num_of_parts.sum()), self.MAX_COUNT, dtype=counts.dtype)
+        # the last part of every run gets what is left of it:
+        last_parts = np.cumsum(num_of_parts) - 1
+        split_counts[last_parts] = counts - (num_of_parts - 1) * self.MAX_COUNT
+        return np.repeat(run_starts, num_of_parts), split_counts
+
+    def encode_units_regex(self, data: bytes, units_size: int) -> bytearray:
+        """
+        Compresses the whole units of the data without NumPy.
+        A back reference pattern matches a unit and its repeats, so the regex engine scans the runs.
+
+        Parameters:
+        - data: The data to compress.
+        - units_size: The size in bytes of the whole units in the data.
+
+        Returns:
+        - The compressed units as (count, unit) pairs.
+        """
+        compressed_data = bytearray()
+        # every match starts right after the previous one, so the matches stay aligned to the units:
+        run_pattern = re.compile(rb"(.{%d})\1*" % self.byte_seq_len, re.DOTALL)
+        for run in run_pattern.finditer(data, 0, units_size):
+            unit = run.group(1)
+            count = (run.end() - run.start()) // self.byte_seq_len
+            while count > 0:
+                part_count = min(count, self.MAX_COUNT)
+                compressed_data += self.count_to_bytes(part_count) + unit
+                count -= part_count
+        return compressed_data
+
+    def count_to_bytes(self, count: int) -> bytes:
+        """
+        Converts a run length to the bytes of its counter.
+
+        Parameters:
+        - count: The run length.
+
+        Returns:
+        - The counter bytes.
+        """
+        return count.to_bytes(length=self.NUM_OF_BYTES_TO_COUNT, byteorder="little")
+
+    def decode_to_file(self, archive_file, compressed_size: int, output_file) -> None:
+        """
+        Decompresses an entry straight from the archive into the output file.
+        The entry is read in chunks of whole pairs and written in pieces of about WRITE_BUFFER_SIZE bytes,
+        so the memory does not depend on the size of the file.
+
+        Parameters:
+        - archive_file: The archive file object, positioned at the start of the entry data.
+        - compressed_size: The size of the entry data in bytes.
+        - output_file: The file object the decompressed data is written to.
+
+        Raises:
+        - IOError: If the entry data is truncated or its size doesn't match whole pairs.
+        """
+        PAIRS_PER_READ = 1 << 16
+        read_size = PAIRS_PER_READ * (self.NUM_OF_BYTES_TO_COUNT + self.byte_seq_len)
+        bytes_left = compressed_size
+        while bytes_left > 0:
+            # the reads are made of whole pairs, so only the last one can end with the short reminder pair:
+            pairs_data = archive_file.read(min(read_size, bytes_left))
+            if len(pairs_data) == 0:
+                raise IOError("Potential file corruption detected.\n"
+                              "File size doesn't match its actual size")
+            bytes_left -= len(pairs_data)
+            for piece in self.decode_pairs(pairs_data):
+                output_file.write(piece)
+
+    def decode(self, data: bytes) -> bytes:
+        """
+        Decompresses (count, unit) pairs held in memory.
+
+        Parameters:
+        - data: The compressed data.
+
+        Returns:
+        - The decompressed data.
+        """
+        return b"".join(self.decode_pairs(data))
+
+    def decode_pairs(self, pairs_data: bytes):
+        """
+        Expands (count, unit) pairs, the last pair may hold a unit shorter than byte_seq_len (the reminder).
+
+        Parameters:
+        - pairs_data: The pairs bytes.
+
+        Yields:
+        - The decompressed data in pieces of about WRITE_BUFFER_SIZE bytes.
+
+        Raises:
+        - IOError: If the data ends in the middle of a counter.
+        """
+        pair_size = self.NUM_OF_BYTES_TO_COUNT + self.byte_seq_len
+        num_of_pairs = len(pairs_data) // pair_size
+        pairs_size = num_of_pairs * pair_size
+        if 0 < len(pairs_data) - pairs_size <= self.NUM_OF_BYTES_TO_COUNT:
+            raise IOError("Potential file corruption detected.\n"
+                          "File size doesn't match its actual size")
+        if np is not None:
+            yield from self.expand_pairs_numpy(pairs_data, num_of_pairs)
+        else:
+            yield from self.expand_pairs(pairs_data, pairs_size)
+        if pairs_size != len(pairs_data):
+            # the reminder pair:
+            count = int.from_bytes(pairs_data[pairs_size:pairs_size + self.NUM_OF_BYTES_TO_COUNT], byteorder="little")
+            yield from self.expand_run(pairs_data[pairs_size + self.NUM_OF_BYTES_TO_COUNT:], count)
+
+    def expand_run(self, unit: bytes, count: int):
+        """
+        Expands a single run.
+
+        Parameters:
+        - unit: The unit of the run.
+        - count: The number of times the unit appears.
+
+        Yields:
+        - The run in pieces of at most WRITE_BUFFER_SIZE bytes (or a single unit if it is longer).
+        """
+        units_per_piece = max(1, self.WRITE_BUFFER_SIZE // len(unit))
+        while count > 0:
+            piece_count = min(count, units_per_piece)
+            yield unit * piece_count
+            count -= piece_count
+
+    def expand_pairs(self, pairs_data: bytes, pairs_size: int):
+        """
+        Expands whole pairs without NumPy, every run is repeated in one bytes multiplication.
+
+        Parameters:
+        - pairs_data: The pairs bytes.
+        - pairs_size: The size in bytes of the whole pairs at the start of pairs_data.
+
+        Yields:
+        - The decompressed data in pieces of about WRITE_BUFFER_SIZE bytes.
+        """
+        pair_size = self.NUM_OF_BYTES_TO_COUNT + self.byte_seq_len
+        write_buffer = bytearray()
+        for index in range(0, pairs_size, pair_size):
+            count = int.from_bytes(pairs_data[index:index + self.NUM_OF_BYTES_TO_COUNT], byteorder="little")
+            unit = pairs_data[index + self.NUM_OF_BYTES_TO_COUNT:index + pair_size]
+            if count * self.byte_seq_len > self.WRITE_BUFFER_SIZE:
+                # a run longer than the buffer is written in its own pieces:
+                if write_buffer:
+                    yield bytes(write_buffer)
+                    write_buffer.clear()
+                yield from self.expand_run(unit, count)
+                continue
+            write_buffer += unit * count
+            if len(write_buffer) >= self.WRITE_BUFFER_SIZE:
+                yield bytes(write_buffer)
+                write_buffer.clear()
+        if write_buffer:
+            yield bytes(write_buffer)
+
+    def expand_pairs_numpy(self, pairs_data: bytes, num_of_pairs: int):
+        """
+        Expands whole pairs with NumPy.
+        The pairs are split into groups of about WRITE_BUFFER_SIZE decompressed bytes, every group is one repeat call.
+
+        Parameters:
+        - pairs_data: The pairs bytes.
+        - num_of_pairs: The number of whole pairs at the start of pairs_data.
+
+        Yields:
+        - The decompressed data in pieces of about WRITE_BUFFER_SIZE bytes.
+        """
+        if num_of_pairs == 0:
+            return
+        pair_size = self.NUM_OF_BYTES_TO_COUNT + self.byte_seq_len
+        pairs = np.frombuffer(pairs_data, dtype=np.uint8, count=num_of_pairs * pair_size).reshape(num_of_pairs, pair_size)
+        counts = pairs[:, :self.NUM_OF_BYTES_TO_COUNT].copy().view("<u2").ravel().astype(np.int64)
+        units = pairs[:, self.NUM_OF_BYTES_TO_COUNT:]
+        runs_sizes = counts * self.byte_seq_len
+        # the runs longer than the buffer are written in their own pieces, the rest is grouped between them:
+        long_runs = np.flatnonzero(runs_sizes > self.WRITE_BUFFER_SIZE).tolist()
+        segment_start = 0
+        for segment_end in long_runs + [num_of_pairs]:
+            if segment_end > segment_start:
+                segment_sizes = runs_sizes[segment_start:segment_end]
+                # the index of the buffer every run starts in:
+                buffer_indexes = (np.cumsum(segment_sizes) - segment_sizes) // self.WRITE_BUFFER_SIZE
+                group_starts = np.flatnonzero(np.diff(buffer_indexes)) + 1
+                group_bounds = [0] + group_starts.tolist() + [segment_end - segment_start]
+                for group_start, group_end in zip(group_bounds, group_bounds[1:]):
+                    group_start += segment_start
+                    group_end += segment_start
+                    yield np.repeat(units[group_start:group_end], counts[group_start:group_end], axis=0).tobytes()
+            if segment_end < num_of_pairs:
+                yield from self.expand_run(units[segment_end].tobytes(), int(counts[segment_end]))
+            segment_start = segment_end + 1
+
+
+class RLE2(RLE):
+    READ_SIZE = 1 << 20  # the decoder reads the tokens of an entry in chunks of this size
+    MAX_VARINT_BYTES = 10  # the length of the varint of a 64 bits integer
+
+    def __init__(self, byte_seq_len: int):
+        """
+        Initializes a PackBits style run length coder.
+        The data is a varint of its original length followed by tokens, every token starts with a varint:
+        an odd varint is a run of (varint >> 1) + min_run_units units followed by the unit,
+        an even varint is (varint >> 1) + 1 literal units followed by the units themselves.
+        The reminder shorter than a unit is stored as is after the tokens.
+
+        Parameters:
+        - byte_seq_len: The number of bytes in a single unit.
+        """
+        super().__init__(byte_seq_len)
+        # a shorter run costs more as its own token than inside a literal token:
+        self.min_run_units = 2 // byte_seq_len + 2
+
+    def encode_length(self, data_size: int) -> bytes:
+        """
+        Parameters:
+        - data_size: The original length of the data.
+
+        Returns:
+        - The varint of the length, which is stored before the tokens.
+        """
+        return self.encode_varint(data_size)
+
+    def encode_units(self, data: bytes, num_of_units: int) -> bytes:
+        """
+        Compresses the whole units of the data into literal and run tokens.
+
+        Parameters:
+        - data: The data to compress.
+        - num_of_units: The number of whole units at the start of the data.
+
+        Returns:
+        - The tokens.
+        """
+        compressed_data = bytearray()
+        literal_start = 0
+        for run_start, count in self.get_long_runs(data, num_of_units):
+            if run_start > literal_start:
+                compressed_data += self.get_literal_token(data, literal_start, run_start)
+            compressed_data += self.encode_varint((count - self.min_run_units) << 1 | 1)
+            compressed_data += data[run_start * self.byte_seq_len:(run_start + 1) * self.byte_seq_len]
+            literal_start = run_start + count
+        if num_of_units > literal_start:
+            compressed_data += self.get_literal_token(data, literal_start, num_of_units)
+        return bytes(compressed_data)
+
+    def encode_reminder(self, reminder: bytes) -> bytes:
+        """
+        Parameters:
+        - reminder: The end of the data that is shorter than a unit (may be empty).
+
+        Returns:
+        - The reminder as is, it is stored after the tokens.
+        """
+        return reminder
+
+    def get_literal_token(self, data: bytes, start: int, end: int) -> bytes:
+        """
+        Returns the token of the literal units from start to end (not included).
+
+        Parameters:
+        - data: The data to compress.
+        - start: The index of the first unit.
+        - end: The index after the last unit.
+
+        Returns:
+        - The literal token.
+        """
+        return self.encode_varint((end - start - 1) << 1) + data[start * self.byte_seq_len:end * self.byte_seq_len]
+
+    def get_long_runs(self, data: bytes, num_of_units: int):
+        """
+        Finds the runs of at least min_run_units units, everything between them is stored as literals.
+
+        Parameters:
+        - data: The data to compress.
+        - num_of_units: The number of whole units in the data.
+
+        Yields:
+        - (index of the first unit, number of units) of every long run.
+        """
+        if num_of_units == 0:
+            return
+        if np is not None:
+            units = np.frombuffer(data, dtype=np.uint8, count=num_of_units * self.byte_seq_len)
+            units = units.reshape(num_of_units, self.byte_seq_len)
+            is_run_end = (units[1:] != units[:-1]).any(axis=1)
+            run_starts = np.concatenate(([0], np.flatnonzero(is_run_end) + 1))
+            counts = np.diff(np.append(run_starts, num_of_units))
+            is_long_run = counts >= self.min_run_units
+            yield from zip(run_starts[is_long_run].tolist(), counts[is_long_run].tolist())
+        else:
+            run_pattern = re.compile(rb"(.{%d})\1{%d,}" % (self.byte_seq_len, self.min_run_units - 1), re.DOTALL)
+            # a long run has to start on a unit, so the matches that start inside a unit are moved to the next one:
+            position = 0
+            units_size = num_of_units * self.byte_seq_len
+            while True:
+                run = run_pattern.search(data, position, units_size)
+                if run is None:
+                    return
+                unit_offset = run.start() % self.byte_seq_len
+                if unit_offset != 0:
+                    position = run.start() + self.byte_seq_len - unit_offset
+                    continue
+                yield run.start() // self.byte_seq_len, (run.end() - run.start()) // self.byte_seq_len
+                position = run.end()
+
+    def decode_to_file(self, archive_file, compressed_size: int, output_file) -> None:
+        """
+        Decompresses an entry straight from the archive into the output file.
+        The tokens are read in chunks of READ_SIZE bytes and the output is written in pieces,
+        so the memory does not depend on the size of the file.
+
+        Parameters:
+        - archive_file: The archive file object, positioned at the start of the entry data.
+        - compressed_size: The size of the entry data in bytes.
+        - output_file: The file object the decompressed data is written to.
+
+        Raises:
+        - IOError: If the entry data is corrupted.
+        """
+        for piece in self.decode_chunks(self.read_entry_data(archive_file, compressed_size)):
+            output_file.write(piece)
+
+    def read_entry_data(self, archive_file, compressed_size: int):
+        """
+        Reads the data of an entry in chunks of READ_SIZE bytes.
+
+        Parameters:
+        - archive_file: The archive file object, positioned at the start of the entry data.
+        - compressed_size: The size of the entry data in bytes.
+
+        Yields:
+        - The next chunk of the entry data.
+
+        Raises:
+        - IOError: If the entry data is truncated.
+        """
+        bytes_left = compressed_size
+        while bytes_left > 0:
+            chunk = archive_file.read(min(self.READ_SIZE, bytes_left))
+            if len(chunk) == 0:
+                raise IOError("Potential file corruption detected.\n"
+                              "File size doesn't match its actual size")
+            bytes_left -= len(chunk)
+            yield chunk
+
+    def decode_pairs(self, compressed_data: bytes):
+        """
+        Expands the tokens of a whole entry held in memory.
+
+        Parameters:
+        - compressed_data: The compressed data.
+
+        Yields:
+        - The decompressed data in pieces of about WRITE_BUFFER_SIZE bytes.
+
+        Raises:
+        - IOError: If the tokens don't add up to the original length.
+        """
+        yield from self.decode_chunks([compressed_data])
+
+    def decode_chunks(self, chunks):
+        """
+        Expands the tokens of an entry that come in chunks.
+        A token that is cut at the end of a chunk (its varint or the unit of a run) is carried to the next chunk,
+        the units of a literal token are passed on as they come.
+        The tokens end when they add up to the original length, the reminder shorter than a unit follows them.
+
+        Parameters:
+        - chunks: An iterable of the chunks of the compressed data.
+
+        Yields:
+        - The decompressed data in pieces of about WRITE_BUFFER_SIZE bytes.
+
+        Raises:
+        - IOError: If the tokens don't add up to the original length.
+        """
+        data = b""  # the current chunk, after what was left of the previous one
+        num_of_units = reminder_size = None  # known after the varint of the original length
+        literal_left = 0  # the bytes of a literal token that are in the next chunks
+        write_buffer = bytearray()
+        for chunk in chunks:
+            data += chunk
+            index = 0
+            if num_of_units is None:
+                if not self.is_varint_whole(data, index, len(data)):
+                    continue
+                data_size, index = self.decode_varint(data, index)
+                num_of_units = data_size // self.byte_seq_len
+                reminder_size = data_size - num_of_units * self.byte_seq_len
+            end = len(data)
+            while index < end and (num_of_units > 0 or literal_left):
+                if literal_left:
+                    literal_part = data[index:index + literal_left]
+                    write_buffer += literal_part
+                    literal_left -= len(literal_part)
+                    index += len(literal_part)
+                else:
+                    # a varint of up to 64 bits takes MAX_VARINT_BYTES, so only a token near the end can be cut:
+                    if end - index <= self.MAX_VARINT_BYTES and not self.is_varint_whole(data, index, end):
+                        break
+                    token, token_end = self.decode_varint(data, index)
+                    if token & 1:
+                        if token_end + self.byte_seq_len > end:
+                            break
+                        count = (token >> 1) + self.min_run_units
+                        unit = data[token_end:token_end + self.byte_seq_len]
+                        index = token_end + self.byte_seq_len
+                        if count * self.byte_seq_len > self.WRITE_BUFFER_SIZE:
+                            if write_buffer:
+                                yield bytes(write_buffer)
+                                write_buffer.clear()
+                            yield from self.expand_run(unit, count)
+                        else:
+                            write_buffer += unit * count
+                    else:
+                        count = (token >> 1) + 1
+                        literal_part = data[token_end:token_end + count * self.byte_seq_len]
+                        write_buffer += literal_part
+                        literal_left = count * self.byte_seq_len - len(literal_part)
+                        index = token_end + len(literal_part)
+                    num_of_units -= count
+                if len(write_buffer) >= self.WRITE_BUFFER_SIZE:
+                    yield bytes(write_buffer)
+                    write_buffer.clear()
+            data = data[index:]
+            if num_of_units <= 0 and not literal_left and len(data) > reminder_size:
+                # the data goes on after the tokens and the reminder
+                break
+        if num_of_units != 0 or literal_left or len(data) != reminder_size:
+            raise IOError("Potential file corruption detected.\n"
+                          "File size doesn't match its actual size")
+        write_buffer += data
+        if write_buffer:
+            yield bytes(write_buffer)
+
+    def is_varint_whole(self, data: bytes, index: int, end: int) -> bool:
+        """
+        Parameters:
+        - data: The bytes that hold the varint.
+        - index: The index of the first byte of the varint.
+        - end: The index after the last byte that can be read.
+
+        Returns:
+        - Whether the varint ends before end (its last byte is the first one without the high bit).
+        """
+        while index < end:
+            if data[index] < 0x80:
+                return True
+            index += 1
+        return False
+
+    def encode_varint(self, value: int) -> bytes:
+        """
+        Encodes a non negative integer in 7 bits groups, the least significant first,
+        the high bit of every byte tells if more bytes follow.
+
+        Parameters:
+        - value: The integer to encode.
+
+        Returns:
+        - The varint bytes.
+        """
+        varint = bytearray()
+        while value > 0x7F:
+            varint.append(value & 0x7F | 0x80)
+            value >>= 7
+        varint.append(value)
+        return bytes(varint)
+
+    def decode_varint(self, data: bytes, index: int) -> Tuple[int, int]:
+        """
+        Decodes a varint written by encode_varint.
+
+        Parameters:
+        - data: The bytes that hold the varint.
+        - index: The index of the first byte of the varint.
+
+        Returns:
+        - The integer and the index after the varint.
+
+        Raises:
+        - IOError: If the data ends inside the varint.
+        """
+        value = 0
+        shift = 0
+        while True:
+            if index >= len(data):
+                raise IOError("Potential file corruption detected.\n"
+                              "File size doesn't match its actual size")
+            byte = data[index]
+            index += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, index
+            shift += 7
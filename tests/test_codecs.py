@@ -0,0 +1,161 @@
+import itertools
+import random
+
+import pytest
+
+import huffman_code
+import rle_code
+from adaptive_huffman import AdaptiveHuffman
+from huffman_code import BitWriter, Huffman
+from rle_code import RLE, RLE2
+
+
+def get_sample_data(size, seed=0):
+    """return data with runs, text and random bytes, like the files the archive gets"""
+    rng = random.Random(seed)
+    data = bytearray()
+    while len(data) < size:
+        kind = rng.randrange(3)
+        if kind == 0:
+            data += bytes([rng.randrange(4)]) * rng.randrange(1, 300)
+        elif kind == 1:
+            data += b"the quick brown fox jumps over the lazy dog "[:rng.randrange(1, 44)]
+        else:
+            data += bytes(rng.randrange(256) for _ in range(rng.randrange(1, 40)))
+    return bytes(data[:size])
+
+
+SAMPLES = [b"", b"a", b"ab", b"a" * 1000, bytes(range(256)) * 3, get_sample_data(5000), get_sample_data(70000, 1)]
+
+
+@pytest.mark.parametrize("coder_class", [RLE, RLE2])
+@pytest.mark.parametrize("byte_seq_len", [1, 2, 3, 8])
+@pytest.mark.parametrize("data", SAMPLES)
+def test_rle_round_trip(coder_class, byte_seq_len, data):
+    coder = coder_class(byte_seq_len)
+    assert coder.decode(coder.encode(data)) == data
+
+
+@pytest.mark.parametrize("coder_class", [RLE, RLE2])
+def test_rle_chunks_round_trip(coder_class):
+    data = get_sample_data(50000, 2)
+    coder = coder_class(3)
+    # chunks that don't end on a unit, a run that goes on in the next chunk is stored again there:
+    chunks = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+    assert coder.decode(b"".join(coder.encode_chunks(chunks, len(data)))) == data
+
+
+@pytest.mark.parametrize("byte_seq_len", [1, 3])
+def test_rle_numpy_matches_pure_python(monkeypatch, byte_seq_len):
+    if rle_code.np is None:
+        pytest.skip("NumPy isn't installed")
+    data = get_sample_data(20000, 7)
+    numpy_encoded = RLE(byte_seq_len).encode(data)
+    monkeypatch.setattr(rle_code, "np", None)
+    assert RLE(byte_seq_len).encode(data) == numpy_encoded
+
+
+def test_rle2_decode_chunks():
+    data = get_sample_data(50000, 3)
+    coder = RLE2(2)
+    encoded = coder.encode(data)
+    # split the tokens anywhere, also in the middle of a varint or a unit:
+    chunks = [encoded[i:i + 7] for i in range(0, len(encoded), 7)]
+    assert b"".join(coder.decode_chunks(chunks)) == data
+
+
+@pytest.mark.parametrize("data", [d for d in SAMPLES if d])
+@pytest.mark.parametrize("max_code_len", [None, 9])
+def test_huffman_round_trip(data, max_code_len):
+    huffman = Huffman(data, max_code_len)
+    encoded_data, bits_length = huffman.encode_bytes()
+    decoder = Huffman(b"")
+    decoder.root = decoder.deserialize_binary(huffman.serialize_binary(huffman.root))
+    assert decoder.decode_bytes(encoded_data, bits_length) == data
+
+
+@pytest.mark.parametrize("data", [d for d in SAMPLES if d])
+def test_canonical_huffman_round_trip(data):
+    huffman = Huffman(data)
+    encoded_data, bits_length = huffman.encode_canonical()
+    decoder = Huffman(b"")
+    decoder.deserialize_code_lengths(huffman.serialize_code_lengths())
+    assert decoder.decode_bytes(encoded_data, bits_length) == data
+
+
+def test_huffman_decode_chunks():
+    data = get_sample_data(30000, 4)
+    huffman = Huffman(data)
+    encoded_data, bits_length = huffman.encode_bytes()
+    chunks = [encoded_data[i:i + 5] for i in range(0, len(encoded_data), 5)]
+    assert b"".join(huffman.decode_chunks(chunks, bits_length)) == data
+
+
+def test_huffman_table_decoder_matches_tree_walk():
+    data = get_sample_data(3000, 5)
+    huffman = Huffman(data)
+    encoded_data, bits_length = huffman.encode_bytes()
+    bit_string = "".join(f"{byte:08b}" for byte in encoded_data)[:bits_length]
+    # the per-bit tree walk is kept as the reference of the table-driven decoder:
+    assert huffman.decode_bytes(encoded_data, bits_length) == huffman.decode(bit_string) == data
+
+
+@pytest.mark.parametrize("data", [d for d in SAMPLES if d])
+def test_adaptive_huffman_round_trip(data):
+    encoder = AdaptiveHuffman()
+    # the chunks can come from a stream of unknown size:
+    for i in range(0, len(data), 999):
+        encoder.encode_chunk(data[i:i + 999])
+    encoded_data, bits_length = encoder.get_packed_data()
+    assert AdaptiveHuffman().decode_bytes(encoded_data, bits_length) == data
+
+
+def get_code_cost(counts, code_lengths):
+    return sum(count * code_lengths[char] for char, count in counts.items())
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_package_merge_is_optimal(seed):
+    rng = random.Random(seed)
+    num_of_chars = rng.randrange(2, 7)
+    max_code_len = rng.randrange(3, 5)
+    data = b"".join(bytes([char]) * rng.choice([1, 2, 3, 50, 400, 3000]) for char in range(num_of_chars))
+    huffman = Huffman(data)
+    code_lengths = huffman.get_limited_code_lengths(max_code_len)
+    used_lengths = [code_lengths[char] for char in range(num_of_chars)]
+    assert max(used_lengths) <= max_code_len
+    # a full code: the Kraft sum of the lengths is exactly 1
+    assert sum(2 ** (max_code_len - length) for length in used_lengths) == 2 ** max_code_len
+    # no lengths within the limit that satisfy the Kraft inequality cost less
+    best_cost = min(
+        sum(huffman.char_count_dict[char] * length for char, length in enumerate(lengths))
+        for lengths in itertools.product(range(1, max_code_len + 1), repeat=num_of_chars)
+        if sum(2 ** (max_code_len - length) for length in lengths) <= 2 ** max_code_len)
+    assert get_code_cost(huffman.char_count_dict, code_lengths) == best_cost
+
+
+def test_limited_codes_round_trip():
+    data = bytes(char for char in range(40) for _ in range(2 ** (char // 3)))
+    huffman = Huffman(data, max_code_len=10)
+    encoded_data, bits_length = huffman.encode_bytes()
+    assert max(huffman.get_code_lengths()) <= 10
+    assert huffman.decode_bytes(encoded_data, bits_length) == data
+
+
+def test_numpy_bit_writer_matches_pure_python(monkeypatch):
+    if huffman_code.np is None:
+        pytest.skip("NumPy isn't installed")
+    data = get_sample_data(100000, 6)
+    huffman = Huffman(data)
+    huffman.create_codes()
+    code_table = huffman.get_code_table()
+
+    numpy_writer = BitWriter()
+    numpy_writer.write_bits(5, 3)  # the buffered bits of an earlier write come first
+    numpy_writer.write_codes_numpy(data, code_table)
+
+    monkeypatch.setattr(huffman_code, "np", None)
+    python_writer = BitWriter()
+    python_writer.write_bits(5, 3)
+    python_writer.write_codes(data, code_table)
+    assert numpy_writer.get_packed_data() == python_writer.get_packed_data()
@@ -0,0 +1,208 @@
+import os
+import shutil
+
+import pytest
+
+from headers import ArchiveHeader
+from zip import Zip
+
+PASSWORD = "secret"
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def write_legacy_sources(path):
+    """write the files the archives in tests/data were compressed from (by the version without a central directory)"""
+    os.makedirs(f"{path}/docs")
+    with open(f"{path}/notes.txt", "wb") as file:
+        file.write(b"The quick brown fox jumps over the lazy dog.\n" * 40 + b"a" * 40 + b"\n")
+    with open(f"{path}/docs/runs.bin", "wb") as file:
+        file.write(bytes([0]) * 300 + bytes(range(256)) + bytes([7]) * 200)
+    with open(f"{path}/docs/small.txt", "wb") as file:
+        file.write(b"a small file\n")
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """the files to compress: text, runs, random bytes and a directory (and an empty file)"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("src/docs")
+    with open("src/text.txt", "wb") as file:
+        file.write(b"".join(b"line %d of a log file, status ok\n" % i for i in range(3000)))
+    with open("src/runs.bin", "wb") as file:
+        file.write(b"".join(bytes([i % 5]) * (i % 700) for i in range(400)))
+    with open("src/random.bin", "wb") as file:
+        file.write(os.urandom(20000))
+    with open("src/empty.bin", "wb"):
+        pass
+    with open("src/docs/small.txt", "wb") as file:
+        file.write(b"small\n")
+    with open("src/docs/table.csv", "wb") as file:
+        file.write(b"".join(b"%d,%d,%d\n" % (i, i * i, i % 7) for i in range(2000)))
+    return tmp_path
+
+
+def compress_sources(encoding, **kwargs):
+    Zip("archive").compress("src/text.txt", "src/runs.bin", "src/random.bin", dir=["src/docs"],
+                            encoding=encoding, password=PASSWORD, override=True, **kwargs)
+
+
+def read_file(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def extract(archive_name, output_dir="out", password=PASSWORD):
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.mkdir(output_dir)
+    Zip(archive_name).extract(output_dir, password=password)
+    return output_dir
+
+
+def get_extracted_files(output_dir):
+    """return the relative path and data of every extracted file"""
+    files = {}
+    for dir_path, _, filenames in os.walk(output_dir):
+        for filename in filenames:
+            path = os.path.join(dir_path, filename)
+            files[os.path.relpath(path, output_dir).replace(os.sep, "/")] = read_file(path)
+    return files
+
+
+def get_expected_files():
+    files = {name: read_file(f"src/{name}") for name in ("text.txt", "runs.bin", "random.bin")}
+    files.update({f"docs/{name}": read_file(f"src/docs/{name}") for name in ("small.txt", "table.csv")})
+    return files
+
+
+@pytest.mark.parametrize("encoding, kwargs", [
+    ("HUF", {}),
+    ("HUF", {"max_code_len": 9}),
+    ("HUF", {"block_size": 4096}),
+    ("CHUF", {}),
+    ("CHUF", {"block_size": 10000}),
+    ("AHUF", {}),
+    ("RHUF", {}),
+    ("RHUF", {"byte_seq_len": 2}),
+    ("RLE", {}),
+    ("RLE", {"byte_seq_len": 3}),
+    ("RLE", {"byte_seq_len": "auto"}),
+    ("RLE2", {}),
+    ("RLE2", {"byte_seq_len": "auto"}),
+    ("AUTO", {}),
+])
+def test_round_trip(sources, encoding, kwargs):
+    compress_sources(encoding, **kwargs)
+    assert get_extracted_files(extract("archive")) == get_expected_files()
+    assert "5 files checked, 0 damaged" in Zip("archive").verify(password=PASSWORD)
+
+
+@pytest.mark.parametrize("encoding", ["HUF", "CHUF", "AHUF", "RHUF", "AUTO"])
+def test_empty_file(sources, encoding):
+    Zip("archive").compress("src/empty.bin", "src/text.txt", encoding=encoding, password=PASSWORD, override=True)
+    assert get_extracted_files(extract("archive")) == {"empty.bin": b"", "text.txt": read_file("src/text.txt")}
+
+
+@pytest.mark.parametrize("encoding", ["HUF", "CHUF"])
+def test_streams_round_trip(sources, encoding):
+    # streams are only used for files of at least MIN_STREAMS_FILE_SIZE bytes
+    with open("src/text.txt", "wb") as file:
+        file.write(b"".join(b"record %d: value %d\n" % (i, i * 7 % 1000) for i in range(80000)))
+    assert os.path.getsize("src/text.txt") >= Zip("archive").MIN_STREAMS_FILE_SIZE
+    compress_sources(encoding, num_of_streams=4)
+    assert get_extracted_files(extract("archive")) == get_expected_files()
+
+
+def test_wrong_password(sources):
+    compress_sources("HUF")
+    with pytest.raises(ValueError):
+        extract("archive", password="not the password")
+
+
+def test_duplicate_archive_paths(sources):
+    os.makedirs("other")
+    shutil.copy("src/text.txt", "other/text.txt")
+    compress_sources("HUF")
+    with pytest.raises(ValueError):
+        Zip("archive").compress("src/text.txt", "other/text.txt", encoding="HUF", password=PASSWORD, override=True)
+    # the archive it was told to override is kept
+    assert get_extracted_files(extract("archive")) == get_expected_files()
+    with pytest.raises(FileExistsError):
+        Zip("archive").add("other/text.txt", password=PASSWORD)
+
+
+@pytest.mark.parametrize("encoding", ["HUF", "RLE2", "AUTO"])
+def test_add_delete_update_compact(sources, encoding):
+    compress_sources(encoding)
+    expected_files = get_expected_files()
+
+    with open("extra.txt", "wb") as file:
+        file.write(b"an added file\n" * 50)
+    Zip("archive").add("extra.txt", password=PASSWORD)
+    expected_files["extra.txt"] = read_file("extra.txt")
+    assert get_extracted_files(extract("archive")) == expected_files
+
+    Zip("archive").delete("runs.bin", password=PASSWORD)
+    Zip("archive").delete("docs", password=PASSWORD)
+    del expected_files["runs.bin"], expected_files["docs/small.txt"], expected_files["docs/table.csv"]
+    assert get_extracted_files(extract("archive")) == expected_files
+    with pytest.raises(FileNotFoundError):
+        Zip("archive").delete("runs.bin", password=PASSWORD)
+
+    # the deleted entries stay in the archive until it is compacted
+    size_before_compact = os.path.getsize("archive.bin")
+    Zip("archive").compact(password=PASSWORD)
+    assert os.path.getsize("archive.bin") < size_before_compact
+    assert get_extracted_files(extract("archive")) == expected_files
+
+    with open("src/text.txt", "ab") as file:
+        file.write(b"a new line\n")
+    Zip("archive").update("src/text.txt", password=PASSWORD)
+    expected_files["text.txt"] = read_file("src/text.txt")
+    assert get_extracted_files(extract("archive")) == expected_files
+    assert f"{len(expected_files)} files checked, 0 damaged" in Zip("archive").verify(password=PASSWORD)
+
+
+def test_verify_finds_damaged_entry(sources):
+    compress_sources("HUF")
+    with open("archive.bin", "r+b") as archive_file:
+        header_size = ArchiveHeader(archive_file, from_bytes=True).header_size
+        # the first entry starts right after the header
+        archive_file.seek(header_size + 40)
+        byte = archive_file.read(1)
+        archive_file.seek(-1, os.SEEK_CUR)
+        archive_file.write(bytes([byte[0] ^ 0xFF]))
+    assert "5 files checked, 1 damaged" in Zip("archive").verify(password=PASSWORD)
+
+
+@pytest.mark.parametrize("legacy_archive", ["legacy_huf", "legacy_rle"])
+def test_legacy_archive(tmp_path, monkeypatch, legacy_archive):
+    monkeypatch.chdir(tmp_path)
+    write_legacy_sources("src")
+    shutil.copy(os.path.join(DATA_DIR, f"{legacy_archive}.bin"), "legacy.bin")
+    expected_files = {"notes.txt": read_file("src/notes.txt"),
+                      "docs/runs.bin": read_file("src/docs/runs.bin"),
+                      "docs/small.txt": read_file("src/docs/small.txt")}
+    assert get_extracted_files(extract("legacy")) == expected_files
+
+    # adding a file re-creates the archive with a central directory
+    with open("extra.txt", "wb") as file:
+        file.write(b"an added file\n")
+    Zip("legacy").add("extra.txt", password=PASSWORD)
+    expected_files["extra.txt"] = read_file("extra.txt")
+    with open("legacy.bin", "rb") as archive_file:
+        assert ArchiveHeader(archive_file, from_bytes=True).is_indexed()
+    assert get_extracted_files(extract("legacy")) == expected_files
+
+    Zip("legacy").delete("docs/small.txt", password=PASSWORD)
+    del expected_files["docs/small.txt"]
+    assert get_extracted_files(extract("legacy")) == expected_files
+    assert "3 files checked, 0 damaged" in Zip("legacy").verify(password=PASSWORD)
+
+
+def test_legacy_archive_delete(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_legacy_sources("src")
+    shutil.copy(os.path.join(DATA_DIR, "legacy_huf.bin"), "legacy.bin")
+    Zip("legacy").delete("notes.txt", password=PASSWORD)
+    assert get_extracted_files(extract("legacy")) == {"docs/runs.bin": read_file("src/docs/runs.bin"),
+                                                      "docs/small.txt": read_file("src/docs/small.txt")}
@@ -1,13 +1,119 @@
 import time
 import os
+import io
 import hashlib
-from huffman_code import Huffman
+import math
+from collections import Counter, deque
+from huffman_code import Huffman, ByteCounter
+from adaptive_huffman import AdaptiveHuffman
 import shutil
 from typing import Tuple, List,BinaryIO
-import tempfile
-from headers import ArchiveHeader, HuffFileHeader, RleFileHeader
+from headers import ArchiveHeader, HuffFileHeader, HuffBlockHeader, RleFileHeader, DirectoryEntry, CentralDirectory
+from rle_code import RLE, RLE2
 from decorators import with_temp_dir,password_check
 from cryptography.fernet import Fernet
+from chunked_crypto import ChunkedWriter, ChunkedReader
+from hashing_io import HashingReader, HashingWriter, Crc32Writer
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+
+def decode_huff_stream(encoding_method: str, tree_serialized: bytes, compressed_data: bytes, bits_length: int,
+                       binary_tree: bool = False) -> bytes:
+    """
+    Decodes one stream of Huffman data (a module level function so it can run in a worker process).
+
+    Args:
+        encoding_method (str): "HUF" (a serialized tree) or "CHUF" (a code lengths block).
+        tree_serialized (bytes): The serialized tree or the code lengths block.
+        compressed_data (bytes): The packed encoded data.
+        bits_length (int): The length of the data in bits (without the artificial zeros).
+        binary_tree (bool): Whether the tree is in the binary format or in the old text format.
+
+    Returns:
+        bytes: The decompressed data.
+    """
+    return get_huff_decoder(encoding_method, tree_serialized, binary_tree).decode_bytes(compressed_data, bits_length)
+
+
+def get_huff_decoder(encoding_method: str, tree_serialized: bytes, binary_tree: bool = False) -> Huffman:
+    """
+    Rebuilds the Huffman object that decodes data from its stored tree.
+
+    Args:
+        encoding_method (str): "CHUF" for a code lengths block, any other Huffman algorithm for a serialized tree.
+        tree_serialized (bytes): The serialized tree or the code lengths block.
+        binary_tree (bool): Whether the tree is in the binary format or in the old text format.
+
+    Returns:
+        Huffman: The Huffman object with the tree.
+    """
+    huffman = Huffman(b"")
+    if encoding_method == "CHUF":
+        huffman.deserialize_code_lengths(tree_serialized)
+    elif binary_tree:
+        huffman.root = huffman.deserialize_binary(tree_serialized)
+    else:
+        huffman.root = huffman.deserialize(tree_serialized.decode())
+    return huffman
+
+
+def verify_archive_entry(archive_zip: "Zip", archive_header: ArchiveHeader, entry: DirectoryEntry) -> str:
+    """
+    Verifies one entry of an archive (a module level function so it can run in a worker process).
+
+    Args:
+        archive_zip (Zip): The Zip object of the archive.
+        archive_header (ArchiveHeader): The header of the archive.
+        entry (DirectoryEntry): The central directory entry of the file.
+
+    Returns:
+        str: The problem of the entry, an empty string if it is fine.
+    """
+    return archive_zip.verify_archive_entry(archive_header, entry)
+
+
+class LazyProcessPool:
+    """
+    A pool of worker processes that is started on its first task, so an extraction starts worker processes only
+    when a file has sub streams that are big enough to be decoded in parallel.
+    """
+
+    def __init__(self, max_workers: int = None):
+        """
+        Args:
+            max_workers (int): The number of worker processes, the number of CPUs by default.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = None
+
+    def submit(self, fn, *args):
+        """
+        Starts the worker processes if they weren't started yet and schedules a call in one of them.
+
+        Args:
+            fn: A module level function (so it can be sent to a worker process).
+            *args: The arguments of the call.
+
+        Returns:
+            Future: The future of the call.
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor.submit(fn, *args)
+
+    def shutdown(self) -> None:
+        """Waits for the scheduled calls and stops the worker processes (if they were started)."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> "LazyProcessPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
 
 class Zip:
 
@@ -25,6 +131,29 @@ class Zip:
         self.archive_path = archive_filename + ".bin"  # Path to the archive file
 
         self.byte_seq_len = 1  # Length of a byte sequence in the header
+        self.AUTO_BYTE_SEQ_LEN = 0  # Stored as the byte sequence length when it is chosen for every file
+        self.MAX_AUTO_BYTE_SEQ_LEN = 16  # The longest byte sequence length tried when it is chosen for every file
+        self.byte_seq_len_choices = {}  # The byte sequence length chosen for every file (auto byte sequence length)
+        self.byte_seq_len_choice_time = 0.0  # Time taken to choose the byte sequence lengths
+        self.encoding_method = None  # Compression algorithm of the archive ("HUF", "CHUF", "AHUF", "RHUF", "RLE" or "RLE2")
+        self.HUFFMAN_METHODS = ("HUF", "CHUF", "AHUF", "RHUF")  # The algorithms that use HuffFileHeader
+        self.RLE_METHODS = ("RLE", "RLE2")  # The algorithms that use RleFileHeader
+        self.STORED_METHOD = "STORED"  # An entry of a file copied as it is (uses RleFileHeader)
+        self.AUTO_METHOD = "AUTO"  # An archive whose compression algorithm is chosen for every file
+        # The start of files that are already compressed (JPEG, PNG, GIF, gzip, zip, bzip2, xz, 7z, zstd):
+        self.COMPRESSED_MAGIC_BYTES = (b"\xff\xd8\xff", b"\x89PNG", b"GIF8", b"\x1f\x8b", b"PK\x03\x04", b"BZh",
+                                       b"\xfd7zXZ", b"7z\xbc\xaf", b"\x28\xb5\x2f\xfd")
+        self.CLASSIFY_SAMPLE_SIZE = 1 << 16  # Bytes from the start of every file the compression algorithm is chosen by
+        self.STORED_ENTROPY = 7.5  # Bits per byte from which a file is stored without compressing it
+        self.MIN_CLASSIFY_SAMPLE_SIZE = 64  # Smaller (and empty) files are stored, their codes would cost more
+        self.max_code_len = None  # Maximal Huffman code length in bits (None for no limit)
+        self.block_size = None  # Size of the Huffman blocks in bytes (None to encode every file as one block)
+        self.num_of_streams = 1  # Number of Huffman sub streams every file is split into (for parallel decoding)
+        # Smaller files are written and decoded as a single Huffman stream (a worker process costs more than it saves):
+        self.MIN_STREAMS_FILE_SIZE = 1 << 20
+        self.code_len_cost_bits = 0  # Extra bits the Huffman code length limit cost
+        self.compressed_bits = 0  # Total bits of the Huffman encoded data
+        self.entry_crc32 = None  # The CRC32 of the file whose entry is compressed (a Crc32Writer), None outside entries
         self.is_dir = 0  # Flag indicating directory (0 for False in binary)
 
         self.time_to_extract = 0.0  # Time taken for extraction (initially 0)
@@ -32,6 +161,7 @@ class Zip:
         self.archive_size = 0  # Total size of the archive (initially 0)
         self.total_files_size = 0  # Total size of files to be compressed (initially 0)
         self.encryption_key = None  # Encryption key (initially None)
+        self.format_version = ArchiveHeader.AEAD_CHUNKS_VERSION  # Format of the entries of the archive
         self.password = b""  # Password for encryption (initially empty bytes)
 
     def get_filename(self, file_path: str) -> str:
@@ -63,27 +193,109 @@ class Zip:
                 size += os.path.getsize(file)
         return size
 
-    def convert_to_8_bits(self, data: str) -> bytes:
-        """given a string of 1 and 0 representing a binary sequnce of bits, return the byte representation in 8 bits"""
-        bits_count = 0
-        BASE = 2
-        NUM_OF_BITS = 8
-        ARTIFICIAL_ZERO = "0"
-        encoded_data = bytearray()
-        compress_binary_data_len = len(data)
-        compress_binary_8_bits = data
-        # if the number of 0 and 1 doesnt divided by the 8 add artificial zeros:
-        if compress_binary_data_len % NUM_OF_BITS != 0:
-            # complete the zeros:
-            compress_binary_8_bits += ARTIFICIAL_ZERO * (NUM_OF_BITS - (compress_binary_data_len % NUM_OF_BITS))
-
-        while bits_count < len(compress_binary_8_bits):
-            # convert to 1 byte:
-            byte = int(compress_binary_8_bits[bits_count:bits_count + NUM_OF_BITS], BASE)
-            encoded_data.append(
-                byte)  # 8 becasue of the 8 bits i basicly trick the system to think that those bits are in 8 bits but i just add zeros so it will divide correcly by 8 and
-            bits_count += NUM_OF_BITS
-        return encoded_data
+    def read_file_chunks(self, file_path: str, chunk_size: int = 1 << 20, offset: int = 0, length: int = None):
+        """
+        Reads a file (or a part of it) chunk by chunk.
+
+        Args:
+            file_path (str): The path to the file to read.
+            chunk_size (int): The size of a chunk in bytes.
+            offset (int): Where to start reading.
+            length (int): How many bytes to read, None to read until the end of the file.
+
+        Yields:
+            bytes: The next chunk of the file.
+        """
+        with open(file_path, "rb") as file:
+            file.seek(offset)
+            left_to_read = length
+            chunk = file.read(chunk_size if left_to_read is None else min(chunk_size, left_to_read))
+            while chunk:
+                yield chunk
+                if left_to_read is not None:
+                    left_to_read -= len(chunk)
+                    if left_to_read <= 0:
+                        break
+                chunk = file.read(chunk_size if left_to_read is None else min(chunk_size, left_to_read))
+
+    def read_data_chunks(self, archive_file: BinaryIO, data_size: int, chunk_size: int = 1 << 20):
+        """
+        Reads data of a known size from an archive (or an opened entry) chunk by chunk.
+
+        Args:
+            archive_file (BinaryIO): A file-like object positioned at the start of the data.
+            data_size (int): The size of the data in bytes.
+            chunk_size (int): The size of a chunk in bytes.
+
+        Yields:
+            bytes: The next chunk of the data.
+
+        Raises:
+            IOError: If the archive ends before the data.
+        """
+        bytes_left = data_size
+        while bytes_left > 0:
+            chunk = archive_file.read(min(chunk_size, bytes_left))
+            if not chunk:
+                raise IOError("Potential file corruption detected.\n"
+                              "File size doesn't match its actual size")
+            bytes_left -= len(chunk)
+            yield chunk
+
+    def read_entry_chunks(self, file_path: str, chunk_size: int = 1 << 20, offset: int = 0, length: int = None):
+        """
+        Reads a file in chunks on the pass that compresses it into its entry, and updates the CRC32 and the size
+        of the entry with every chunk, so they are of the data that was compressed even when the file changes.
+
+        Args:
+            file_path (str): The path to the file to read.
+            chunk_size (int): The size of a chunk in bytes.
+            offset (int): Where to start reading.
+            length (int): How many bytes to read, None to read until the end of the file.
+
+        Yields:
+            bytes: The next chunk of the file.
+        """
+        for chunk in self.read_file_chunks(file_path, chunk_size, offset, length):
+            if self.entry_crc32 is not None:
+                self.entry_crc32.write(chunk)
+            yield chunk
+
+    def encode_huff_data(self, huffman: Huffman, chunks=None) -> Tuple[bytes, bytes, int]:
+        """
+        Encodes data with a Huffman object whose chars were already counted.
+
+        Args:
+            huffman (Huffman): The Huffman object of the data.
+            chunks: An iterable of the data chunks to encode. Defaults to the text of the Huffman object.
+
+        Returns:
+            tuple: The serialized tree (or code lengths block), the encoded data and its length in bits.
+        """
+        if self.encoding_method == "CHUF":
+            # canonical codes, only the code lengths block is stored instead of the tree:
+            encoded_huffman_data, compress_bits_length = huffman.encode_canonical(chunks)
+        else:
+            # compress the data straight into bytes (the bits length is without the artificial zeros):
+            encoded_huffman_data, compress_bits_length = huffman.encode_bytes(chunks=chunks)
+        encoded_huff_tree = self.serialize_huff_tree(huffman)
+        self.code_len_cost_bits += huffman.code_len_cost_bits
+        self.compressed_bits += compress_bits_length
+        return encoded_huff_tree, encoded_huffman_data, compress_bits_length
+
+    def serialize_huff_tree(self, huffman: Huffman) -> bytes:
+        """
+        Serializes the tree of a Huffman object whose codes were already created.
+
+        Args:
+            huffman (Huffman): The Huffman object.
+
+        Returns:
+            bytes: The code lengths block for canonical Huffman, otherwise the binary tree.
+        """
+        if self.encoding_method == "CHUF":
+            return huffman.serialize_code_lengths()
+        return huffman.serialize_binary(huffman.root)
 
     def get_compressed_huff_file(self, file_path_to_compress: str, is_dir: bool) -> Tuple[bytes, int]:
         """
@@ -96,30 +308,215 @@ class Zip:
         Returns:
             tuple: A tuple containing the compressed data as bytes and its size in bytes.
         """
-
-        with open(file_path_to_compress, "rb") as file:
-            file_data = file.read()
-        # create the tree object:
-        huffman = Huffman(file_data)
-        # compress the data:
-        compress_binary_data = huffman.encode()
-        # convert to 8 bits:
-        encoded_huffman_data = self.convert_to_8_bits(compress_binary_data)
-        # serialize the tree:
-        huff_tree = huffman.serialize(huffman.root)
-        # encode the tree string representation of the tree:
-        encoded_huff_tree = huff_tree.encode()
+        if self.encoding_method == "AHUF":
+            return self.get_compressed_adaptive_huff_file(file_path_to_compress, is_dir)
+        if self.encoding_method == "RHUF":
+            return self.get_compressed_rle_huff_file(file_path_to_compress, is_dir)
+        if self.block_size:
+            return self.get_compressed_huff_blocks(file_path_to_compress, is_dir)
+        if self.num_of_streams > 1 and os.path.getsize(file_path_to_compress) >= self.MIN_STREAMS_FILE_SIZE:
+            return self.get_compressed_huff_streams(file_path_to_compress, is_dir)
+
+        # create the tree object and count the chars while the file streams in
+        # (both passes read the size of the file at the start, so a growing file has no chars without a code):
+        file_size = os.path.getsize(file_path_to_compress)
+        huffman = Huffman(b"", self.max_code_len)
+        for chunk in self.read_file_chunks(file_path_to_compress, length=file_size):
+            huffman.count_chars(chunk)
+        # the second pass over the file encodes it:
+        encoded_huff_tree, encoded_huffman_data, compress_bits_length = self.encode_huff_data(
+            huffman, self.read_entry_chunks(file_path_to_compress, length=file_size))
         # create the file header:
-        header_args = file_path_to_compress, len(encoded_huffman_data), len(compress_binary_data), len(
+        header_args = file_path_to_compress, len(encoded_huffman_data), compress_bits_length, len(
             encoded_huff_tree), is_dir
 
-        huff_file_header = HuffFileHeader(*header_args, to_bytes=True)
+        huff_file_header = HuffFileHeader(*header_args, to_bytes=True, binary_tree=self.encoding_method == "HUF")
         # convert to bytes:
         huff_file_header_byte = huff_file_header.to_bytes()
 
         return (huff_file_header_byte + encoded_huff_tree + encoded_huffman_data,
                 len(huff_file_header_byte) + len(encoded_huffman_data) + len(encoded_huff_tree))
 
+    def get_compressed_huff_streams(self, file_path_to_compress: str, is_dir: bool) -> Tuple[bytes, int]:
+        """
+        Compresses a file using Huffman coding into num_of_streams sub streams that share one tree.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Indicates whether the path points to a directory (True) or a file (False).
+
+        Returns:
+            tuple: A tuple containing the compressed data as bytes and its size in bytes.
+        """
+        compressed_file = b"".join(self.get_compressed_huff_stream_chunks(file_path_to_compress, is_dir))
+        return compressed_file, len(compressed_file)
+
+    def get_compressed_huff_stream_chunks(self, file_path_to_compress: str, is_dir: bool):
+        """
+        Compresses a file using Huffman coding into num_of_streams sub streams that share one tree.
+        Every stream encodes the next part of the file and starts at a whole byte,
+        so the streams can be decoded at the same time.
+        The chars of every part are counted on the first pass, so the size of every stream is known from the code
+        lengths before it is encoded: the header and the tree are yielded first and then every stream as soon as
+        it is encoded.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Indicates whether the path points to a directory (True) or a file (False).
+
+        Yields:
+            bytes: The file header and the tree, then the data of every stream.
+
+        Raises:
+            IOError: If the file changed while it was compressed.
+        """
+        file_size = os.path.getsize(file_path_to_compress)
+        # every stream gets an equal part of the file (the last one ends at the size the chars were counted in):
+        part_size = -(-file_size // self.num_of_streams)
+        stream_sizes = [max(min(part_size, file_size - stream_index * part_size), 0)
+                        for stream_index in range(self.num_of_streams)]
+        huffman = Huffman(b"", self.max_code_len)
+        stream_counters = []
+        for stream_index, stream_size in enumerate(stream_sizes):
+            stream_counter = ByteCounter()
+            for chunk in self.read_file_chunks(file_path_to_compress, offset=stream_index * part_size,
+                                               length=stream_size):
+                stream_counter.update(chunk)
+                huffman.count_chars(chunk)
+            stream_counters.append(stream_counter)
+        huffman.create_codes(canonical=self.encoding_method == "CHUF")
+        encoded_huff_tree = self.serialize_huff_tree(huffman)
+
+        code_lengths = huffman.get_code_lengths()
+        stream_bits_lengths = [sum(count * code_length for count, code_length in zip(stream_counter.counts,
+                                                                                     code_lengths))
+                               for stream_counter in stream_counters]
+        stream_offsets = []
+        streams_size = 0
+        for bits_length in stream_bits_lengths:
+            stream_offsets.append(streams_size)
+            streams_size += -(-bits_length // 8)
+        self.code_len_cost_bits += huffman.code_len_cost_bits
+        self.compressed_bits += sum(stream_bits_lengths)
+
+        header_args = file_path_to_compress, streams_size, sum(stream_bits_lengths), len(encoded_huff_tree), is_dir
+        huff_file_header = HuffFileHeader(*header_args, to_bytes=True, stream_offsets=stream_offsets,
+                                          stream_bits_lengths=stream_bits_lengths,
+                                          binary_tree=self.encoding_method == "HUF")
+        yield huff_file_header.to_bytes() + encoded_huff_tree
+
+        for stream_index, (stream_size, bits_length) in enumerate(zip(stream_sizes, stream_bits_lengths)):
+            encoded_huffman_data, compress_bits_length = huffman.write_chunks(
+                self.read_entry_chunks(file_path_to_compress, offset=stream_index * part_size, length=stream_size))
+            if compress_bits_length != bits_length:
+                raise IOError(f"'{file_path_to_compress}' changed while it was compressed")
+            yield encoded_huffman_data
+
+    def get_compressed_adaptive_huff_file(self, file_path_to_compress: str, is_dir: bool) -> Tuple[bytes, int]:
+        """
+        Compresses a file using adaptive Huffman coding in a single pass over the file, without storing a tree.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Indicates whether the path points to a directory (True) or a file (False).
+
+        Returns:
+            tuple: A tuple containing the compressed data as bytes and its size in bytes.
+        """
+        adaptive_huffman = AdaptiveHuffman()
+        for chunk in self.read_entry_chunks(file_path_to_compress):
+            adaptive_huffman.encode_chunk(chunk)
+        encoded_huffman_data, compress_bits_length = adaptive_huffman.get_packed_data()
+
+        # there is no tree, so the tree size is 0:
+        header_args = file_path_to_compress, len(encoded_huffman_data), compress_bits_length, 0, is_dir
+        huff_file_header_byte = HuffFileHeader(*header_args, to_bytes=True).to_bytes()
+
+        return huff_file_header_byte + encoded_huffman_data, len(huff_file_header_byte) + len(encoded_huffman_data)
+
+    def get_compressed_rle_huff_file(self, file_path_to_compress: str, is_dir: bool) -> Tuple[bytes, int]:
+        """
+        Compresses a file with RLE2 and then compresses the RLE2 tokens with Huffman coding.
+        The long runs shrink to a few tokens first, then the skewed bytes of the tokens get short codes.
+        The tokens of every chunk of the file are passed on as they come, on the counting pass and on the encoding
+        pass, so neither the file nor its tokens are held in memory.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Indicates whether the path points to a directory (True) or a file (False).
+
+        Returns:
+            tuple: A tuple containing the compressed data as bytes and its size in bytes.
+
+        Raises:
+            IOError: If the file got shorter while it was compressed.
+        """
+        file_size = os.path.getsize(file_path_to_compress)
+        chunk_size = self.get_rle_chunk_size(self.byte_seq_len)
+        rle_encoder = RLE2(self.byte_seq_len)
+        huffman = Huffman(b"", self.max_code_len)
+        for rle_data in rle_encoder.encode_chunks(
+                self.read_file_chunks(file_path_to_compress, chunk_size, length=file_size), file_size):
+            huffman.count_chars(rle_data)
+        encoded_huff_tree, encoded_huffman_data, compress_bits_length = self.encode_huff_data(
+            huffman, rle_encoder.encode_chunks(
+                self.read_entry_chunks(file_path_to_compress, chunk_size, length=file_size), file_size))
+        header_args = file_path_to_compress, len(encoded_huffman_data), compress_bits_length, len(
+            encoded_huff_tree), is_dir
+        huff_file_header_byte = HuffFileHeader(*header_args, to_bytes=True, binary_tree=True).to_bytes()
+        compressed_file = huff_file_header_byte + encoded_huff_tree + encoded_huffman_data
+        return compressed_file, len(compressed_file)
+
+    def get_compressed_huff_blocks(self, file_path_to_compress: str, is_dir: bool) -> Tuple[bytes, int]:
+        """
+        Compresses a file using Huffman coding in blocks of block_size bytes, each block with its own tree.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Indicates whether the path points to a directory (True) or a file (False).
+
+        Returns:
+            tuple: A tuple containing the compressed data as bytes and its size in bytes.
+        """
+        compressed_file = b"".join(self.get_compressed_huff_block_chunks(file_path_to_compress, is_dir))
+        return compressed_file, len(compressed_file)
+
+    def get_compressed_huff_block_chunks(self, file_path_to_compress: str, is_dir: bool):
+        """
+        Compresses a file using Huffman coding in blocks of block_size bytes, each block with its own tree.
+        The file header is yielded first and then every block as soon as it is encoded,
+        so only one block of the file is kept in memory.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Indicates whether the path points to a directory (True) or a file (False).
+
+        Yields:
+            bytes: The file header, then the header, tree and data of every block.
+
+        Raises:
+            IOError: If the file got shorter while it was compressed.
+        """
+        file_size = os.path.getsize(file_path_to_compress)
+        num_of_blocks = -(-file_size // self.block_size)
+        # in block mode the file size and the tree size are 0 and the correct size is the original size of the file:
+        header_args = file_path_to_compress, 0, file_size, 0, is_dir
+        huff_file_header = HuffFileHeader(*header_args, to_bytes=True, block_size=self.block_size,
+                                          num_of_blocks=num_of_blocks, binary_tree=self.encoding_method == "HUF")
+        yield huff_file_header.to_bytes()
+
+        blocks_written = 0
+        # a file that grows while it is compressed is cut at the size in the header:
+        for block in self.read_entry_chunks(file_path_to_compress, self.block_size, length=file_size):
+            encoded_huff_tree, encoded_huffman_data, compress_bits_length = self.encode_huff_data(
+                Huffman(block, self.max_code_len))
+            block_header = HuffBlockHeader(len(encoded_huffman_data), compress_bits_length, len(encoded_huff_tree),
+                                           to_bytes=True)
+            yield block_header.to_bytes() + encoded_huff_tree + encoded_huffman_data
+            blocks_written += 1
+        if blocks_written != num_of_blocks:
+            raise IOError(f"'{file_path_to_compress}' got shorter while it was compressed")
+
     def compress_Huffman(self,**kwargs) -> str:
         """
         Compresses all files using Huffman coding, encrypts the compressed data,
@@ -131,54 +528,26 @@ class Zip:
 
         start_time = time.time()  # Capture start time
 
-        # Initialize archive variables
-        archive_data = b""
-        total_archive_size = 0
-
-        # Compress individual files
-        for file_path in self.files_to_compress:
-            compressed_file, compressed_size = self.get_compressed_huff_file(file_path, False)
-            archive_data += compressed_file
-            total_archive_size += compressed_size
-
-        # Compress files within directories
-        for directory, files in self.dirs_to_compress.items():
-            for file_path in files:
-                compressed_file, compressed_size = self.get_compressed_huff_file(file_path, True)
-                archive_data += compressed_file
-                total_archive_size += compressed_size
-
-        # Create archive header
-        header_args = (
-            self.calculate_checksum(self.password),
-            self.key,
-            self.calculate_checksum(archive_data),
-            "HUF",  # Archive format (consider using an enum for clarity)
-            self.byte_seq_len,
-            total_archive_size,
-            len(self.files_to_compress) + self.calc_num_of_files_inside_dirs(),
-        )
-        archive_header = ArchiveHeader(*header_args, to_bytes=True)
-        header_bytes = archive_header.to_bytes()
-
-        # Encrypt and write data
-        encrypted_archive = self.encrypt_data(archive_data)
-        with open(self.archive_path, "wb") as archive_file:
-            archive_file.write(header_bytes + encrypted_archive)
+        # Compress and encrypt every file into its own entry of the archive
+        total_archive_size = self.write_indexed_archive()
 
         # Calculate and print statistics
         end_time = time.time()
         compression_time = end_time - start_time
+        stats = (f"Compression Time: {compression_time:.2f} seconds\n"
+                 f"Files Size Before: {self.files_size} bytes\n"
+                 f"Files Size After: {total_archive_size} bytes\n"
+                 f"Archive Size: {os.path.getsize(self.archive_path)} bytes\n")
+        if self.max_code_len:
+            # how much bigger the data is because of the code length limit:
+            unlimited_bits = self.compressed_bits - self.code_len_cost_bits
+            cost_percent = 100 * self.code_len_cost_bits / unlimited_bits if unlimited_bits else 0.0
+            stats += (f"Code Length Limit: {self.max_code_len} bits\n"
+                      f"Code Length Limit Cost: {self.code_len_cost_bits // 8} bytes ({cost_percent:.3f}%)\n")
         if "compress"in kwargs:
-            print(f"Compression Time: {compression_time:.2f} seconds\n"
-                  f"Files Size Before: {self.files_size} bytes\n"
-                  f"Files Size After: {total_archive_size} bytes\n"
-                  f"Archive Size: {os.path.getsize(self.archive_path)} bytes\n")
+            print(stats)
 
-        return (f"Compression Time: {compression_time:.2f} seconds\n"
-                f"Files Size Before: {self.files_size} bytes\n"
-                f"Files Size After: {total_archive_size} bytes\n"
-                f"Archive Size: {os.path.getsize(self.archive_path)} bytes\n")
+        return stats
 
 
     def extract_Huffman(self, extract_dir_path: str,**kwargs) -> str:
@@ -194,36 +563,28 @@ class Zip:
 
         start_time = time.time()
 
-        # Open archive file and create temporary decrypted data container
-        with open(self.archive_path, "rb") as archive_file, \
-                tempfile.TemporaryFile(mode="w+b") as decrypted_archive:
+        # Open archive file (an archive without a central directory is a single Fernet token, decrypted at once)
+        with open(self.archive_path, "rb") as archive_file:
 
             # Read and validate archive header
             archive_header = ArchiveHeader(archive_file, from_bytes=True)
+            self.byte_seq_len = archive_header.byte_seq_len  # the RLE2 unit length of RHUF
             decrypted_data = self.decrypt_data(archive_header.key, archive_file.read())
 
-            if self.calculate_checksum(decrypted_data) != archive_header.checksum:
-                raise IOError("Checksum mismatch! Potential file corruption detected.\n"
-                              "The calculated checksum doesn't match the stored checksum.")
-
-            # Decrypt and store decrypted data
-            decrypted_archive.write(decrypted_data)
-            decrypted_archive.seek(0)  # Move file pointer to the beginning
+        # the checksum is updated while the files are read from the decrypted data
+        decrypted_archive = HashingReader(io.BytesIO(decrypted_data))
+        del decrypted_data  # the buffer of the BytesIO is shared until it is changed
 
-            # Extract files
-            extracted_files = {}
+        # Extract files, every file is written as soon as it is decoded
+        # (one pool of worker processes decodes the sub streams of all the files, started on its first use)
+        with LazyProcessPool() as executor:
             for _ in range(archive_header.number_of_files):
                 huff_header = HuffFileHeader(decrypted_archive, from_bytes=True)
-                extracted_files[huff_header.file_path] = (
-                    huff_header.is_dir,
-                    self.extract_data_HUF(decrypted_archive,
-                                          huff_header.actual_file_size,
-                                          huff_header.correct_file_size,
-                                          huff_header.tree_size)
-                )
-
-        # Write extracted files
-        self.write_extracted_files_HUF(extract_dir_path, extracted_files)
+                extract_file_path = self.get_extract_file_path(extract_dir_path, huff_header.file_path,
+                                                               huff_header.is_dir)
+                with open(extract_file_path, "wb") as extracted_file:
+                    self.extract_file_HUF(decrypted_archive, huff_header, extracted_file, executor)
+        self.check_archive_checksum(decrypted_archive, archive_header)
 
         # Calculate and print statistics
         end_time = time.time()
@@ -233,119 +594,727 @@ class Zip:
 
         return f"Extraction Time: {extraction_time:.2f} seconds"
 
-    def write_extracted_files_HUF(self, extract_dir_path: str, dict_files: dict) -> None:
+    def extract_file_HUF(self, archive_file: BinaryIO, huff_header: HuffFileHeader, output_file: BinaryIO,
+                         executor: LazyProcessPool = None) -> None:
+        """
+        Decodes the data of a file whose HuffFileHeader was just read, in the mode the header describes.
+
+        Args:
+            archive_file (BinaryIO): A file-like object positioned after the file header.
+            huff_header (HuffFileHeader): The header of the file.
+            output_file (BinaryIO): The file object the decompressed data is written to.
+            executor (LazyProcessPool): The worker processes that decode sub streams, None to decode them here.
+        """
+        if huff_header.block_size:
+            self.extract_blocks_HUF(archive_file, huff_header.num_of_blocks, output_file, huff_header.binary_tree)
+        elif huff_header.stream_offsets:
+            self.extract_streams_HUF(archive_file, huff_header, output_file, executor)
+        elif self.encoding_method == "RHUF":
+            self.extract_rle_huff_data(archive_file, huff_header, output_file)
+        else:
+            output_file.write(self.extract_data_HUF(archive_file, huff_header.actual_file_size,
+                                                    huff_header.correct_file_size, huff_header.tree_size,
+                                                    huff_header.binary_tree))
+
+    def extract_indexed(self, extract_dir_path: str, **kwargs) -> str:
+        """
+        Extracts the files of an archive with a central directory, one entry at a time.
+        Only the entries of the member are read when a member is given.
+
+        Args:
+            extract_dir_path (str): The path to the directory where extracted files will be written.
+
+        Keyword Args:
+            member (str): A file (directory/name or name) or a directory of the archive to extract alone.
+
+        Returns:
+            str: A summary string containing extraction time.
+
+        Raises:
+            FileNotFoundError: If the member doesn't appear in the archive.
+        """
+        start_time = time.time()
+        with open(self.archive_path, "rb") as archive_file:
+            archive_header = ArchiveHeader(archive_file, from_bytes=True)
+            self.byte_seq_len = archive_header.byte_seq_len
+            directory = self.read_directory(archive_file, archive_header)
+            if kwargs.get("member"):
+                entries = directory.get_entries(kwargs["member"])
+            else:
+                entries = directory.get_live_entries()
+            # one pool of worker processes decodes the sub streams of all the entries (started on its first use)
+            with LazyProcessPool() as executor:
+                for entry in entries:
+                    # the entry is decrypted while it is decoded and written
+                    entry_file = self.open_archive_entry(archive_file, archive_header, entry)
+                    self.extract_archive_entry(entry_file, entry, extract_dir_path, executor)
+
+        extraction_time = time.time() - start_time
+        if "extract" in kwargs:
+            print(f"Extraction Time: {extraction_time:.2f} seconds")
+        return f"Extraction Time: {extraction_time:.2f} seconds"
+
+    def extract_archive_entry(self, entry_file: HashingReader, entry: DirectoryEntry, extract_dir_path: str,
+                              executor: LazyProcessPool = None) -> None:
         """
-        Writes the extracted files from the dictionary to the specified directory,
-        creating directories as needed.
+        Decompresses an opened entry, writes it to its path inside the extract directory and checks it.
 
         Args:
+            entry_file (HashingReader): The opened entry (the compressed file header and data).
+            entry (DirectoryEntry): The central directory entry of the file.
             extract_dir_path (str): The path to the directory where extracted files will be written.
-            extracted_files (dict): A dictionary containing information about extracted files,
-                                     including their paths, data, and directory status.
-        """
-        is_dir_index = 0
-        main_extarct_path = extract_dir_path
-        for file in dict_files:
-            if dict_files[file][is_dir_index]:  # if it a file that under a dir
-                # get the directory of the sub files and if it is the first file in the directory then create the directory inside the extarct directory
-                dir_name = self.get_dir_name(file).split("/")[0]
-                extract_dir_path += "/" + dir_name
-                if not os.path.isdir(extract_dir_path):
-                    os.mkdir(extract_dir_path)
-            with open(f"{extract_dir_path}/{self.get_filename(file)}", "wb") as f:
-                file_data = dict_files[file][1]
-                f.write(file_data)
-            extract_dir_path = main_extarct_path
-
-    def extract_data_HUF(self, archive_file: BinaryIO, file_size: int, correct_size: int, tree_size: int) -> bytes:
+            executor (LazyProcessPool): The worker processes that decode sub streams, None to decode them here.
+
+        Raises:
+            IOError: If the entry or the decompressed file doesn't match its checksums.
+        """
+        extract_file_path = self.get_extract_file_path(extract_dir_path, entry.file_path, entry.is_dir)
+        with open(extract_file_path, "wb") as extracted_file:
+            crc32_writer = Crc32Writer(extracted_file)
+            self.decode_archive_entry(entry_file, entry, crc32_writer, executor)
+        self.check_archive_entry(entry_file, entry, crc32_writer)
+
+    def decode_archive_entry(self, entry_file: BinaryIO, entry: DirectoryEntry, output_file: BinaryIO,
+                             executor: LazyProcessPool = None) -> None:
+        """
+        Decompresses an opened entry into a file object.
+
+        Args:
+            entry_file (BinaryIO): The opened entry (the compressed file header and data).
+            entry (DirectoryEntry): The central directory entry of the file.
+            output_file (BinaryIO): The file object the decompressed file is written to.
+            executor (LazyProcessPool): The worker processes that decode sub streams, None to decode them here.
+        """
+        self.encoding_method = entry.codec
+        if entry.codec == self.STORED_METHOD:
+            stored_header = RleFileHeader(entry_file, from_bytes=True)
+            for chunk in self.read_data_chunks(entry_file, stored_header.compress_file_size):
+                output_file.write(chunk)
+        elif entry.codec in self.HUFFMAN_METHODS:
+            huff_header = HuffFileHeader(entry_file, from_bytes=True)
+            self.extract_file_HUF(entry_file, huff_header, output_file, executor)
+        else:
+            rle_header = RleFileHeader(entry_file, from_bytes=True)
+            rle_decoder = self.get_rle_coder(rle_header.byte_seq_len or self.byte_seq_len)
+            rle_decoder.decode_to_file(entry_file, rle_header.compress_file_size, output_file)
+
+    def extract_data_HUF(self, archive_file: BinaryIO, file_size: int, correct_size: int, tree_size: int,
+                         binary_tree: bool = False) -> bytes:
+        """
+        Extracts data encoded with Huffman coding from the archive file.
+
+        Args:
+            archive_file (BinaryIO): A file-like object representing the archive data.
+            file_size (int): Size of the compressed data (including artificial zeros).
+            correct_size (int): Size of the actual compressed data (without artificial zeros).
+            tree_size (int): Size of the Huffman tree data (or of the canonical code lengths block) in bytes.
+            binary_tree (bool): Whether the tree is in the binary format or in the old text format.
+
+        Returns:
+            bytes: The decompressed data.
+        """
+
+        # Read Huffman tree data
+        tree_serialized = archive_file.read(tree_size)
+
+        # Read compressed data
+        compressed_data = archive_file.read(file_size)
+
+        # Create Huffman object, set tree, and decode the packed data a byte at a time
+        # (the artificial zeros are skipped by the correct size)
+        if self.encoding_method == "AHUF":
+            return AdaptiveHuffman().decode_bytes(compressed_data, correct_size)
+        return decode_huff_stream(self.encoding_method, tree_serialized, compressed_data, correct_size, binary_tree)
+
+    def extract_rle_huff_data(self, archive_file: BinaryIO, huff_header: HuffFileHeader, output_file: BinaryIO) -> None:
+        """
+        Extracts data that was encoded with RLE2 and then with Huffman coding (RHUF).
+        The Huffman data is read and decoded chunk by chunk into RLE2 tokens, which are expanded into the output
+        file as they come.
+
+        Args:
+            archive_file (BinaryIO): A file-like object positioned after the file header.
+            huff_header (HuffFileHeader): The header of the file.
+            output_file (BinaryIO): The file object the decompressed data is written to.
+        """
+        huffman = get_huff_decoder(self.encoding_method, archive_file.read(huff_header.tree_size),
+                                   huff_header.binary_tree)
+        rle_chunks = huffman.decode_chunks(self.read_data_chunks(archive_file, huff_header.actual_file_size),
+                                           huff_header.correct_file_size)
+        for piece in RLE2(self.byte_seq_len).decode_chunks(rle_chunks):
+            output_file.write(piece)
+
+    def extract_streams_HUF(self, archive_file: BinaryIO, huff_header: HuffFileHeader, output_file: BinaryIO,
+                            executor: LazyProcessPool = None) -> None:
+        """
+        Extracts data that was encoded with Huffman coding into sub streams, decoding the streams in parallel
+        worker processes (small data is decoded here, where it is faster).
+        Every stream is read when it is sent to a worker, and the decoded streams are written in order,
+        so only the streams that are decoded at the same time are kept in memory.
+
+        Args:
+            archive_file (BinaryIO): A file-like object representing the archive data.
+            huff_header (HuffFileHeader): The header of the file, with the offsets of the streams.
+            output_file (BinaryIO): The file object the decompressed data is written to.
+            executor (LazyProcessPool): The worker processes of the extraction, None to decode the streams here.
+        """
+        tree_serialized = archive_file.read(huff_header.tree_size)
+        stream_ends = huff_header.stream_offsets[1:] + [huff_header.actual_file_size]
+        stream_sizes = [end - start for start, end in zip(huff_header.stream_offsets, stream_ends)]
+        stream_args = self.encoding_method, tree_serialized
+        if executor is None or huff_header.actual_file_size < self.MIN_STREAMS_FILE_SIZE:
+            for stream_size, bits_length in zip(stream_sizes, huff_header.stream_bits_lengths):
+                output_file.write(decode_huff_stream(*stream_args, archive_file.read(stream_size), bits_length,
+                                                     huff_header.binary_tree))
+            return
+        # a stream is sent when there is room in the window (a stream for every worker)
+        # and the oldest one is written first:
+        window_size = executor.max_workers
+        decoding_streams = deque()
+        for stream_size, bits_length in zip(stream_sizes, huff_header.stream_bits_lengths):
+            if len(decoding_streams) == window_size:
+                output_file.write(decoding_streams.popleft().result())
+            decoding_streams.append(executor.submit(decode_huff_stream, *stream_args, archive_file.read(stream_size),
+                                                    bits_length, huff_header.binary_tree))
+        while decoding_streams:
+            output_file.write(decoding_streams.popleft().result())
+
+    def extract_blocks_HUF(self, archive_file: BinaryIO, num_of_blocks: int, output_file: BinaryIO,
+                           binary_tree: bool = False) -> None:
+        """
+        Extracts data that was encoded with Huffman coding in blocks, writing every block as soon as it is decoded.
+
+        Args:
+            archive_file (BinaryIO): A file-like object representing the archive data.
+            num_of_blocks (int): The number of blocks of the file.
+            output_file (BinaryIO): The file object the decompressed data is written to.
+            binary_tree (bool): Whether the trees are in the binary format or in the old text format.
+        """
+        for _ in range(num_of_blocks):
+            block_header = HuffBlockHeader(archive_file, from_bytes=True)
+            output_file.write(self.extract_data_HUF(archive_file, block_header.data_size, block_header.correct_size,
+                                                    block_header.tree_size, binary_tree))
+
+    def get_compressed_rle_file(self, file_path_to_compress, is_dir):
+        """given the compressed file path ,compressed  it (with rle algorithm),
+         and return the compressed file"""
+        compressed_file = b"".join(self.get_compressed_rle_file_chunks(file_path_to_compress, is_dir))
+        return compressed_file, len(compressed_file)  # include the header
+
+    def get_compressed_rle_file_chunks(self, file_path_to_compress: str, is_dir: bool):
+        """
+        Compresses a file with RLE or RLE2 chunk by chunk.
+        The header holds the compressed size, so the file is compressed twice: the first pass only sums the sizes
+        of the compressed chunks, the second one yields them after the header.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Indicates whether the path points to a directory (True) or a file (False).
+
+        Yields:
+            bytes: The file header, then the compressed data of every chunk.
+
+        Raises:
+            IOError: If the file changed while it was compressed.
+        """
+        file_size = os.path.getsize(file_path_to_compress)
+        byte_seq_len = self.byte_seq_len
+        if byte_seq_len == self.AUTO_BYTE_SEQ_LEN:
+            byte_seq_len = self.choose_byte_seq_len(file_path_to_compress)
+            self.byte_seq_len_choices[file_path_to_compress] = byte_seq_len
+        chunk_size = self.get_rle_chunk_size(byte_seq_len)
+        # compress the sequences appearances into (2 bytes counter, bytes sequence) pairs or RLE2 tokens:
+        rle_encoder = self.get_rle_coder(byte_seq_len)
+        compress_file_size = sum(len(compressed_chunk) for compressed_chunk in rle_encoder.encode_chunks(
+            self.read_file_chunks(file_path_to_compress, chunk_size, length=file_size), file_size))
+
+        # create the header (the byte sequence length is stored in it only when it was chosen for this file):
+        header_args = file_path_to_compress, compress_file_size, is_dir
+        rle_file_header = RleFileHeader(*header_args, to_bytes=True,
+                                        byte_seq_len=byte_seq_len if self.byte_seq_len == self.AUTO_BYTE_SEQ_LEN else None)
+        yield rle_file_header.to_bytes()
+
+        compressed_size = 0
+        for compressed_chunk in rle_encoder.encode_chunks(
+                self.read_entry_chunks(file_path_to_compress, chunk_size, length=file_size), file_size):
+            compressed_size += len(compressed_chunk)
+            yield compressed_chunk
+        if compressed_size != compress_file_size:
+            raise IOError(f"'{file_path_to_compress}' changed while it was compressed")
+
+    def get_rle_chunk_size(self, byte_seq_len: int) -> int:
+        """
+        Returns the size of the chunks a file is read in for run length coding: about 1 MiB of whole units,
+        so only the end of the file has a reminder.
+
+        Parameters:
+        - byte_seq_len: The number of bytes in a single unit.
+
+        Returns:
+        - The chunk size in bytes.
+        """
+        return max((1 << 20) // byte_seq_len, 1) * byte_seq_len
+
+    def choose_byte_seq_len(self, file_path: str) -> int:
+        """
+        Chooses the byte sequence length that compresses a file best.
+        A few windows spread over the file are compressed with every length from 1 to MAX_AUTO_BYTE_SEQ_LEN,
+        and the length with the smallest output wins (the shortest one on a tie).
+
+        Parameters:
+        - file_path: The path to the file.
+
+        Returns:
+        - The chosen byte sequence length.
+        """
+        NUM_OF_WINDOWS = 8
+        WINDOW_SIZE = 1 << 14
+        start = time.time()
+        file_size = os.path.getsize(file_path)
+        window_size = WINDOW_SIZE
+        if file_size <= NUM_OF_WINDOWS * WINDOW_SIZE:
+            # a small file is compressed as one window:
+            window_starts = [0]
+            window_size = file_size
+        else:
+            window_step = (file_size - WINDOW_SIZE) // (NUM_OF_WINDOWS - 1)
+            window_starts = [window * window_step for window in range(NUM_OF_WINDOWS)]
+        # a window is read from up to a unit of the largest length before its start, so it can be cut on a unit
+        # of every length:
+        read_starts = [max(window_start - self.MAX_AUTO_BYTE_SEQ_LEN + 1, 0) for window_start in window_starts]
+        windows = [b"".join(self.read_file_chunks(file_path, offset=read_start,
+                                                  length=window_start - read_start + window_size))
+                   for window_start, read_start in zip(window_starts, read_starts)]
+        best_byte_seq_len = 1
+        best_size = None
+        for byte_seq_len in range(1, self.MAX_AUTO_BYTE_SEQ_LEN + 1):
+            rle_coder = self.get_rle_coder(byte_seq_len)
+            estimated_size = 0
+            for window_start, read_start, window in zip(window_starts, read_starts, windows):
+                # the units of the file start at 0, so the windows start on a unit too:
+                unit_start = window_start - window_start % byte_seq_len - read_start
+                estimated_size += len(rle_coder.encode(window[unit_start:unit_start + window_size]))
+            if best_size is None or estimated_size < best_size:
+                best_byte_seq_len, best_size = byte_seq_len, estimated_size
+        self.byte_seq_len_choice_time += time.time() - start
+        return best_byte_seq_len
+
+    def get_rle_coder(self, byte_seq_len: int) -> RLE:
+        """
+        Returns the run length coder of the archive algorithm.
+
+        Parameters:
+        - byte_seq_len: The number of bytes in a single unit.
+
+        Returns:
+        - RLE2 for the "RLE2" algorithm, otherwise RLE.
+        """
+        if self.encoding_method == "RLE2":
+            return RLE2(byte_seq_len)
+        return RLE(byte_seq_len)
+
+    def get_compressed_file(self, file_path_to_compress: str, is_dir: bool) -> Tuple[bytes, int]:
+        """
+        Compresses a file with the algorithm of the archive.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Whether the file is under a directory.
+
+        Returns:
+            tuple: The compressed file (its header and data) and its size in bytes.
+        """
+        if self.encoding_method == self.STORED_METHOD:
+            return self.get_stored_file(file_path_to_compress, is_dir)
+        if self.encoding_method in self.HUFFMAN_METHODS:
+            return self.get_compressed_huff_file(file_path_to_compress, is_dir)
+        return self.get_compressed_rle_file(file_path_to_compress, is_dir)
+
+    def get_compressed_file_chunks(self, file_path_to_compress: str, is_dir: bool):
+        """
+        Compresses a file with the algorithm of the archive, in pieces that can be written one by one.
+        Stored files, RLE chunks and Huffman blocks and streams are yielded as soon as they are ready,
+        the other algorithms yield the whole file.
+
+        Args:
+            file_path_to_compress (str): The path to the file to compress.
+            is_dir (bool): Whether the file is under a directory.
+
+        Yields:
+            bytes: The next piece of the compressed file (its header and data).
+        """
+        if self.encoding_method == self.STORED_METHOD:
+            yield from self.get_stored_file_chunks(file_path_to_compress, is_dir)
+        elif self.encoding_method in self.RLE_METHODS:
+            yield from self.get_compressed_rle_file_chunks(file_path_to_compress, is_dir)
+        elif self.encoding_method in ("HUF", "CHUF") and self.block_size:
+            yield from self.get_compressed_huff_block_chunks(file_path_to_compress, is_dir)
+        elif (self.encoding_method in ("HUF", "CHUF") and self.num_of_streams > 1
+              and os.path.getsize(file_path_to_compress) >= self.MIN_STREAMS_FILE_SIZE):
+            yield from self.get_compressed_huff_stream_chunks(file_path_to_compress, is_dir)
+        else:
+            yield self.get_compressed_file(file_path_to_compress, is_dir)[0]
+
+    def get_stored_file(self, file_path_to_store: str, is_dir: bool) -> Tuple[bytes, int]:
+        """
+        Returns a file with an RleFileHeader, without compressing it.
+
+        Args:
+            file_path_to_store (str): The path to the file.
+            is_dir (bool): Whether the file is under a directory.
+
+        Returns:
+            tuple: The stored file (its header and data) and its size in bytes.
+        """
+        stored_file = b"".join(self.get_stored_file_chunks(file_path_to_store, is_dir))
+        return stored_file, len(stored_file)
+
+    def get_stored_file_chunks(self, file_path_to_store: str, is_dir: bool):
+        """
+        Returns a file with an RleFileHeader, without compressing it, chunk by chunk.
+
+        Args:
+            file_path_to_store (str): The path to the file.
+            is_dir (bool): Whether the file is under a directory.
+
+        Yields:
+            bytes: The file header, then the chunks of the file.
+
+        Raises:
+            IOError: If the file got shorter while it was stored.
+        """
+        file_size = os.path.getsize(file_path_to_store)
+        yield RleFileHeader(file_path_to_store, file_size, is_dir, to_bytes=True).to_bytes()
+        stored_size = 0
+        # a file that grows while it is stored is cut at the size in the header:
+        for chunk in self.read_entry_chunks(file_path_to_store, length=file_size):
+            stored_size += len(chunk)
+            yield chunk
+        if stored_size != file_size:
+            raise IOError(f"'{file_path_to_store}' got shorter while it was stored")
+
+    def choose_codec(self, file_path: str) -> str:
+        """
+        Chooses the compression algorithm of a file.
+        An explicit algorithm of the archive is always used (a file it doesn't make smaller is stored afterwards),
+        only an empty file is stored as it is.
+        In an AUTO archive the file is classified by a sample from its start: a file that is too small to classify
+        (or empty), starts like a compressed format, or whose sample is close to random, is stored as it is,
+        and otherwise RHUF is chosen when the RLE2 tokens of the sample are estimated to take fewer Huffman bits
+        than the sample itself (HUF otherwise).
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            str: The compression algorithm of the file.
+        """
+        if self.encoding_method != self.AUTO_METHOD:
+            # an empty file has nothing to encode (and no Huffman tree):
+            return self.encoding_method if os.path.getsize(file_path) else self.STORED_METHOD
+        sample = next(self.read_file_chunks(file_path, self.CLASSIFY_SAMPLE_SIZE, length=self.CLASSIFY_SAMPLE_SIZE),
+                      b"")
+        if len(sample) < self.MIN_CLASSIFY_SAMPLE_SIZE:
+            return self.STORED_METHOD
+        sample_entropy = self.get_entropy(sample)
+        if sample.startswith(self.COMPRESSED_MAGIC_BYTES) or sample_entropy >= self.STORED_ENTROPY:
+            return self.STORED_METHOD
+        # the entropy times the length estimates the size of the Huffman coded data (a code has at least 1 bit):
+        rle_sample = RLE2(self.byte_seq_len).encode(sample)
+        if len(rle_sample) * max(self.get_entropy(rle_sample), 1) < len(sample) * max(sample_entropy, 1):
+            return "RHUF"
+        return "HUF"
+
+    def get_entropy(self, data: bytes) -> float:
+        """return the Shannon entropy of the bytes of the data in bits per byte (0 for empty data)"""
+        return -sum(count / len(data) * math.log2(count / len(data)) for count in Counter(data).values())
+
+    def get_paths_to_compress(self) -> List[Tuple[str, bool]]:
+        """return the (file path, is under a directory) of every file to compress"""
+        paths = [(file_path, False) for file_path in self.files_to_compress]
+        for dir in self.dirs_to_compress:
+            paths += [(file_path, True) for file_path in self.dirs_to_compress[dir]]
+        return paths
+
+    def get_archive_path(self, file_path: str, is_dir: bool) -> str:
+        """return the path of a file inside the archive (directory/name for a file under a directory)"""
+        return self.get_dir_name(file_path) if is_dir else self.get_filename(file_path)
+
+    def check_archive_paths(self) -> None:
+        """
+        Checks that no two files to compress get the same path inside the archive
+        (like two files with the same name in different folders), so no file hides another one.
+
+        Raises:
+            ValueError: If two files get the same path inside the archive.
+        """
+        archive_paths = {}
+        for file_path, is_dir in self.get_paths_to_compress():
+            archive_path = self.get_archive_path(file_path, is_dir)
+            if archive_path in archive_paths:
+                raise ValueError(f"'{file_path}' and '{archive_paths[archive_path]}' get the same path "
+                                 f"'{archive_path}' inside the archive")
+            archive_paths[archive_path] = file_path
+
+    def compress_archive_entry(self, file_path: str, is_dir: bool, archive_file: BinaryIO,
+                               entry_offset: int) -> Tuple[DirectoryEntry, int]:
+        """
+        Compresses a file and writes it encrypted as an entry of an archive with a central directory.
+
+        Args:
+            file_path (str): The path to the file to compress.
+            is_dir (bool): Whether the file is under a directory.
+            archive_file (BinaryIO): The archive file, positioned where the entry is written.
+            entry_offset (int): The offset of the entry from the end of the archive header.
+
+        Returns:
+            tuple: The central directory entry of the file and its compressed size before the encryption.
+        """
+        archive_encoding_method = self.encoding_method
+        codec = self.choose_codec(file_path)
+        self.encoding_method = codec  # the compression functions use the algorithm of the file
+        entry_start = archive_file.tell()
+        # the CRC32 is computed by the compression functions from the chunks they compress
+        self.entry_crc32 = Crc32Writer()
+        try:
+            # the compressed file is encrypted and written while it is compressed
+            stored_size, checksum, compressed_size = self.write_entry_chunks(
+                archive_file, self.get_compressed_file_chunks(file_path, is_dir))
+            if codec != self.STORED_METHOD and compressed_size >= self.entry_crc32.size:
+                # the file didn't get smaller, so it is stored as it is over the compressed entry
+                # (the rest of the compressed entry is overwritten by the next entries or cut after the directory)
+                codec = self.STORED_METHOD
+                archive_file.seek(entry_start)
+                self.entry_crc32 = Crc32Writer()
+                stored_size, checksum, compressed_size = self.write_entry_chunks(
+                    archive_file, self.get_stored_file_chunks(file_path, is_dir))
+            crc32_writer = self.entry_crc32
+        finally:
+            self.encoding_method = archive_encoding_method
+            self.entry_crc32 = None
+        directory_entry = DirectoryEntry(self.get_archive_path(file_path, is_dir), is_dir, entry_offset,
+                                         stored_size, crc32_writer.size, codec, checksum,
+                                         to_bytes=True, crc32=crc32_writer.crc32)
+        return directory_entry, compressed_size
+
+    def write_indexed_archive(self) -> int:
+        """
+        Compresses every file into its own encrypted entry and writes the archive:
+        the header, the entries and the encrypted central directory at the end.
+        Every entry is written as soon as it is compressed, and the header is written last
+        (the place of the header is kept with the header of an empty archive).
+
+        Returns:
+            int: The total size of the compressed files before the encryption.
+        """
+        directory = CentralDirectory()
+        entries_end = 0
+        compressed_files_size = 0
+        md5_password = self.calculate_checksum(self.password)
+        with open(self.archive_path, "wb") as archive_file:
+            archive_file.write(self.get_indexed_archive_header(directory, 0, 0,
+                                                               self.calculate_checksum(directory.to_bytes()),
+                                                               md5_password))
+            for file_path, is_dir in self.get_paths_to_compress():
+                directory_entry, compressed_size = self.compress_archive_entry(file_path, is_dir, archive_file,
+                                                                               entries_end)
+                directory.add_entry(directory_entry)
+                entries_end += directory_entry.stored_size
+                compressed_files_size += compressed_size
+            self.write_indexed_archive_end(archive_file, directory, entries_end, md5_password)
+        return compressed_files_size
+
+    def get_indexed_archive_header(self, directory: CentralDirectory, entries_end: int, directory_size: int,
+                                   directory_checksum: bytes, md5_password: bytes) -> bytes:
+        """
+        Creates the header of an archive with a central directory.
+
+        Args:
+            directory (CentralDirectory): The central directory of the archive.
+            entries_end (int): The offset of the end of the entries (where the central directory is written).
+            directory_size (int): The size of the encrypted central directory in bytes.
+            directory_checksum (bytes): The MD5 of the central directory before the encryption.
+            md5_password (bytes): The MD5 of the archive password.
+
+        Returns:
+            bytes: The header bytes.
+        """
+        header_args = (
+            md5_password,
+            self.key,
+            directory_checksum,  # the entries have their own checksums in the directory
+            self.encoding_method,
+            self.byte_seq_len,
+            sum(entry.stored_size for entry in directory.get_live_entries()),
+            len(directory.get_live_entries()),
+        )
+        archive_header = ArchiveHeader(*header_args, to_bytes=True, directory_offset=entries_end,
+                                       directory_size=directory_size, format_version=self.format_version)
+        return archive_header.to_bytes()
+
+    def write_indexed_archive_end(self, archive_file: BinaryIO, directory: CentralDirectory, entries_end: int,
+                                  md5_password: bytes) -> None:
+        """
+        Writes the central directory after the entries and rewrites the header at the start of the archive file.
+        The entries and the central directory are flushed to the disk before the header is rewritten,
+        so the archive moves to its new central directory only when everything the header points to was written.
+
+        Args:
+            archive_file (BinaryIO): The archive file, opened for writing and positioned at the end of the entries.
+            directory (CentralDirectory): The central directory of the archive.
+            entries_end (int): The offset of the end of the entries from the end of the header.
+            md5_password (bytes): The MD5 of the archive password.
+        """
+        directory_size, directory_checksum = self.write_entry(archive_file, directory.to_bytes())
+        archive_file.truncate()
+        archive_file.flush()
+        os.fsync(archive_file.fileno())
+        archive_file.seek(0)
+        archive_file.write(self.get_indexed_archive_header(directory, entries_end, directory_size,
+                                                           directory_checksum, md5_password))
+        archive_file.flush()
+        os.fsync(archive_file.fileno())
+
+    def read_directory(self, archive_file: BinaryIO, archive_header: ArchiveHeader) -> CentralDirectory:
+        """
+        Reads, decrypts and validates the central directory of an archive.
+
+        Args:
+            archive_file (BinaryIO): The archive file.
+            archive_header (ArchiveHeader): The header of the archive.
+
+        Returns:
+            CentralDirectory: The central directory.
+
+        Raises:
+            IOError: If the checksum of the central directory doesn't match.
+        """
+        archive_file.seek(archive_header.header_size + archive_header.directory_offset)
+        # the central directory is parsed while it is decrypted, and checked when it was read
+        directory_file = self.open_encrypted_data(archive_file, archive_header, archive_header.directory_size)
+        directory = CentralDirectory(directory_file, from_bytes=True)
+        self.check_archive_checksum(directory_file, archive_header)
+        return directory
+
+    def open_archive_entry(self, archive_file: BinaryIO, archive_header: ArchiveHeader,
+                           entry: DirectoryEntry) -> HashingReader:
+        """
+        Opens a single entry of an archive with a central directory for reading.
+        An entry of AES-GCM chunks is decrypted chunk by chunk while it is read,
+        a Fernet entry is decrypted at once.
+
+        Args:
+            archive_file (BinaryIO): The archive file.
+            archive_header (ArchiveHeader): The header of the archive.
+            entry (DirectoryEntry): The central directory entry of the file.
+
+        Returns:
+            HashingReader: A reader of the compressed file (its header and data) that checksums what is read.
+        """
+        archive_file.seek(archive_header.header_size + entry.offset)
+        return self.open_encrypted_data(archive_file, archive_header, entry.stored_size)
+
+    def open_encrypted_data(self, archive_file: BinaryIO, archive_header: ArchiveHeader,
+                            stored_size: int) -> HashingReader:
+        """
+        Opens an entry (or the central directory) of an archive with a central directory for reading.
+
+        Args:
+            archive_file (BinaryIO): The archive file, positioned at the start of the entry.
+            archive_header (ArchiveHeader): The header of the archive.
+            stored_size (int): The size of the encrypted entry in bytes.
+
+        Returns:
+            HashingReader: A reader of the decrypted data that checksums what is read.
+
+        Raises:
+            IOError: If the archive format is unknown.
+        """
+        if archive_header.format_version == ArchiveHeader.AEAD_CHUNKS_VERSION:
+            # decrypted chunk by chunk while it is read
+            return HashingReader(ChunkedReader(archive_file, archive_header.key, stored_size))
+        if archive_header.format_version == ArchiveHeader.FERNET_ENTRIES_VERSION:
+            return HashingReader(io.BytesIO(self.decrypt_data(archive_header.key, archive_file.read(stored_size))))
+        raise IOError(f"Unknown archive format version {archive_header.format_version} "
+                      f"(the archive was created by a newer version)")
+
+    def check_archive_checksum(self, archive_data: HashingReader, archive_header: ArchiveHeader) -> None:
+        """
+        Reads the rest of the decrypted data of the archive (or of its central directory) and compares
+        its checksum with the checksum in the archive header.
+
+        Args:
+            archive_data (HashingReader): The decrypted data that was read.
+            archive_header (ArchiveHeader): The header of the archive.
+
+        Raises:
+            IOError: If the checksum doesn't match.
+        """
+        archive_data.read()
+        if archive_data.digest() != archive_header.checksum:
+            raise IOError("Checksum mismatch! Potential file corruption detected.\n"
+                          "The calculated checksum doesn't match the stored checksum.")
+
+    def check_archive_entry(self, entry_file: HashingReader, entry: DirectoryEntry, crc32_writer: Crc32Writer) -> None:
+        """
+        Reads the rest of a decompressed entry and compares its checksum with the checksum in the central directory,
+        and the CRC32 and size of the decompressed file with the ones of the original file.
+
+        Args:
+            entry_file (HashingReader): The opened entry.
+            entry (DirectoryEntry): The central directory entry of the file.
+            crc32_writer (Crc32Writer): The writer the entry was decompressed to.
+
+        Raises:
+            IOError: If the checksum of the entry or the CRC32 of the file doesn't match.
         """
-        Extracts data encoded with Huffman coding from the archive file.
+        entry_file.read()
+        if entry_file.digest() != entry.checksum:
+            raise IOError(f"Checksum mismatch! Potential file corruption detected in '{entry.file_path}'.")
+        if crc32_writer.size != entry.original_size or (entry.crc32 is not None and
+                                                        crc32_writer.crc32 != entry.crc32):
+            raise IOError(f"CRC32 mismatch! The decompressed '{entry.file_path}' is not the original file.")
+
+    def write_entry(self, archive_file: BinaryIO, data: bytes) -> Tuple[int, bytes]:
+        """
+        Encrypts an entry (or the central directory) of an archive with a central directory,
+        in the format of the archive, and writes it.
 
         Args:
-            archive_file (BinaryIO): A file-like object representing the archive data.
-            file_size (int): Size of the compressed data (including artificial zeros).
-            correct_size (int): Size of the actual compressed data (without artificial zeros).
-            tree_size (int): Size of the Huffman tree data in bytes.
+            archive_file (BinaryIO): The archive file, positioned where the entry is written.
+            data (bytes): The data to encrypt.
 
         Returns:
-            bytes: The decompressed data.
+            tuple: The size of the encrypted entry in bytes and the checksum of the data.
         """
+        stored_size, checksum, _ = self.write_entry_chunks(archive_file, [data])
+        return stored_size, checksum
 
-        # Read Huffman tree data
-        tree_serialized = archive_file.read(tree_size).decode()
-
-        # Read compressed data
-        compressed_data = archive_file.read(file_size)
-
-        # Convert compressed data to bit string (more efficient than byte-by-byte conversion)
-        bits_string = ''.join(f'{byte:08b}' for byte in compressed_data)
-
-        # Remove artificial zeros (more efficient slicing approach)
-        bits_string = bits_string[:correct_size]
-
-        # Create Huffman object, set tree, and decode data
-        huffman = Huffman("")
-        huffman.root = huffman.deserialize(tree_serialized)
-        return huffman.decode(bits_string)
-
-    def encode_rle_data(self, data_to_compress: bytes) -> List:
-        """given the data to compress, compress it with the rle algorithm and return the compressed data"""
-        compress_data = []
-        if len(data_to_compress) == 0:
-            return compress_data
-        count_seq = 0
-        # get first bytes sequence:
-        prev_seq = data_to_compress[:self.byte_seq_len]
-        for index in range(0, len(data_to_compress), self.byte_seq_len):
-            # get next bytes sequence:
-            current_seq = data_to_compress[index:index + self.byte_seq_len]
-            # compare the sequence to the current byte sequence:
-            if current_seq == prev_seq:
-                # same , increment the number of appearances by 1
-                count_seq += 1
-            if current_seq != prev_seq:
-                # different , restart with new  bytes sequence
-                compress_data.append((count_seq, prev_seq))
-                count_seq = 1
-            prev_seq = current_seq
-            # last sequence:
-            if index == len(data_to_compress) - self.byte_seq_len:
-                compress_data.append((count_seq, prev_seq))
-                break
-        if len(data_to_compress) % self.byte_seq_len != 0:
-            # add the reminder of data to the list:
-            OCCURRENCE = 1
-            num_of_bytes_reminder = len(data_to_compress) % self.byte_seq_len
-            data_reminder = data_to_compress[len(data_to_compress) - num_of_bytes_reminder::]
-
-            compress_data.append((OCCURRENCE, data_reminder))
-
-        return compress_data
-
+    def write_entry_chunks(self, archive_file: BinaryIO, chunks) -> Tuple[int, bytes, int]:
+        """
+        Encrypts an entry of an archive with a central directory, in the format of the archive,
+        and writes it while its pieces come (a Fernet entry is encrypted at once).
 
-    def get_compressed_rle_file(self, file_path_to_compress, is_dir):
-        """given the compressed file path ,compressed  it (with rle algorithm),
-         and return the compressed file"""
-        compress_file_data = b""
-        NUM_OF_BYTES_TO_COUNT = 2
-        with open(file_path_to_compress, "rb") as file_data:
-            # get the list of sequences appearances:
-            RLE_file_list = self.encode_rle_data(file_data.read())
-            # convert it to byte string:
-            for count, byte_seq in RLE_file_list:
-                # the counter take 2 bytes:
-                count_bytes = count.to_bytes(length=NUM_OF_BYTES_TO_COUNT,
-                                             byteorder="little")
-                compress_file_data += count_bytes + byte_seq
-
-        compress_file_size = len(compress_file_data)
-        # create the header:
-        header_args = file_path_to_compress, compress_file_size, is_dir
-        rle_file_header = RleFileHeader(*header_args, to_bytes=True)
-        rle_file_header_bytes = rle_file_header.to_bytes()
+        Args:
+            archive_file (BinaryIO): The archive file, positioned where the entry is written.
+            chunks: An iterable of the pieces of the data to encrypt.
 
-        return (rle_file_header_bytes + compress_file_data,
-                compress_file_size + len(rle_file_header_bytes))  # include the header
+        Returns:
+            tuple: The size of the encrypted entry in bytes, the checksum of the data and its size in bytes.
+        """
+        if self.format_version == ArchiveHeader.FERNET_ENTRIES_VERSION:
+            data = b"".join(chunks)
+            encrypted_data = self.encrypt_data(data)
+            archive_file.write(encrypted_data)
+            return len(encrypted_data), self.calculate_checksum(data), len(data)
+        chunked_writer = ChunkedWriter(archive_file, self.key)
+        # the checksum is updated while the data is passed to the encryption
+        hashing_writer = HashingWriter(chunked_writer)
+        data_size = 0
+        for chunk in chunks:
+            data_size += hashing_writer.write(chunk)
+        chunked_writer.close()
+        return chunked_writer.bytes_written, hashing_writer.digest(), data_size
 
     def calc_num_of_files_inside_dirs(self):
         """"go over the dict of dirctory and calculate how many fies are insdie each directory"""
@@ -364,54 +1333,27 @@ class Zip:
         """
 
         self.archive_size = 0  # Reset archive size
+        self.byte_seq_len_choices = {}
+        self.byte_seq_len_choice_time = 0.0
 
         start = time.time()  # Start time for compression timing
 
-        archive_file_data = b""  # Empty byte string for combined compressed data
-        archive_file_size = 0  # Variable to track total compressed file size
-
-        # Compress individual files
-        for file_path_to_compress in self.files_to_compress:
-            current_compressed_file, current_comp_file_size = self.get_compressed_rle_file(
-                file_path_to_compress, False  # Not part of a directory
-            )
-            archive_file_size += current_comp_file_size  # Update total size
-            archive_file_data += current_compressed_file  # Append compressed data
-
-        # Compress files within directories
-        for dir in self.dirs_to_compress:
-            for file_path_to_compress in self.dirs_to_compress[dir]:
-                current_compressed_file, current_comp_file_size = self.get_compressed_rle_file(
-                    file_path_to_compress, True  # Part of a directory
-                )
-                archive_file_size += current_comp_file_size  # Update total size
-                archive_file_data += current_compressed_file  # Append compressed data
+        # Compress and encrypt every file into its own entry of the archive
+        archive_file_size = self.write_indexed_archive()
 
         end = time.time()  # End time for compression timing
         self.time_to_compress = end - start  # Calculate compression time
 
-        # Create archive header
-        header_args = (
-            self.calculate_checksum(self.password),
-            self.key,
-            self.calculate_checksum(archive_file_data),
-            "RLE",
-            self.byte_seq_len,
-            archive_file_size,
-            len(self.files_to_compress) + self.calc_num_of_files_inside_dirs(),
-        )
-        archive_file_header = ArchiveHeader(*header_args, to_bytes=True)
-
-        # Encrypt compressed data
-        encrypt_compressed_archve_file = self.encrypt_data(archive_file_data)
-
         # Calculate final archive size
-        archive_file_header_bytes = archive_file_header.to_bytes()
-        self.archive_size += archive_file_size + len(archive_file_header_bytes)
-
-        # Write archive to file
-        with open(self.archive_path, "wb") as archive_file:
-            archive_file.write(archive_file_header_bytes + encrypt_compressed_archve_file)
+        self.archive_size += archive_file_size
+
+        # the byte sequence length chosen for every file and the time it took to choose them:
+        auto_byte_seq_len_stats = ""
+        if self.byte_seq_len == self.AUTO_BYTE_SEQ_LEN:
+            auto_byte_seq_len_stats = (
+                f"Byte sequence lengths chosen - {self.byte_seq_len_choices}\n"
+                f"Time took to choose the byte sequence lengths: {self.byte_seq_len_choice_time:.2f} seconds\n"
+            )
 
         # Print compression statistics
         if "compress" in kwargs:
@@ -420,8 +1362,9 @@ class Zip:
                 f"Files sizes before compression - {self.files_size} bytes\n"
                 f"Files sizes after compression - {self.archive_size} bytes\n"
                 f"After encryption size - {os.path.getsize(self.archive_path)} bytes\n"
+                + auto_byte_seq_len_stats
         )
-        return f"Time took to compress: {self.time_to_compress} seconds\n  files sizes before compression - {self.files_size} bytes \n files sizes after compression - {self.archive_size}  bytes\n after encryption size - {os.path.getsize(self.archive_path)} bytes\n"
+        return f"Time took to compress: {self.time_to_compress} seconds\n  files sizes before compression - {self.files_size} bytes \n files sizes after compression - {self.archive_size}  bytes\n after encryption size - {os.path.getsize(self.archive_path)} bytes\n" + auto_byte_seq_len_stats
 
 
     def encrypt_data(self,data):
@@ -433,63 +1376,6 @@ class Zip:
 
         return encrypted_data
 
-    def valid_checksum(self):
-        """read the file header extract the checksum and calculate the checksum from the data and compare them
-        and return whether or not they are equal"""
-        with open(self.archive_path, "rb") as file:
-            header = ArchiveHeader(file, from_bytes=True)
-            cacl_checksum = self.calculate_checksum(file.read())
-            checksum = header.checksum
-
-        if cacl_checksum != checksum:
-            raise IOError("Checksum mismatch! Potential file corruption detected.\n"
-                          "The calculated checksum doesn't match the stored checksum.")
-
-    def extract_data_RLE(self, file_size, archive_file, byte_seq_len):
-        """
-        Extracts data from an archive file using the Run-Length Encoding (RLE) compression algorithm.
-
-        Parameters:
-        - file_size: The size of the file to be extracted.
-        - archive_file: The archive file object from which data will be extracted.
-        - byte_seq_len: The length of the byte sequence used in RLE compression.
-
-        Returns:
-        - A list containing tuples of (count, sequence) representing the extracted data.
-
-        Raises:
-        - IOError: If potential file corruption is detected due to mismatched file sizes.
-        """
-        file_data = []
-        COUNT_BYTES = 2
-        current_file_size = 0
-
-        while file_size != current_file_size:
-            # Read count byte
-            count_byte = archive_file.read(COUNT_BYTES)
-
-            # Convert count byte to integer
-            count = int.from_bytes(count_byte, byteorder="little")
-
-            # Read sequence of bytes
-            if current_file_size + COUNT_BYTES + byte_seq_len > file_size:
-                reminder_bytes = file_size - (current_file_size + COUNT_BYTES)
-                seq_of_data = archive_file.read(reminder_bytes)
-                current_file_size += COUNT_BYTES + reminder_bytes
-            else:
-                seq_of_data = archive_file.read(byte_seq_len)
-                current_file_size += COUNT_BYTES + byte_seq_len
-
-            # Append (count, sequence) tuple to data
-            file_data.append((count, seq_of_data))
-
-            # Check for potential file corruption
-            if current_file_size > file_size:
-                raise IOError("Potential file corruption detected.\n"
-                              "File size doesn't match its actual size")
-
-        return file_data
-
     def decrypt_data(self,key,encrypted_data):
         """Decrypts encrypted data using the provided key and returns the original data."""
         try:
@@ -520,39 +1406,33 @@ class Zip:
         # Start time measurement
         start = time.time()
 
-        # Dictionary to store extracted files
-        dict_files = {}
-
         # Open the archive file for reading in binary mode
-        with open(self.archive_path, "rb") as archive_file, tempfile.TemporaryFile(mode='w+b') as decrypted_archive:
+        with open(self.archive_path, "rb") as archive_file:
             # Read and parse the archive header
             arch_header = ArchiveHeader(archive_file, from_bytes=True)
 
-            # Decrypt the archive data
+            # Decrypt the archive data (a single Fernet token in an archive without a central directory)
             decrypted_file_data = self.decrypt_data(arch_header.key, archive_file.read())
 
-            # Verify checksum to detect potential file corruption
-            if self.calculate_checksum(decrypted_file_data) != arch_header.checksum:
-                raise IOError("Checksum mismatch! Potential file corruption detected.\n"
-                              "The calculated checksum doesn't match the stored checksum.")
-
-            # Write decrypted data to temporary file
-            decrypted_archive.write(decrypted_file_data)
-            decrypted_archive.seek(0)  # Move the file pointer to the beginning
+        # the checksum is updated while the files are read from the decrypted data
+        decrypted_archive = HashingReader(io.BytesIO(decrypted_file_data))
+        del decrypted_file_data  # the buffer of the BytesIO is shared until it is changed
 
-            # Extract files from the archive
-            for file in range(arch_header.number_of_files):
-                # Read and parse the RLE file header
-                rle_header = RleFileHeader(decrypted_archive, from_bytes=True)
+        # Extract files from the archive
+        for file in range(arch_header.number_of_files):
+            # Read and parse the RLE file header
+            rle_header = RleFileHeader(decrypted_archive, from_bytes=True)
 
-                # Extract file data using RLE compression
-                dict_files[rle_header.file_path] = (
-                    rle_header.is_dir,
-                    self.extract_data_RLE(rle_header.compress_file_size, decrypted_archive, arch_header.byte_seq_len)
-                )
+            # Decompress the file data straight into the extracted file (with its own byte sequence length
+            # when it was chosen for every file)
+            rle_decoder = self.get_rle_coder(rle_header.byte_seq_len or arch_header.byte_seq_len)
+            extract_file_path = self.get_extract_file_path(extract_dir_path, rle_header.file_path,
+                                                           rle_header.is_dir)
+            with open(extract_file_path, "wb") as extracted_file:
+                rle_decoder.decode_to_file(decrypted_archive, rle_header.compress_file_size, extracted_file)
 
-        # Write the extracted files to the specified directory
-        self.write_extracted_files_RLE(extract_dir_path, dict_files)
+        # Verify checksum to detect potential file corruption
+        self.check_archive_checksum(decrypted_archive, arch_header)
 
         # End time measurement
         end = time.time()
@@ -564,45 +1444,26 @@ class Zip:
 
         return f"time took to extract: {self.time_to_extract} seconds"
 
-    def write_extracted_files_RLE(self, extract_dir_path, dict_files):
+    def get_extract_file_path(self, extract_dir_path: str, file_path: str, is_dir: bool) -> str:
         """
-        Writes extracted files to the specified directory after RLE decompression.
+        Returns the path an archived file is extracted to, and creates its directory if needed.
 
         Parameters:
         - extract_dir_path: The path to the directory where the extracted files will be saved.
-        - dict_files: A dictionary containing information about the extracted files.
-
-        Returns:
-        - None
-        """
-        is_dir_index = 0  # Index to identify if the extracted file is a directory
-        main_extarct_path = extract_dir_path  # Store the main extract directory path
-
-        # Iterate over each file in the dictionary
-        for file in dict_files:
-            if dict_files[file][is_dir_index]:  # Check if the file is under a directory
-                # Extract the directory name from the file path
-                dir_name = self.get_dir_name(file).split("/")[0]
-                # Append the directory name to the extract directory path
-                extract_dir_path += "/" + dir_name
-                # If the directory does not exist, create it
-                if not os.path.isdir(extract_dir_path):
-                    os.mkdir(extract_dir_path)
-
-            # Open the file for writing in binary mode
-            with open(f"{extract_dir_path}/{self.get_filename(file)}", "wb") as f:
-                file_data = dict_files[file][1]  # Get the data of the file
-                raw_data = b""  # Initialize a variable to store the raw data
-                # Iterate over each (count, sequence) tuple in the file data
-                for count, seq in file_data:
-                    # Append the sequence to the raw data 'count' times
-                    for i in range(count):
-                        raw_data += seq
-                # Write the raw data to the file
-                f.write(raw_data)
-
-            # Reset the extract directory path to the main extract directory path for the next file
-            extract_dir_path = main_extarct_path
+        - file_path: The path of the file inside the archive.
+        - is_dir: Whether the file is under a directory.
+
+        Returns:
+        - The path of the extracted file.
+        """
+        if is_dir:
+            # Append the directory name to the extract directory path
+            extract_dir_path += "/" + self.get_dir_name(file_path).split("/")[0]
+            # If the directory does not exist, create it
+            if not os.path.isdir(extract_dir_path):
+                os.mkdir(extract_dir_path)
+        return f"{extract_dir_path}/{self.get_filename(file_path)}"
+
     @password_check
     def compress(self, *args, **kwargs):
         """
@@ -614,8 +1475,13 @@ class Zip:
 
         Keyword Arguments:
         - password: Password for encryption.
-        - encoding: Compression encoding method (HUF or RLE).
-        - byte_seq_len: Number of bytes in a single unit (for RLE).
+        - encoding: Compression encoding method (HUF, CHUF, AHUF, RHUF, RLE, RLE2, or AUTO to choose HUF, RHUF or
+          storing for every file).
+        - byte_seq_len: Number of bytes in a single unit (for RLE and RLE2, "auto" to choose it for every file,
+          and for the RLE2 stage of RHUF).
+        - max_code_len: Maximal Huffman code length in bits (for HUF, CHUF and RHUF), None for no limit.
+        - block_size: Size in bytes of the blocks every file is split into (for HUF and CHUF), None for no blocks.
+        - num_of_streams: Number of sub streams every file is split into for parallel decoding (for HUF and CHUF).
         - dir: List of directory paths to compress.
 
         Returns:
@@ -626,9 +1492,6 @@ class Zip:
         # Check if an archive file with the same name already exists
         if os.path.isfile(self.archive_path) and "override" not in kwargs:
             raise ValueError("There is already an archive file with the name you provided")
-        elif os.path.isfile(self.archive_path) and "override" in kwargs:
-            # Remove the existing archive file if 'override' flag is provided
-            os.remove(self.archive_path)
 
         # If directories are specified, validate and add files from those directories
         if "dir" in kwargs:
@@ -644,6 +1507,11 @@ class Zip:
 
         # Add the specified file paths to the list of files to compress
         self.files_to_compress += [file_path for file_path in args]
+        self.check_archive_paths()
+
+        if os.path.isfile(self.archive_path) and "override" in kwargs:
+            # Remove the existing archive file if 'override' flag is provided (after the files were checked)
+            os.remove(self.archive_path)
 
         # Calculate the total size of the files to be compressed
         self.files_size = self.get_files_size()
@@ -652,15 +1520,67 @@ class Zip:
         self.password = kwargs["password"]
 
         encoding_method = kwargs["encoding"]  # Get the compression encoding method
+        self.encoding_method = encoding_method
         self.key = Fernet.generate_key()  # Generate a key for encryption
+        self.format_version = ArchiveHeader.AEAD_CHUNKS_VERSION  # New archives encrypt their entries in chunks
+
+        if encoding_method == self.AUTO_METHOD:
+            if (kwargs.get("max_code_len") is not None or kwargs.get("block_size") is not None or
+                    kwargs.get("num_of_streams") is not None):
+                raise ValueError("The automatic encoding doesn't use a maximal code length, blocks or streams")
+            self.byte_seq_len = 1  # the RLE2 unit of the files that get RHUF
+            return self.compress_Huffman(**kwargs)
 
-        if encoding_method == "HUF":
+        if encoding_method in self.HUFFMAN_METHODS:
             # For Huffman encoding, byte sequence length is fixed to 1
             self.byte_seq_len = 1
+            if encoding_method == "AHUF" and (kwargs.get("max_code_len") is not None or
+                                              kwargs.get("block_size") is not None or
+                                              kwargs.get("num_of_streams") is not None):
+                raise ValueError("The adaptive Huffman encoding doesn't use a maximal code length, blocks or streams")
+            if encoding_method == "RHUF":
+                if kwargs.get("block_size") is not None or kwargs.get("num_of_streams") is not None:
+                    raise ValueError("The RLE+Huffman encoding doesn't use blocks or streams")
+                # the byte sequence length is the unit of the RLE2 stage:
+                if kwargs.get("byte_seq_len") is not None:
+                    try:
+                        self.byte_seq_len = int(kwargs["byte_seq_len"])
+                    except ValueError:
+                        raise ValueError("Not a valid byte sequence length")
+                    if self.byte_seq_len < 1:
+                        raise ValueError("Byte needs to be at least 1")
+            if kwargs.get("max_code_len") is not None:
+                try:
+                    self.max_code_len = int(kwargs["max_code_len"])
+                except ValueError:
+                    raise ValueError("Not a valid maximal code length")
+                if self.max_code_len < 8:
+                    # with less than 8 bits not all the 256 byte values can get a code
+                    raise ValueError("The maximal code length needs to be at least 8")
+            if kwargs.get("block_size") is not None:
+                try:
+                    self.block_size = int(kwargs["block_size"])
+                except ValueError:
+                    raise ValueError("Not a valid block size")
+                if self.block_size < 1:
+                    raise ValueError("The block size needs to be at least 1 byte")
+            if kwargs.get("num_of_streams") is not None:
+                try:
+                    self.num_of_streams = int(kwargs["num_of_streams"])
+                except ValueError:
+                    raise ValueError("Not a valid number of streams")
+                if not 1 <= self.num_of_streams <= 255:
+                    raise ValueError("The number of streams needs to be between 1 and 255")
+                if self.block_size and self.num_of_streams > 1:
+                    raise ValueError("Streams can't be used together with blocks")
             return self.compress_Huffman(**kwargs)
 
-        elif encoding_method == "RLE":
+        elif encoding_method in self.RLE_METHODS:
             # For RLE encoding, check and set the byte sequence length
+            if str(kwargs.get("byte_seq_len")).lower() == "auto":
+                # chosen for every file when it is compressed:
+                self.byte_seq_len = self.AUTO_BYTE_SEQ_LEN
+                return self.encode_RLE(**kwargs)
             if "byte_seq_len" in kwargs:
                 try:
                     self.byte_seq_len = int(kwargs["byte_seq_len"])
@@ -690,7 +1610,7 @@ class Zip:
         Retrieves the compression algorithm used for the archive.
 
         Returns:
-        - str: The compression algorithm used ("RLE" or "HUF").
+        - str: The compression algorithm used ("RLE", "RLE2", "HUF", "CHUF", "AHUF" or "RHUF").
 
         Raises:
         - ValueError: If the compression algorithm specified in the archive header is invalid.
@@ -700,12 +1620,10 @@ class Zip:
             arch_header = ArchiveHeader(archive_file, from_bytes=True)
 
         # Determine the compression algorithm based on the value in the archive header
-        if arch_header.comp_algo == 1:
-            return "RLE"
-        elif arch_header.comp_algo == 2:
-            return "HUF"
-        else:
-            raise ValueError("Invalid compression algorithm specified in the archive header")
+        for algo, algo_code in arch_header.ALGO_CODES.items():
+            if arch_header.comp_algo == algo_code:
+                return algo
+        raise ValueError("Invalid compression algorithm specified in the archive header")
 
     @password_check
     def extract(self, path_to_dir, **kwargs):
@@ -717,6 +1635,7 @@ class Zip:
 
         Keyword Args:
         - password (str): The password used to encrypt the archive.
+        - member (str): A file (directory/name or name) or a directory to extract alone.
 
         Returns:
         - str: A message indicating the success of the extraction process.
@@ -738,70 +1657,42 @@ class Zip:
 
         # Determine the compression algorithm used in the archive
         decoding_method = self.get_algo()
+        self.encoding_method = decoding_method
+
+        if arch_header.is_indexed():
+            # the entries are read one by one through the central directory
+            return self.extract_indexed(path_to_dir, **kwargs)
+        if kwargs.get("member"):
+            raise ValueError("Extracting a single member needs an archive with a central directory "
+                             "(extract the whole archive and compress it again)")
 
         # Extract files based on the compression algorithm
-        if decoding_method == "HUF":
+        if decoding_method in self.HUFFMAN_METHODS:
             return self.extract_Huffman(path_to_dir, **kwargs)
-        elif decoding_method == "RLE":
+        elif decoding_method in self.RLE_METHODS:
             return self.extract_RLE(path_to_dir, **kwargs)
         else:
             raise IOError("Potential file corruption detected.\nThe header of the archive was destroyed")
 
-    def get_added_compressed_files(self, file_path: str, encoding_method: str) -> Tuple[bytes, int, int]:
+    def get_added_paths(self, file_path: str) -> List[Tuple[str, bool]]:
         """
-        Compresses specified files or a directory using the given encoding method and returns the compressed data.
+        Returns the files to add for a file or a directory path.
 
         Args:
-            file_path (str): Path to the file or directory to be compressed.
-            encoding_method (str): Encoding method to use, either "HUF" for Huffman or "RLE" for Run-Length Encoding.
+            file_path (str): Path to the file or directory to be added.
 
         Returns:
-            A tuple containing:
-                - added_comp_files (bytes): The compressed data of the added files.
-                - added_size (int): The total size of the compressed files.
-                - num_of_files (int): The number of files compressed.
+            list: The (file path, is under a directory) of every file to add.
 
         Raises:
-            ValueError: If the encoding method is invalid or if the file path is invalid.
+            ValueError: If the file path is invalid.
         """
-
-        num_of_files = 0
-        added_size = 0
-        added_comp_files = b""  # Empty byte string to store combined compressed data
-
-        # Handle directory compression
         if os.path.isdir(file_path):
-            for file in os.listdir(file_path):  # Iterate through files in the directory
-                # Compress each file in the directory using the specified encoding method
-                if encoding_method == "HUF":
-                    comp_file, file_size = self.get_compressed_huff_file(f"{file_path}/{file}", True)
-                elif encoding_method == "RLE":
-                    comp_file, file_size = self.get_compressed_rle_file(f"{file_path}/{file}", True)
-                else:
-                    raise ValueError(f"Invalid encoding method: {encoding_method}")  # Raise error for unknown method
-
-                added_comp_files += comp_file  # Append compressed data
-                added_size += file_size  # Update total size
-                num_of_files += 1  # Increment file count
-
-        # Handle single file compression
-        elif os.path.isfile(file_path):
-            # Compress the single file using the specified encoding method
-            if encoding_method == "HUF":
-                comp_file, file_size = self.get_compressed_huff_file(file_path, False)
-            elif encoding_method == "RLE":
-                comp_file, file_size = self.get_compressed_rle_file(file_path, False)
-            else:
-                raise ValueError(f"Invalid encoding method: {encoding_method}")  # Raise error for unknown method
-
-            added_comp_files += comp_file  # Append compressed data
-            added_size += file_size  # Update total size
-            num_of_files += 1  # Increment file count
-
-        else:
-            raise ValueError(f"Invalid file path: {file_path}")  # Raise error for invalid path
+            return [(f"{file_path}/{file}", True) for file in os.listdir(file_path)]
+        if os.path.isfile(file_path):
+            return [(file_path, False)]
+        raise ValueError(f"Invalid file path: {file_path}")  # Raise error for invalid path
 
-        return added_comp_files, added_size, num_of_files
     @password_check
     def add(self, path: str, **kwargs) -> str:
         """
@@ -816,6 +1707,7 @@ class Zip:
 
         Raises:
             ValueError: If the password is incorrect or if an invalid encoding method is encountered.
+            FileExistsError: If a file with the same path is already in the archive.
         """
 
         start_time = time.time()  # Record start time for performance measurement
@@ -824,52 +1716,25 @@ class Zip:
         # Open the existing archive file and read its header information
         with open(self.archive_path, "rb") as archive_file:
             archive_header = ArchiveHeader(archive_file, from_bytes=True)
-            encrypted_archive_data = archive_file.read()  # Read encrypted data from the archive
 
         # Validate password by comparing its checksum with the stored checksum in the archive header
         if archive_header.md5_password != self.calculate_checksum(kwargs["password"]):
             raise ValueError("wrong password (or a chance of file corruption)")
 
         # Extract necessary information from the archive header
-        num_of_files = archive_header.number_of_files
         self.byte_seq_len = archive_header.byte_seq_len
-        encoding_method = "RLE" if archive_header.comp_algo == 1 else "HUF"
-
-        # Decrypt the existing archive data
-        decrypt_file_data = self.decrypt_data(archive_header.key, encrypted_archive_data)
-        new_arc_size = len(decrypt_file_data)
-
-        # Get compressed data and information for the new file to be added
-        added_comp_files, added_files_size, num_of_added_files = self.get_added_compressed_files(path, encoding_method)
-
-        # Update archive data and information
+        encoding_method = self.get_algo()
+        self.encoding_method = encoding_method
         self.key = archive_header.key  # Retain the key for encryption
-        new_arc_size += added_files_size
-        decrypt_file_data += added_comp_files
-        num_of_files += num_of_added_files
-
-        # Re-encrypt the updated archive data
-        arc_data_encrypted = self.encrypt_data(decrypt_file_data)
-
-        # Calculate checksum for the updated archive data
-        checksum = self.calculate_checksum(decrypt_file_data)
-
-        # Prepare updated header information
-        header_args = (
-            archive_header.md5_password,
-            self.key,
-            checksum,
-            encoding_method,
-            self.byte_seq_len,
-            new_arc_size,
-            num_of_files,
-        )
-        archive_file_header = ArchiveHeader(*header_args, to_bytes=True)
-        new_arc_header_bytes = archive_file_header.to_bytes()
 
-        # Write the updated header and encrypted archive data back to the archive file
-        with open(self.archive_path, "wb") as archive_file:
-            archive_file.write(new_arc_header_bytes + arc_data_encrypted)
+        if archive_header.is_indexed():
+            # the new entries are appended, the existing entries are not decrypted
+            self.format_version = archive_header.format_version
+            self.append_archive_entries(path, archive_header)
+        else:
+            # the archive is re-created with a central directory, so the existing files aren't decrypted
+            # and encrypted again on every add
+            self.add_legacy(path, archive_header, encoding_method, **kwargs)
 
         end_time = time.time()  # Record end time for performance measurement
 
@@ -884,37 +1749,279 @@ class Zip:
                f"after adding, the new archive size is: {os.path.getsize(self.archive_path)} bytes\n" \
                f"the adding took: {end_time - start_time} seconds\n"
 
-    def update(self, full_path, **kwargs):
+    def append_archive_entries(self, path: str, archive_header: ArchiveHeader) -> None:
+        """
+        Appends the entries of a file or a directory to an archive with a central directory.
+        The new entries and the new central directory are written after the old central directory,
+        so until the header is rewritten to point to the new central directory the archive stays as it was
+        (the space of the old central directory is left in the archive until compact rewrites it).
+
+        Args:
+            path (str): Path to the file or directory to be added.
+            archive_header (ArchiveHeader): The header of the archive.
+
+        Raises:
+            FileExistsError: If a file with the same path is already in the archive.
+        """
+        added_paths = self.get_added_paths(path)
+        with open(self.archive_path, "r+b") as archive_file:
+            directory = self.read_directory(archive_file, archive_header)
+            # all the paths are checked before anything is written:
+            for file_path, is_dir in added_paths:
+                directory.check_new_path(self.get_archive_path(file_path, is_dir))
+            entries_end = archive_header.directory_offset + archive_header.directory_size
+            archive_file.seek(archive_header.header_size + entries_end)
+            for file_path, is_dir in added_paths:
+                directory_entry, _ = self.compress_archive_entry(file_path, is_dir, archive_file, entries_end)
+                directory.add_entry(directory_entry)
+                entries_end += directory_entry.stored_size
+            self.write_indexed_archive_end(archive_file, directory, entries_end, archive_header.md5_password)
+
+    def delete_archive_entries(self, relative_path: str, archive_header: ArchiveHeader) -> None:
+        """
+        Deletes a file or a directory from an archive with a central directory.
+        Its entries are only marked as deleted in a new central directory (written after the old one,
+        like the central directory of added files), their space is reclaimed by compact.
+
+        Args:
+            relative_path (str): The path of the file or directory inside the archive.
+            archive_header (ArchiveHeader): The header of the archive.
+
+        Raises:
+            FileNotFoundError: If the path doesn't appear in the archive.
+        """
+        with open(self.archive_path, "r+b") as archive_file:
+            directory = self.read_directory(archive_file, archive_header)
+            directory.delete_entries(relative_path)
+            entries_end = archive_header.directory_offset + archive_header.directory_size
+            archive_file.seek(archive_header.header_size + entries_end)
+            self.write_indexed_archive_end(archive_file, directory, entries_end, archive_header.md5_password)
+
+    def copy_archive_entries(self, archive_header: ArchiveHeader, directory: CentralDirectory,
+                             added_paths: List[Tuple[str, bool]] = ()) -> None:
+        """
+        Writes a new archive with the entries of the central directory copied byte for byte from the archive,
+        followed by the entries of the added files, then replaces the archive with it.
+
+        Args:
+            archive_header (ArchiveHeader): The header of the archive.
+            directory (CentralDirectory): The entries to keep (their offsets are updated to the new archive).
+                                          The deleted entries aren't copied.
+            added_paths (list): The (file path, is under a directory) of every file to compress into the new archive.
+
+        Raises:
+            IOError: If an entry is cut in the archive.
+        """
+        COPY_CHUNK_SIZE = 1 << 20
+        new_archive_path = self.archive_path + ".tmp"
+        with open(self.archive_path, "rb") as archive_file, open(new_archive_path, "wb") as new_archive_file:
+            new_archive_file.seek(archive_header.header_size)  # the header is written after the entries
+            entries_end = 0
+            directory.entries = {entry.file_path: entry for entry in directory.get_live_entries()}
+            for entry in directory.entries.values():
+                archive_file.seek(archive_header.header_size + entry.offset)
+                bytes_left = entry.stored_size
+                while bytes_left > 0:
+                    chunk = archive_file.read(min(COPY_CHUNK_SIZE, bytes_left))
+                    if not chunk:
+                        raise IOError(f"Potential file corruption detected.\n'{entry.file_path}' is cut")
+                    new_archive_file.write(chunk)
+                    bytes_left -= len(chunk)
+                entry.offset = entries_end
+                entries_end += entry.stored_size
+            for file_path, is_dir in added_paths:
+                directory_entry, _ = self.compress_archive_entry(file_path, is_dir, new_archive_file, entries_end)
+                directory.add_entry(directory_entry)
+                entries_end += directory_entry.stored_size
+            self.write_indexed_archive_end(new_archive_file, directory, entries_end, archive_header.md5_password)
+        os.replace(new_archive_path, self.archive_path)
+
+    @password_check
+    def list_files(self, **kwargs) -> str:
+        """
+        Lists the files of an archive with a central directory, without decrypting their entries.
+
+        Keyword Args:
+            password (str): The password used to encrypt the archive.
+
+        Returns:
+            str: A line for every file with its original size, its size in the archive and its compression algorithm.
+
+        Raises:
+            ValueError: If the password is wrong or the archive has no central directory.
+        """
+        with open(self.archive_path, "rb") as archive_file:
+            archive_header = ArchiveHeader(archive_file, from_bytes=True)
+            if archive_header.md5_password != self.calculate_checksum(kwargs["password"]):
+                raise ValueError("Wrong password (or a chance of file corruption)")
+            if not archive_header.is_indexed():
+                raise ValueError("Listing needs an archive with a central directory "
+                                 "(extract the whole archive and compress it again)")
+            directory = self.read_directory(archive_file, archive_header)
+
+        listing = "".join(f"{entry.file_path} - {entry.original_size} bytes, "
+                          f"{entry.stored_size} bytes in the archive ({entry.codec})\n"
+                          for entry in directory.get_live_entries())
+        if "list" in kwargs:
+            print(listing)
+        return listing
+
+    @password_check
+    def verify(self, **kwargs) -> str:
+        """
+        Checks every entry of an archive with a central directory without writing anything:
+        the entries are decrypted and decompressed in parallel, and their checksums and the CRC32 of the
+        decompressed files are compared with the central directory.
+
+        Keyword Args:
+            password (str): The password used to encrypt the archive.
+
+        Returns:
+            str: A line for every damaged file with its problem, and the number of files checked.
+
+        Raises:
+            ValueError: If the password is wrong or the archive has no central directory.
+        """
+        start_time = time.time()
+        with open(self.archive_path, "rb") as archive_file:
+            archive_header = ArchiveHeader(archive_file, from_bytes=True)
+            if archive_header.md5_password != self.calculate_checksum(kwargs["password"]):
+                raise ValueError("Wrong password (or a chance of file corruption)")
+            if not archive_header.is_indexed():
+                raise ValueError("Verifying needs an archive with a central directory "
+                                 "(extract the whole archive and compress it again)")
+            directory = self.read_directory(archive_file, archive_header)
+
+        self.byte_seq_len = archive_header.byte_seq_len
+        entries = directory.get_live_entries()
+        problems = []
+        if entries:
+            with ProcessPoolExecutor(max_workers=min(len(entries), os.cpu_count() or 1)) as executor:
+                problems = [problem for problem in executor.map(verify_archive_entry, repeat(self),
+                                                                 repeat(archive_header), entries) if problem]
+
+        verify_time = time.time() - start_time
+        report = "".join(f"{problem}\n" for problem in problems)
+        report += (f"{len(entries)} files checked, {len(problems)} damaged\n"
+                   f"The verifying took: {verify_time:.2f} seconds\n")
+        if "verify" in kwargs:
+            print(report)
+        return report
+
+    def verify_archive_entry(self, archive_header: ArchiveHeader, entry: DirectoryEntry) -> str:
+        """
+        Decrypts and decompresses a single entry, without writing it, and checks it.
+        It runs in a worker process of verify, so the sub streams of the entry are decoded in the same process.
+
+        Args:
+            archive_header (ArchiveHeader): The header of the archive.
+            entry (DirectoryEntry): The central directory entry of the file.
+
+        Returns:
+            str: The problem of the entry, an empty string if it is fine.
+        """
+        try:
+            with open(self.archive_path, "rb") as archive_file:
+                entry_file = self.open_archive_entry(archive_file, archive_header, entry)
+                crc32_writer = Crc32Writer()
+                self.decode_archive_entry(entry_file, entry, crc32_writer)
+                self.check_archive_entry(entry_file, entry, crc32_writer)
+        except Exception as e:
+            return f"{entry.file_path} - " + str(e).replace("\n", " ")
+        return ""
+
+    @password_check
+    def compact(self, **kwargs) -> str:
+        """
+        Rewrites an archive with a central directory without the entries of the deleted files
+        and without the old central directories. The other entries are copied byte for byte, nothing is decoded.
+
+        Keyword Args:
+            password (str): The password used to encrypt the archive.
+
+        Returns:
+            str: A string containing information about the operation.
+
+        Raises:
+            ValueError: If the password is wrong or the archive has no central directory.
+        """
+        arc_size_before = os.path.getsize(self.archive_path)
+        start_time = time.time()
+
+        with open(self.archive_path, "rb") as archive_file:
+            archive_header = ArchiveHeader(archive_file, from_bytes=True)
+            if archive_header.md5_password != self.calculate_checksum(kwargs["password"]):
+                raise ValueError("Wrong password (or a chance of file corruption)")
+            if not archive_header.is_indexed():
+                raise ValueError("Compacting needs an archive with a central directory "
+                                 "(extract the whole archive and compress it again)")
+            directory = self.read_directory(archive_file, archive_header)
+
+        self.encoding_method = self.get_algo()
+        self.byte_seq_len = archive_header.byte_seq_len
+        self.key = archive_header.key
+        self.format_version = archive_header.format_version
+        self.copy_archive_entries(archive_header, directory)
+
+        end_time = time.time()
+        if "compact" in kwargs:
+            print(f"Before compacting, the archive size was: {arc_size_before} bytes\n"
+                  f"After compacting, the new archive size is: {os.path.getsize(self.archive_path)} bytes\n"
+                  f"The compacting took: {end_time - start_time} seconds\n")
+        return f"Before compacting, the archive size was: {arc_size_before} bytes\n" \
+               f"After compacting, the new archive size is: {os.path.getsize(self.archive_path)} bytes\n" \
+               f"The compacting took: {end_time - start_time} seconds\n"
+
+    @password_check
+    def update(self, *full_paths, **kwargs):
         """
-        Updates an existing file in the archive with a new version, maintaining the original encryption and compression format.
+        Updates existing files or directories in the archive with their new versions, maintaining the original
+        encryption and compression format.
+        In an archive with a central directory the archive is rewritten once: the entries of the other files are
+        copied as they are and only the updated files are compressed.
 
         Args:
-            full_path (str): Full path to the file in the archive that needs to be updated.
+            *full_paths (str): Full paths to the files or directories in the archive that need to be updated.
             **kwargs: Additional keyword arguments.
 
         Returns:
             str: A string containing information about the operation.
 
         Raises:
-            ValueError: If the file or directory specified for update doesn't exist in the archive.
+            ValueError: If the file or directory specified for update doesn't exist in the archive,
+                        or the password is wrong.
         """
 
         arc_size_before = os.path.getsize(self.archive_path)  # Get current size of the archive file
         start_time = time.time()  # Record start time for performance measurement
 
-        try:
-            # Attempt to delete the existing file (or directory) from the archive
-            self.delete(self.get_dir_name(full_path), **kwargs)  # If the file is inside a directory
-        except:
-            try:
-                self.delete(self.get_filename(full_path), **kwargs)  # If the file is in the root folder
-            except:
-                # Raise error if the file or directory to be updated doesn't exist in the archive
-                raise ValueError("the file/ directory you gave doesn't appear in the archive "
-                                 "(a chance of file corruption)")
+        with open(self.archive_path, "rb") as archive_file:
+            archive_header = ArchiveHeader(archive_file, from_bytes=True)
 
-        # Add the new version of the file to the archive
-        self.add(full_path, **kwargs)
+        if archive_header.is_indexed():
+            if archive_header.md5_password != self.calculate_checksum(kwargs["password"]):
+                raise ValueError("Wrong password (or a chance of file corruption)")
+            self.encoding_method = self.get_algo()
+            self.byte_seq_len = archive_header.byte_seq_len
+            self.key = archive_header.key
+            self.format_version = archive_header.format_version
+            self.update_archive_entries(full_paths, archive_header)
+        else:
+            kwargs["password"] = kwargs["password"].decode()  # delete and add encode the password again
+            for full_path in full_paths:
+                try:
+                    # Attempt to delete the existing file (or directory) from the archive
+                    self.delete(self.get_dir_name(full_path), **kwargs)  # If the file is inside a directory
+                except:
+                    try:
+                        self.delete(self.get_filename(full_path), **kwargs)  # If the file is in the root folder
+                    except:
+                        # Raise error if the file or directory to be updated doesn't exist in the archive
+                        raise ValueError("the file/ directory you gave doesn't appear in the archive "
+                                         "(a chance of file corruption)")
+
+                # Add the new version of the file to the archive
+                self.add(full_path, **kwargs)
 
         end_time = time.time()  # Record end time for performance measurement
 
@@ -929,8 +2036,33 @@ class Zip:
                f"after updating, the new archive size is: {os.path.getsize(self.archive_path)} bytes\n" \
                f"the updating took: {end_time - start_time} seconds\n"
 
+    def update_archive_entries(self, full_paths: Tuple[str, ...], archive_header: ArchiveHeader) -> None:
+        """
+        Replaces the entries of files or directories of an archive with a central directory with their new versions.
+        All the paths are checked before the archive is rewritten.
+
+        Args:
+            full_paths (tuple): Full paths to the files or directories to update.
+            archive_header (ArchiveHeader): The header of the archive.
+
+        Raises:
+            ValueError: If a file or directory doesn't exist in the archive.
+        """
+        with open(self.archive_path, "rb") as archive_file:
+            directory = self.read_directory(archive_file, archive_header)
+        added_paths = []
+        for full_path in full_paths:
+            try:
+                directory.delete_entries(self.get_dir_name(full_path))  # If the file is inside a directory
+            except FileNotFoundError:
+                try:
+                    directory.delete_entries(self.get_filename(full_path))  # If the file is in the root folder
+                except FileNotFoundError:
+                    raise ValueError(f"the file/ directory '{full_path}' doesn't appear in the archive")
+            added_paths += self.get_added_paths(full_path)
+        self.copy_archive_entries(archive_header, directory, added_paths)
+
     @password_check
-    @with_temp_dir
     def delete(self, relative_path, **kwargs):
         """
         Deletes a file or directory from the archive and updates the archive accordingly.
@@ -946,12 +2078,6 @@ class Zip:
             ValueError: If the provided password does not match the archive's password.
             FileNotFoundError: If the specified file or directory to be deleted does not exist in the archive.
         """
-        # Obtain the temporary directory path from keyword arguments
-        temp_dir = kwargs["temp_dir"]
-
-        # Print the temporary directory path (for debugging purposes)
-        print(temp_dir)
-
         # Initialize variables to record archive size before deletion and start time
         arc_size_before = os.path.getsize(self.archive_path)
         start_time = time.time()
@@ -966,6 +2092,98 @@ class Zip:
 
         # Start the timer to measure deletion time
         encoding_method = self.get_algo()  # Determine the encoding method used in the archive
+
+        if archive_header.is_indexed():
+            # only the central directory changes, the entries stay in the archive until it is compacted
+            self.encoding_method = encoding_method
+            self.byte_seq_len = archive_header.byte_seq_len
+            self.key = archive_header.key
+            self.format_version = archive_header.format_version
+            self.delete_archive_entries(relative_path, archive_header)
+        else:
+            self.delete_legacy(relative_path, archive_header, encoding_method, **kwargs)
+
+        # Record the end time of the operation
+        end_time = time.time()
+
+        # If specified, print information about the operation
+        if "delete" in kwargs:
+            print(f"Before deleting, the archive size was: {arc_size_before} bytes\n"
+                  f"After deleting, the new archive size is: {os.path.getsize(self.archive_path)} bytes\n"
+                  f"The deletion took: {end_time - start_time} seconds\n")
+
+        # Return a string containing information about the operation
+        return f"Before deleting, the archive size was: {arc_size_before} bytes\n" \
+               f"After deleting, the new archive size is: {os.path.getsize(self.archive_path)} bytes\n" \
+               f"The deletion took: {end_time - start_time} seconds\n"
+
+    @with_temp_dir
+    def add_legacy(self, path: str, archive_header: ArchiveHeader, encoding_method: str, **kwargs) -> None:
+        """
+        Adds a file or directory to an archive without a central directory:
+        the archive is extracted into a temporary directory and compressed again with the added path,
+        as an archive with a central directory (the checksums are computed while the files are read and written).
+
+        Args:
+            path (str): Path to the file or directory to be added.
+            archive_header (ArchiveHeader): The header of the archive.
+            encoding_method (str): The compression algorithm of the archive.
+            **kwargs: Additional keyword arguments (the password is in bytes).
+
+        Raises:
+            ValueError: If the path is invalid.
+            FileExistsError: If a file with the same path is already in the archive.
+        """
+        if not os.path.exists(path):
+            raise ValueError(f"Invalid file path: {path}")
+        temp_dir = kwargs["temp_dir"]
+        kwargs["password"] = kwargs["password"].decode()  # compress encodes the password again
+        self.extract(temp_dir, **kwargs)
+
+        files_to_compress = []
+        dirs_to_compress = []
+        for son in os.listdir(temp_dir):
+            son_path = f"{temp_dir}/{son}"
+            if os.path.isfile(son_path):
+                files_to_compress.append(son_path)
+            elif os.path.isdir(son_path):
+                dirs_to_compress.append(son_path)
+        for file_path, is_dir in self.get_added_paths(path):
+            archive_path = self.get_archive_path(file_path, is_dir)
+            if os.path.exists(f"{temp_dir}/{archive_path}"):
+                raise FileExistsError(f"'{archive_path}' already appears in the archive files")
+        if os.path.isdir(path):
+            dirs_to_compress.append(path)
+        else:
+            files_to_compress.append(path)
+
+        self.dirs_to_compress = {}
+        self.files_to_compress = []
+        byte_seq_len = archive_header.byte_seq_len
+        if encoding_method in self.RLE_METHODS and byte_seq_len == self.AUTO_BYTE_SEQ_LEN:
+            byte_seq_len = "auto"
+        self.compress(*files_to_compress, encoding=encoding_method, byte_seq_len=byte_seq_len,
+                      dir=dirs_to_compress, override=True, **kwargs)
+
+    @with_temp_dir
+    def delete_legacy(self, relative_path: str, archive_header: ArchiveHeader, encoding_method: str,
+                      **kwargs) -> None:
+        """
+        Deletes a file or directory from an archive without a central directory:
+        the archive is extracted into a temporary directory and compressed again without it.
+
+        Args:
+            relative_path (str): The relative path to the file or directory to be deleted within the archive.
+            archive_header (ArchiveHeader): The header of the archive.
+            encoding_method (str): The compression algorithm of the archive.
+            **kwargs: Additional keyword arguments (the password is in bytes).
+
+        Raises:
+            FileNotFoundError: If the specified file or directory to be deleted does not exist in the archive.
+        """
+        # Obtain the temporary directory path from keyword arguments
+        temp_dir = kwargs["temp_dir"]
+
         kwargs["password"] = kwargs["password"].decode()  # Decode password if it's in bytes format
 
         # Extract archive contents into the temporary directory
@@ -998,19 +2216,8 @@ class Zip:
         self.files_to_compress = []
 
         # Compress the updated files and directories back into the archive, overriding the existing archive file
-        self.compress(*files_to_compress, encoding=encoding_method, byte_seq_len=archive_header.byte_seq_len,
+        byte_seq_len = archive_header.byte_seq_len
+        if encoding_method in self.RLE_METHODS and byte_seq_len == self.AUTO_BYTE_SEQ_LEN:
+            byte_seq_len = "auto"
+        self.compress(*files_to_compress, encoding=encoding_method, byte_seq_len=byte_seq_len,
                       dir=dirs_to_compress, override=True, **kwargs)
-
-        # Record the end time of the operation
-        end_time = time.time()
-
-        # If specified, print information about the operation
-        if "delete" in kwargs:
-            print(f"Before deleting, the archive size was: {arc_size_before} bytes\n"
-                  f"After deleting, the new archive size is: {os.path.getsize(self.archive_path)} bytes\n"
-                  f"The deletion took: {end_time - start_time} seconds\n")
-
-        # Return a string containing information about the operation
-        return f"Before deleting, the archive size was: {arc_size_before} bytes\n" \
-               f"After deleting, the new archive size is: {os.path.getsize(self.archive_path)} bytes\n" \
-               f"The deletion took: {end_time - start_time} seconds\n"